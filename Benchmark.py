@@ -0,0 +1,120 @@
+"""
+================================================================================
+--- Este arquivo implementa o benchmark da automação contra o simulador local da
+    plataforma (simulador/), medindo o custo da própria automação (inicialização
+    do navegador, esperas, buscas de elementos e varredura de requisições) sem
+    o ruído da rede.
+
+--- Estrutura principal:
+    1. BenchmarkFluxos: Classe de teste que herda de unittest.TestCase e contém:
+       - setUpClass() / tearDownClass(): Sobem e derrubam o simulador (e registram
+         as rotas da navegação direta que ele atende, rotas.py)
+       - fluxo_login / fluxo_trocar_org / fluxo_backoffice / fluxo_criar_assinatura:
+         Cada fluxo do Pages.py, cronometrado de ponta a ponta
+       - test_fluxo_completo_<n>: Uma repetição de todos os fluxos em sequência
+
+--- O tempo de ponta a ponta de cada fluxo vai para as amostras 'fluxo:<nome>',
+    a quantidade de comandos WebDriver para 'comandos:<nome>' e o tempo de cada
+    etapa vem da instrumentação (instrumentacao.py), todos exibidos no terminal e
+    no relatório HTML. Rodar com PREENCHIMENTO_EM_LOTE=0 e sem ele compara os
+    comandos do formulário digitado campo a campo com o preenchido em lote.
+
+--- A quantidade de repetições é definida por BENCHMARK_REPETICOES (padrão 3), e
+    as latências e a taxa de erro do simulador por configuracao_simulador.
+================================================================================
+"""
+from time import perf_counter
+import os
+import unittest
+import Pages
+import metricas
+import navegador
+import rede
+import rotas
+from auxiliar import logger, log_da_execucao
+from simulador import servidor
+
+# Quantidade de repetições do fluxo completo
+repeticoes = int(os.environ.get("BENCHMARK_REPETICOES", "3"))
+
+# Latências e taxa de erro do simulador durante o benchmark
+configuracao_simulador = servidor.Configuracao(latencia_api=0.05, latencia_splash=0.5, latencia_assinatura=0.3, taxa_erro=0.0)
+
+# Classe de benchmark dos fluxos do Pages.py contra o simulador da plataforma
+class BenchmarkFluxos(unittest.TestCase):
+    # Sobe o simulador uma vez por classe (em cada worker)
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor, cls.url = servidor.iniciar(configuracao=configuracao_simulador)
+        for destino, caminhos in servidor.ROTAS.items():
+            rotas.conhecer(cls.url, destino, *caminhos)
+        logger.debug(f"🛠️ Simulador da plataforma em {cls.url}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+
+    # Método executado antes de cada teste para obter um navegador e as páginas
+    def setUp(self):
+        self.driver = navegador.pool.obter()
+        self.addCleanup(navegador.pool.devolver, self.driver)
+        self.login_page = Pages.LoginPage(self.driver)
+        self.web_page = Pages.MainWebPage(self.driver)
+        self.backoffice = Pages.Backoffice(self.driver)
+        self.backoffice_criar_assinatura = Pages.BackofficeCriarAssinatura(self.driver)
+
+    # Método que executa um fluxo e guarda seu tempo de ponta a ponta e os comandos WebDriver que enviou
+    def medir(self, fluxo, funcao):
+        comandos = self.driver.comandos_enviados
+        inicio = perf_counter()
+        funcao()
+        duracao = perf_counter() - inicio
+        comandos = self.driver.comandos_enviados - comandos
+        metricas.amostrar(f"fluxo:{fluxo}", duracao)
+        metricas.amostrar(f"comandos:{fluxo}", comandos)
+        logger.info(f"⏱️ Fluxo {fluxo} concluído em {duracao:.2f} segundos com {comandos} comandos WebDriver.")
+
+    def fluxo_login(self):
+        self.driver.get(self.url)
+        self.login_page.preencher_usuario("nicolas.o.rossoni@gmail.com")
+        self.login_page.preencher_senha("123456")
+        self.login_page.clicar_login()
+        self.login_page.aguardar_carregar()
+
+    def fluxo_trocar_org(self):
+        self.web_page.trocar_org("Vigilant")
+
+    def fluxo_backoffice(self):
+        self.web_page.trocar_area("Backoffice")
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        self.backoffice.aguardar_carregar()
+        self.backoffice.trocar_area("Gerenciamento de Assinaturas")
+        self.backoffice.trocar_sub_area("Criar nova assinatura")
+
+    def fluxo_criar_assinatura(self):
+        expectativa = rede.MonitorDeRede.para(self.driver).esperar("subscription")
+        self.backoffice_criar_assinatura.criar_assinatura_usuario_existente("Standard", False)
+        response = expectativa.aguardar(60)
+        if response.status_code != 200:
+            expectativa.exibir_resposta()
+            self.fail(f"Erro na requisição de assinatura: Status {response.status_code}")
+
+    # Executa todos os fluxos em sequência, medindo cada um e o total
+    def executar_fluxo_completo(self):
+        inicio = perf_counter()
+        self.medir("login", self.fluxo_login)
+        self.medir("trocar_org", self.fluxo_trocar_org)
+        self.medir("backoffice", self.fluxo_backoffice)
+        self.medir("criar_assinatura", self.fluxo_criar_assinatura)
+        metricas.amostrar("fluxo:completo", perf_counter() - inicio)
+
+# Gera um teste por repetição, para que o pytest-xdist possa distribuí-las entre os workers
+for repeticao in range(1, repeticoes + 1):
+    setattr(BenchmarkFluxos, f"test_fluxo_completo_{repeticao}", BenchmarkFluxos.executar_fluxo_completo)
+
+if __name__ == "__main__":
+    with log_da_execucao():
+        unittest.main()
+
+# Para rodar e gerar relatório:
+# pytest Benchmark.py -n auto --html=Benchmark_report.html
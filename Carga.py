@@ -0,0 +1,273 @@
+"""
+================================================================================
+--- Este arquivo implementa o modo de carga: vários usuários virtuais, cada um
+    com seu próprio navegador headless, criam assinaturas ao mesmo tempo pelo
+    BackofficeCriarAssinatura, para medir como a plataforma se comporta com
+    vários usuários do backoffice simultâneos.
+
+--- Estrutura principal:
+    1. agenda_linear / agenda_por_degraus: Instantes de entrada de cada usuário
+       virtual (rampa linear ou degraus "instante:usuarios")
+
+    2. TesteDeCarga: Classe que executa a carga
+       - executar: Inicia os navegadores conforme a agenda e aguarda o fim da duração
+       - abrir_navegador: Abre um navegador para um usuário virtual ou, com
+         --fluxos-por-navegador, para vários, cada um em uma aba isolada (abas.py)
+       - usuario: Fluxo de um usuário virtual (login, formulário, criações em laço)
+       - resumo: Vazão, percentis de latência da API de assinatura e taxa de erro
+
+    3. Execução direta: python Carga.py --usuarios 10 --rampa 60 --duracao 300
+
+--- A latência de cada criação é a da resposta da API 'subscription' observada
+    pelo selenium-wire (resposta menos o envio anotado pelo MonitorDeRede,
+    rede.py). Timeouts, exceções no fluxo e respostas diferentes de 200 contam
+    como erro.
+
+--- Antes de iniciar cada navegador, a memória dos navegadores em execução é
+    comparada ao orçamento (--memoria-mb); quando mais um navegador não cabe,
+    o usuário virtual não é iniciado e aparece como recusado no resumo.
+================================================================================
+"""
+import argparse
+import json
+import threading
+from functools import partial
+from time import monotonic, sleep
+import Pages
+import abas
+import captura
+import bloqueio
+import metricas
+import navegador
+import rede
+from auxiliar import logger, log_da_execucao
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Endereço padrão da plataforma e organização usada na navegação até o formulário
+URL_PADRAO = "https://platform.ecotx.dev/"
+ORG_BACKOFFICE = "Vigilant"
+
+# Política de captura dos navegadores de carga: apenas chamadas de API, sem corpos e com buffer curto
+POLITICA_CARGA = captura.PoliticaDeCaptura(excluir=captura.EXCLUIR_ESTATICOS, corpos=[], max_requisicoes=100)
+
+# Função que distribui a entrada dos usuários uniformemente ao longo da rampa (em segundos)
+def agenda_linear(usuarios, rampa):
+    return [rampa * indice / usuarios for indice in range(usuarios)]
+
+# Função que monta a agenda a partir de degraus "instante:usuarios" (por exemplo "0:2,30:5,60:10")
+def agenda_por_degraus(degraus):
+    agenda = []
+    for degrau in degraus.split(","):
+        instante, usuarios = degrau.split(":")
+        agenda.extend([float(instante)] * (int(usuarios) - len(agenda)))
+    return agenda
+
+# Classe que executa a carga de criação de assinaturas com vários usuários virtuais
+class TesteDeCarga:
+    def __init__(self, url, agenda, duracao, planos, com_asaas=False, memoria_mb=4000, politica_bloqueio=None,
+                 usuario="nicolas.o.rossoni@gmail.com", senha="123456", fluxos_por_navegador=1):
+        self.url = url
+        self.agenda = sorted(agenda)
+        self.duracao = duracao
+        self.planos = planos
+        self.com_asaas = com_asaas
+        self.memoria_mb = memoria_mb
+        self.politica_bloqueio = politica_bloqueio
+        self.usuario_login = usuario
+        self.senha = senha
+        self.fluxos_por_navegador = fluxos_por_navegador
+        self.trava = threading.Lock()
+        self.drivers = []
+        self.resultados = []
+        self.recusados = 0
+        self.usuarios_ativos = 0
+        self.pico_usuarios = 0
+        self.pico_memoria_mb = 0.0
+        self.inicio = None
+        self.fim = None
+
+    # Método que inicia os navegadores conforme a agenda (com fluxos_por_navegador usuários cada) e aguarda todos terminarem
+    def executar(self):
+        self.inicio = monotonic()
+        prazo = self.inicio + self.duracao
+        threads = []
+        for primeiro in range(0, len(self.agenda), self.fluxos_por_navegador):
+            indices = list(range(primeiro, min(primeiro + self.fluxos_por_navegador, len(self.agenda))))
+            sleep(max(0.0, self.inicio + self.agenda[primeiro] - monotonic()))
+            if monotonic() >= prazo:
+                break
+            if not self.cabe_mais_um_navegador():
+                with self.trava:
+                    self.recusados += len(indices)
+                logger.info(f"⚠️ Usuários virtuais {indices} não iniciados: orçamento de {self.memoria_mb} MB atingido.")
+                continue
+            thread = threading.Thread(target=self.abrir_navegador, args=(indices, prazo), name=f"navegador-{primeiro}")
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+        self.fim = monotonic()
+
+    # Método que mede a memória dos navegadores em execução e verifica se mais um cabe no orçamento
+    def cabe_mais_um_navegador(self):
+        with self.trava:
+            drivers = list(self.drivers)
+        if not drivers:
+            return True
+        memorias = []
+        for driver in drivers:
+            try:
+                memorias.append(navegador.memoria_mb(driver))
+            except WebDriverException:
+                continue
+        total = sum(memorias)
+        self.pico_memoria_mb = max(self.pico_memoria_mb, total)
+        # O próximo navegador deve ocupar em média o mesmo que os que já estão abertos
+        return total + total / max(1, len(memorias)) <= self.memoria_mb
+
+    # Método que abre um navegador para os usuários virtuais informados (um por aba isolada quando há mais de um)
+    def abrir_navegador(self, indices, prazo):
+        try:
+            driver = navegador.criar_driver(POLITICA_CARGA, self.politica_bloqueio)
+        except WebDriverException as erro:
+            logger.error(f"❌ Usuários virtuais {indices} não conseguiram abrir o navegador: {erro.msg}")
+            return
+        with self.trava:
+            self.drivers.append(driver)
+        try:
+            if len(indices) == 1:
+                self.usuario(driver, indices[0], prazo)
+                return
+            with abas.NavegadorCompartilhado(driver) as compartilhado:
+                compartilhado.executar({f"usuario-{indice}": partial(self.usuario_na_aba, indice, prazo) for indice in indices})
+        finally:
+            with self.trava:
+                self.drivers.remove(driver)
+            driver.quit()
+
+    # Método com o fluxo de um usuário virtual em uma aba do navegador compartilhado, a partir do seu instante na agenda
+    def usuario_na_aba(self, indice, prazo, fluxo):
+        sleep(max(0.0, self.inicio + self.agenda[indice] - monotonic()))
+        if monotonic() < prazo:
+            self.usuario(fluxo.driver, indice, prazo, fluxo.nome)
+
+    # Método com o fluxo de um usuário virtual: login, formulário e criações em laço até o prazo
+    def usuario(self, driver, indice, prazo, fluxo=None):
+        with self.trava:
+            self.usuarios_ativos += 1
+            self.pico_usuarios = max(self.pico_usuarios, self.usuarios_ativos)
+        try:
+            login_page = Pages.LoginPage(driver)
+            criar_assinatura = Pages.BackofficeCriarAssinatura(driver)
+            navegacao = Pages.Navegacao(driver, self.url)
+
+            driver.get(self.url)
+            login_page.preencher_usuario(self.usuario_login)
+            login_page.preencher_senha(self.senha)
+            login_page.clicar_login()
+            login_page.aguardar_carregar()
+
+            iteracao = 0
+            while monotonic() < prazo:
+                plano = self.planos[(indice + iteracao) % len(self.planos)]
+                iteracao += 1
+                try:
+                    navegacao.ir_para_criacao_de_assinatura(ORG_BACKOFFICE)
+                    self.registrar(indice, plano, *self.criar(driver, criar_assinatura, plano, fluxo))
+                except (TimeoutException, WebDriverException) as erro:
+                    self.registrar(indice, plano, None, None, f"{type(erro).__name__}: {erro.msg}")
+        except (TimeoutException, WebDriverException) as erro:
+            logger.error(f"❌ Usuário virtual {indice} interrompido: {type(erro).__name__}")
+        finally:
+            with self.trava:
+                self.usuarios_ativos -= 1
+
+    # Método que cria uma assinatura e retorna (status, latência da API, erro); com fluxo, só vale a requisição da aba dele
+    def criar(self, driver, criar_assinatura, plano, fluxo=None):
+        monitor = rede.MonitorDeRede.para(driver)
+        expectativa = monitor.esperar("subscription", metodo="POST", fluxo=fluxo)
+        try:
+            criar_assinatura.criar_assinatura_usuario_existente(plano, self.com_asaas)
+            response = expectativa.aguardar(120)
+        finally:
+            # Sem isso, uma falha antes do envio deixaria a expectativa registrada no monitor a cada iteração
+            monitor.remover_ouvinte(expectativa)
+        # Envio real da requisição (request.date é o instante em que o selenium-wire recriou a requisição, junto da resposta)
+        envio = expectativa.request.envio
+        latencia = (response.date - envio).total_seconds() if envio else None
+        erro = None if response.status_code == 200 else f"HTTP {response.status_code}"
+        # Limpa as requisições guardadas para o navegador não crescer ao longo da carga (as abas dividem o
+        # armazenamento, limitado por POLITICA_CARGA.max_requisicoes)
+        if fluxo is None:
+            del driver.requests
+        return response.status_code, latencia, erro
+
+    # Método que guarda o resultado de uma criação
+    def registrar(self, indice, plano, status, latencia, erro):
+        with self.trava:
+            self.resultados.append({"usuario": indice, "plano": plano, "instante": monotonic() - self.inicio,
+                                    "status": status, "latencia": latencia, "erro": erro})
+        if erro:
+            logger.error(f"❌ Usuário virtual {indice}: falha ao criar assinatura {plano} ({erro}).")
+        else:
+            logger.debug(f"ℹ️ Usuário virtual {indice}: assinatura {plano} criada" + (f" em {latencia:.3f} s." if latencia is not None else "."))
+
+    # Método que resume a carga: vazão, latência da API de assinatura e taxa de erro
+    def resumo(self):
+        sucessos = [resultado["latencia"] for resultado in self.resultados if resultado["erro"] is None]
+        latencias = [resultado["latencia"] for resultado in self.resultados if resultado["latencia"] is not None]
+        total = len(self.resultados)
+        duracao = (self.fim or monotonic()) - self.inicio
+        return {
+            "duracao_s": round(duracao, 1),
+            "usuarios_agendados": len(self.agenda),
+            "fluxos_por_navegador": self.fluxos_por_navegador,
+            "usuarios_pico": self.pico_usuarios,
+            "usuarios_recusados": self.recusados,
+            "memoria_pico_mb": round(self.pico_memoria_mb),
+            "criacoes": total,
+            "sucessos": len(sucessos),
+            "taxa_erro": round((total - len(sucessos)) / total, 4) if total else 0.0,
+            "vazao_por_minuto": round(len(sucessos) * 60 / duracao, 2) if duracao else 0.0,
+            "latencia_p50_s": round(metricas.percentil(latencias, 50), 3),
+            "latencia_p95_s": round(metricas.percentil(latencias, 95), 3),
+            "latencia_p99_s": round(metricas.percentil(latencias, 99), 3),
+            "latencia_max_s": round(max(latencias, default=0.0), 3),
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cria assinaturas com vários usuários virtuais simultâneos e mede a plataforma.")
+    parser.add_argument("--url", default=URL_PADRAO)
+    parser.add_argument("--usuarios", type=int, default=5, help="Quantidade de usuários virtuais (rampa linear)")
+    parser.add_argument("--rampa", type=float, default=30, help="Tempo até todos os usuários entrarem (s)")
+    parser.add_argument("--degraus", help='Agenda por degraus "instante:usuarios,..." (substitui --usuarios/--rampa)')
+    parser.add_argument("--duracao", type=float, default=300, help="Duração total da carga (s)")
+    parser.add_argument("--planos", default="Venda+,Standard,Professional", help="Planos usados em rodízio")
+    parser.add_argument("--com-asaas", action="store_true", help="Mantém a cobrança no Asaas ativa")
+    parser.add_argument("--memoria-mb", type=float, default=4000, help="Orçamento de memória dos navegadores (MB)")
+    parser.add_argument("--fluxos-por-navegador", type=int, default=1,
+                        help="Usuários virtuais por navegador, cada um em uma aba com contexto isolado (abas.py)")
+    parser.add_argument("--enxuta", action="store_true", help="Bloqueia imagens, fontes, mídia e analytics (bloqueio.py)")
+    parser.add_argument("--simulador", action="store_true", help="Executa contra o simulador local em vez de --url")
+    parser.add_argument("--saida", help="Arquivo JSON com o resumo e cada criação")
+    args = parser.parse_args()
+
+    with log_da_execucao():
+        url = args.url
+        if args.simulador:
+            from simulador import servidor
+            simulador, url = servidor.iniciar()
+
+        agenda = agenda_por_degraus(args.degraus) if args.degraus else agenda_linear(args.usuarios, args.rampa)
+        carga = TesteDeCarga(url, agenda, args.duracao, args.planos.split(","), args.com_asaas, args.memoria_mb,
+                             bloqueio.PoliticaDeBloqueio() if args.enxuta else None,
+                             fluxos_por_navegador=args.fluxos_por_navegador)
+        carga.executar()
+
+        resumo = carga.resumo()
+        for nome, valor in resumo.items():
+            print(f"{nome}: {valor}")
+        if args.saida:
+            with open(args.saida, "w") as arquivo:
+                json.dump({"resumo": resumo, "criacoes": carga.resultados}, arquivo, indent=1)
@@ -8,44 +8,62 @@
     2. MainWebPage: Manipula a navegação da página principal (troca de org, área)
     3. Backoffice: Manipula a página de backoffice e navegação entre suas áreas
     4. BackofficeCriarAssinatura: Manipula o formulário de criação de assinaturas
+    5. Navegacao: Vai direto até uma tela pela rota lembrada (rotas.py), depois de
+       deixar ativa a organização informada, e só usa o caminho de cliques pelos
+       menus quando a rota não abre a tela
 
---- Cada classe encapsula os seletores (XPath) dos elementos da interface e 
+--- Cada classe encapsula os seletores dos elementos da interface (obtidos do
+    registro central em localizadores.py) e 
     implementa métodos que simulam as ações do usuário (cliques, preenchimento
     de campos, navegação), abstraindo as complexidades da interação com o Selenium.
 
+--- Todos os métodos públicos das classes são cronometrados como etapas do teste
+    (instrumentacao.py).
+
 --- O BackofficeCriarAssinatura implementa o fluxo completo de criação de assinaturas,
     desde a seleção do tipo de usuário até a confirmação final, com suporte a diferentes
-    configurações (com/sem integração Asaas, diferentes tipos de assinatura).
+    configurações (com/sem integração Asaas, diferentes tipos de assinatura). Os
+    campos de texto (validade, preço e dados de cobrança) são preenchidos em um
+    único comando ao navegador (aux.fill_inputs); só as buscas dos ng-select são
+    digitadas tecla a tecla.
 ================================================================================
 """
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 import auxiliar as aux
+import localizadores as loc
+import instrumentacao
+import metricas
+import rotas
 from auxiliar import logger
-from time import sleep
 from random import randint
 from selenium.common.exceptions import TimeoutException
+import os
+
+# Preenchimento dos campos de texto do formulário de assinatura em lote (PREENCHIMENTO_EM_LOTE=0 volta a digitar campo a campo)
+preenchimento_em_lote = os.environ.get("PREENCHIMENTO_EM_LOTE", "1") != "0"
         
 # Classe para manipular a página de login
+@instrumentacao.instrumentar
 class LoginPage:
     def __init__(self, driver):
         self.driver = driver
-        self.username_input = (By.XPATH, "//input[@id='username']")
-        self.password_input = (By.XPATH, "//input[@id='password']")
-        self.submit_button = (By.XPATH, "//button[@id='kt_sign_in_submit']")
-        self.splash_screen = (By.XPATH, '//*[@id="splash-screen"]')
+        self.username_input = loc.obter("login.usuario")
+        self.password_input = loc.obter("login.senha")
+        self.submit_button = loc.obter("login.entrar")
+        self.splash_screen = loc.obter("web.splash")
 
     # Método para preencher o campo de usuário
+    # (o formulário de login fica oculto até o carregamento inicial terminar, por isso as esperas são por visibilidade)
     def preencher_usuario(self, usuario):
-        aux.find_element(self.driver, self.username_input).send_keys(usuario)
+        aux.find_element(self.driver, self.username_input, visivel=True).send_keys(usuario)
 
     # Método para preencher o campo de senha
     def preencher_senha(self, senha):
-        aux.find_element(self.driver, self.password_input).send_keys(senha)
+        aux.find_element(self.driver, self.password_input, visivel=True).send_keys(senha)
 
     # Método para clicar no botão de login
     def clicar_login(self):
-        aux.find_element(self.driver, self.submit_button).click()
+        aux.find_element(self.driver, self.submit_button, visivel=True).click()
     
     # Método para aguardar o carregamento da página após o login
     def aguardar_carregar(self):
@@ -62,18 +80,36 @@ class LoginPage:
                     logger.error("❌ Erro: Página não carregou após 3 tentativas de refresh")
                     raise
 
+    # Método que verifica se a sessão continua ativa (formulário de login fora da tela)
+    def logado(self):
+        return not self.username_input.encontrar_todos(self.driver)
+
+    # Método para verificar se uma sessão restaurada foi aceita (plataforma aberta em vez do formulário de login)
+    def sessao_aceita(self, indicador_logado, tempo=60):
+        try:
+            aux.find_any_element(self.driver, [self.username_input, indicador_logado], tempo)
+        except TimeoutException:
+            return False
+
+        if self.username_input.encontrar_todos(self.driver):
+            return False
+        self.aguardar_carregar()
+        return True
+
 # Classe para manipular a página principal da web
+@instrumentacao.instrumentar
 class MainWebPage:
     def __init__(self, driver):
         self.driver = driver
-        self.org_button = (By.XPATH, "/html/body/app-layout/div/app-main-side-menu/div/div/div[2]/div[1]/ul/app-menu-item")
-        self.org_list = (By.XPATH, "/html/body/app-layout/div/app-org-sub-menu-item/div/div/div[3]")
-        self.areas_lsit = (By.XPATH, "/html/body/app-layout/div/app-main-side-menu/div/div/div[2]/div[1]/ul")
-        self.splash_screen = (By.XPATH, '//*[@id="splash-screen"]')
+        self.org_button = loc.obter("web.botao_org")
+        self.org_list = loc.obter("web.lista_orgs")
+        self.areas_lsit = loc.obter("web.lista_areas")
+        self.splash_screen = loc.obter("web.splash")
     
     # Método para trocar de organização
+    # (logo após o login o menu ainda pode estar oculto, por isso a espera é por visibilidade)
     def trocar_org(self, org_name):
-        aux.find_element(self.driver, self.org_button).click()
+        aux.find_element(self.driver, self.org_button, visivel=True).click()
         org_list = aux.find_element(self.driver, self.org_list)
         
         aux.find_element_in_element(org_list, org_name).click()
@@ -81,6 +117,10 @@ class MainWebPage:
                 
         self.aguardar_carregar()
     
+    # Método que retorna o texto do botão de organização, que mostra a organização ativa
+    def org_atual(self):
+        return aux.find_element(self.driver, self.org_button, visivel=True).text
+
     # Método para aguardar o carregamento da página após a troca de organização
     def aguardar_carregar(self):
         for tentativa in range(3):
@@ -103,12 +143,13 @@ class MainWebPage:
         logger.debug(f"ℹ️ Area trocada para: {area}.")
 
 # Classe para manipular a área de backoffice
+@instrumentacao.instrumentar
 class Backoffice:
     def __init__(self, driver):
         self.driver = driver
         self.active_area = None
-        self.areas_lsit = (By.XPATH, '/html/body/app-layout/div/div/app-aside/div[2]/div/ul')
-        self.splash_screen = (By.XPATH, '/html/body/app-splash-screen')
+        self.areas_lsit = loc.obter("backoffice.lista_areas")
+        self.splash_screen = loc.obter("backoffice.splash")
     
     # Método para aguardar o carregamento do backoffice
     def aguardar_carregar(self):
@@ -138,18 +179,21 @@ class Backoffice:
         logger.debug(f"ℹ️ Sub-area trocada para: {sub_area}.")
     
 # Classe para manipular a criação de assinaturas no backoffice
+@instrumentacao.instrumentar
 class BackofficeCriarAssinatura:
     def __init__(self, driver):
         self.driver = driver
-        self.tipo_usuario_existente = (By.XPATH, '//*[@id="inlineRadio1"]')
-        self.tipo_novo_usuario = (By.XPATH, '//input[@id="inlineRadio2"]')
-        self.selecione_usuario_existente = (By.XPATH, "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]/div[1]/form[1]/div[2]/div[1]/ng-select[1]/div[1]/div[1]/div[3]/input[1]")
-        self.selecione_assinatura = (By.XPATH, "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]/div[1]/form[1]/div[3]/div[1]/ng-select[1]/div[1]/div[1]/div[3]/input[1]")
-        self.campo_acessos = (By.XPATH, "/html/body/app-layout/div/div/div/div/div/div/app-subscriptions-management/app-create-new-subscription/div/div[2]/div/div[2]/div[1]/form/div[4]/div[2]/input")
-        self.campo_preco = (By.XPATH, "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]/div[1]/form[1]/div[5]/div[1]/input[1]")
-        self.flag_asaas = (By.XPATH, "/html/body/app-layout/div/div/div/div/div/div/app-subscriptions-management/app-create-new-subscription/div/div[2]/div/div[2]/div[1]/form/div[9]/div/span/label")
-        self.concluir_assinatura = (By.XPATH, "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]/div[2]/div[2]/button[1]")
-        self.confirmar_assinatura = (By.XPATH, "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]/div[2]/div[2]/button[1]")
+        self.tipo_usuario_existente = loc.obter("assinatura.tipo_usuario_existente")
+        self.tipo_novo_usuario = loc.obter("assinatura.tipo_novo_usuario")
+        self.selecione_usuario_existente = loc.obter("assinatura.usuario_existente")
+        self.selecione_assinatura = loc.obter("assinatura.plano")
+        self.campo_acessos = loc.obter("assinatura.acessos")
+        self.campo_preco = loc.obter("assinatura.preco")
+        self.flag_asaas = loc.obter("assinatura.flag_asaas")
+        self.concluir_assinatura = loc.obter("assinatura.concluir")
+        self.confirmar_assinatura = loc.obter("assinatura.confirmar")
+        self.usuario_selecionado = loc.obter("assinatura.usuario_selecionado")
+        self.org_selecionada = loc.obter("assinatura.org_selecionada")
         self.user = "nicolas.rossoni@datlaz.com"
         self.org = "TesteNicolas"
     
@@ -157,37 +201,53 @@ class BackofficeCriarAssinatura:
     def criar_assinatura_usuario_existente(self, assinatura, cobrança_no_asaas):
         # Gera uma chave aleatória para identificar a assinatura
         chave_da_assinatura = randint(10, 99)
+
+        self.selecionar_usuario_e_org()
+        acessos = self.preencher_assinatura(assinatura, chave_da_assinatura)
+        self.concluir(cobrança_no_asaas)
+        
+        # Registra a conclusão da criação da assinatura
+        logger.debug(f"ℹ️ Assinatura preenchida para o acesso '{acessos}' com cobrança no Asaas[{cobrança_no_asaas}] e chave = {chave_da_assinatura}.")
         
+        # Retorna informações sobre a assinatura criada
+        return acessos, cobrança_no_asaas, chave_da_assinatura
+
+    # Método para selecionar o tipo "usuário existente", o usuário e a organização
+    def selecionar_usuario_e_org(self):
         # Clica no radio button de usuário existente
         aux.find_element(self.driver, self.tipo_usuario_existente).click()
 
         # Preenche o campo de usuário
         campo_usuario = aux.find_element(self.driver, self.selecione_usuario_existente)
-        campo_usuario.send_keys(self.user[:5])
-        sleep(3)
-        campo_usuario.send_keys(self.user[5:])
-        sleep(5)
+        aux.send_keys_to_ng_select(self.driver, campo_usuario, self.user[:5], tempo=3)
+        aux.send_keys_to_ng_select(self.driver, campo_usuario, self.user[5:], self.user, tempo=5)
         campo_usuario.send_keys(Keys.ENTER)
         campo_usuario.send_keys(Keys.TAB)
 
         # Preenche o campo de organização
-        self.driver.switch_to.active_element.send_keys(self.org[:5])
-        sleep(3)
-        self.driver.switch_to.active_element.send_keys(self.org[5:])
-        sleep(10)
-        self.driver.switch_to.active_element.send_keys(Keys.ENTER)
-        self.driver.switch_to.active_element.send_keys(Keys.TAB)
+        campo_org = self.driver.switch_to.active_element
+        aux.send_keys_to_ng_select(self.driver, campo_org, self.org[:5], tempo=3)
+        aux.send_keys_to_ng_select(self.driver, campo_org, self.org[5:], self.org, tempo=10)
+        campo_org.send_keys(Keys.ENTER)
+        campo_org.send_keys(Keys.TAB)
         
         self.driver.switch_to.active_element.send_keys(Keys.ENTER)
         logger.debug("ℹ️ Usuário e Organização selecionados.")
-        
-        # Preenche o campo de assinatura
+
+    # Método para preencher a assinatura, a validade, o preço e os dados de cobrança; retorna os acessos do plano
+    def preencher_assinatura(self, assinatura, chave_da_assinatura):
+        # Preenche o campo de assinatura, apagando só o texto que uma tentativa anterior tenha deixado na busca
+        # (com a busca vazia, o BACKSPACE do ng-select remove o plano já selecionado)
         campo_assinatura = aux.find_element(self.driver, self.selecione_assinatura)
-        campo_assinatura.send_keys(assinatura[:2])
-        sleep(3)
-        campo_assinatura.send_keys(assinatura[2:])
-        sleep(5)
+        if campo_assinatura.get_attribute("value"):
+            campo_assinatura.send_keys(Keys.CONTROL, "a")
+            campo_assinatura.send_keys(Keys.BACKSPACE)
+        aux.send_keys_to_ng_select(self.driver, campo_assinatura, assinatura[:2], tempo=3)
+        aux.send_keys_to_ng_select(self.driver, campo_assinatura, assinatura[2:], assinatura, tempo=5)
         campo_assinatura.send_keys(Keys.ENTER)
+
+        if preenchimento_em_lote:
+            return self._preencher_campos_em_lote(campo_assinatura, chave_da_assinatura)
         campo_assinatura.send_keys(Keys.TAB)
 
         # Preenche o campo de data de validade
@@ -213,24 +273,116 @@ class BackofficeCriarAssinatura:
         self.driver.switch_to.active_element.send_keys("10017074940")
         self.driver.switch_to.active_element.send_keys(Keys.TAB)
         self.driver.switch_to.active_element.send_keys("41" + "9999" + "00" + str(chave_da_assinatura))
-        
+        return acessos
+
+    # Método que preenche validade, preço e dados de cobrança com um único comando ao navegador; retorna os acessos do plano
+    # A validade é o campo seguinte à busca do plano e os dados de cobrança os quatro seguintes ao preço (ordem do TAB)
+    def _preencher_campos_em_lote(self, campo_assinatura, chave_da_assinatura):
+        acessos = aux.find_element(self.driver, self.campo_acessos).get_attribute('value')
+        campo_preco = aux.find_element(self.driver, self.campo_preco)
+        aux.fill_inputs(self.driver, [
+            (campo_assinatura, ["01012026"]),
+            (campo_preco, str(chave_da_assinatura) + "000"),
+            (campo_preco, ["SeleniumBot" + str(chave_da_assinatura),
+                           "SeleniumBot" + str(chave_da_assinatura) + "@gmail.com",
+                           "10017074940",
+                           "41" + "9999" + "00" + str(chave_da_assinatura)]),
+        ])
+        return acessos
+
+    # Método para ajustar a integração com o Asaas, concluir e confirmar a criação da assinatura
+    def concluir(self, cobrança_no_asaas):
         # Desativa a integração com ASAAS se necessário
         if not cobrança_no_asaas:
-            sleep(2)
+            aux.wait_for_angular(self.driver, tempo=2)
             aux.find_element(self.driver, self.flag_asaas).click()
         
         # Clica no botão para concluir a criação da assinatura
-        sleep(2)    
+        aux.wait_for_angular(self.driver, tempo=2)
         aux.find_element(self.driver, self.concluir_assinatura).click()
                 
         # Confirma a criação da assinatura
-        sleep(2)
+        aux.wait_for_angular(self.driver, tempo=2)
         aux.find_element(self.driver, self.confirmar_assinatura).click()
-        
-        # Registra a conclusão da criação da assinatura
-        logger.debug(f"ℹ️ Assinatura preenchida para o acesso '{acessos}' com cobrança no Asaas[{cobrança_no_asaas}] e chave = {chave_da_assinatura}.")
-        
-        # Retorna informações sobre a assinatura criada
-        return acessos, cobrança_no_asaas, chave_da_assinatura
 
-        
\ No newline at end of file
+    # Método que verifica se o formulário está aberto e ainda sem usuário selecionado (checkpoint "no backoffice")
+    def formulario_vazio(self):
+        return bool(self.tipo_usuario_existente.encontrar_todos(self.driver)) and not self._selecionado(self.usuario_selecionado)
+
+    # Método que verifica se usuário e organização estão selecionados e o preço ainda não foi digitado (checkpoint "formulário parcial")
+    def usuario_e_org_selecionados(self):
+        campo_preco = self.campo_preco.encontrar(self.driver)
+        return (self._selecionado(self.usuario_selecionado) and self._selecionado(self.org_selecionada)
+                and campo_preco is not False and not campo_preco.get_attribute("value"))
+
+    # Método que verifica se o ng-select tem um valor selecionado
+    def _selecionado(self, localizador):
+        return any(elemento.text.strip() for elemento in localizador.encontrar_todos(self.driver))
+
+# Classe para navegar direto até as telas pela rota, com o caminho de cliques pelos menus como alternativa
+@instrumentacao.instrumentar
+class Navegacao:
+    def __init__(self, driver, url_base):
+        self.driver = driver
+        self.url_base = url_base
+        self.web_page = MainWebPage(driver)
+        self.backoffice = Backoffice(driver)
+        self.login_input = loc.obter("login.usuario")
+        self.formulario_assinatura = loc.obter("assinatura.tipo_usuario_existente")
+        self.org_ativa = None
+
+    # Método para abrir o formulário de criação de assinaturas do backoffice na organização informada
+    def ir_para_criacao_de_assinatura(self, org):
+        self.ir_para("backoffice.criar_assinatura", org, self.formulario_assinatura, self.caminho_criacao_de_assinatura)
+
+    # Método que tenta as rotas do destino e, se nenhuma abrir a tela, segue pelo caminho de cliques
+    def ir_para(self, destino, org, marcador, caminho_por_cliques):
+        self.garantir_org(org)
+        for url in rotas.candidatas(self.url_base, destino, org):
+            if self.abrir_rota(url, marcador):
+                rotas.lembrar(self.url_base, destino, org, url)
+                metricas.incrementar("navegacoes_diretas")
+                logger.debug(f"ℹ️ {destino} aberto direto pela rota {url}.")
+                return
+        rotas.esquecer(self.url_base, destino, org)
+
+        logger.debug(f"⚠️ Nenhuma rota abriu {destino}, seguindo pelos menus.")
+        self.driver.get(self.url_base)
+        self.web_page.aguardar_carregar()
+        caminho_por_cliques(org)
+        aux.find_element(self.driver, marcador)
+        rotas.lembrar(self.url_base, destino, org, self.driver.current_url)
+        metricas.incrementar("navegacoes_por_cliques")
+
+    # Método que deixa a organização ativa antes da navegação direta: a rota não leva a organização, e a tela abre na
+    # organização ativa da sessão (numa sessão restaurada, a padrão do login). A organização conferida ou trocada
+    # fica guardada, então só a primeira navegação de cada Navegacao lê o botão de organização
+    def garantir_org(self, org):
+        if self.org_ativa == org:
+            return
+        if not self.web_page.org_button.encontrar_todos(self.driver):
+            self.driver.get(self.url_base)
+            self.web_page.aguardar_carregar()
+        if org.lower() in self.web_page.org_atual().lower():
+            metricas.incrementar("trocas_de_org_evitadas")
+        else:
+            self.web_page.trocar_org(org)
+        self.org_ativa = org
+
+    # Método que abre a URL e verifica se a tela esperada carregou (e não o login ou a página principal)
+    def abrir_rota(self, url, marcador, tempo=30):
+        self.driver.get(url)
+        try:
+            aux.find_any_element(self.driver, [marcador, self.login_input, self.web_page.org_button], tempo)
+        except TimeoutException:
+            return False
+        return bool(marcador.encontrar_todos(self.driver))
+
+    # Método com o caminho de cliques até o formulário de criação de assinaturas
+    def caminho_criacao_de_assinatura(self, org):
+        self.garantir_org(org)
+        self.web_page.trocar_area("Backoffice")
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        self.backoffice.aguardar_carregar()
+        self.backoffice.trocar_area("Gerenciamento de Assinaturas")
+        self.backoffice.trocar_sub_area("Criar nova assinatura")
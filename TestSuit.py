@@ -5,96 +5,167 @@
 
 --- Estrutura principal:
     1. TestLogin: Classe de teste que herda de unittest.TestCase e contém:
-       - setUp(): Configura o ambiente de teste, faz login e navega até a área de criação
+       - setUp(): Configura o ambiente de teste e faz login
+       - navegar_ate_criacao(): Abre a área de criação de assinaturas (rota direta ou menus)
        - verificar_criacao_assinatura(): Método central que cria e verifica assinaturas
+       - verificar_criacao_assinatura_api(): Caminho do modo híbrido, direto pela API
        - test_venda_mais_sem_asaas(): Teste específico para criação sem integração Asaas
-       - tearDown(): Limpa o ambiente após cada teste
+       - tearDown(): Limpa o ambiente após cada teste (o navegador volta ao pool)
 
 --- O teste monitora as requisições HTTP para verificar se a criação foi bem-sucedida,
-    buscando por chamadas à API que contenham 'subscription' na URL.
+    registrando antes do fluxo a expectativa de uma chamada POST à API que
+    contenha 'subscription' na URL, resolvida assim que a resposta chega.
+
+--- A criação pela interface é dividida em etapas com checkpoints (checkpoints.py):
+    logado, no backoffice, formulário parcial (usuário e organização) e formulário
+    preenchido. Uma etapa que falha é retomada do checkpoint válido mais próximo;
+    o envio não é refeito depois que a requisição de assinatura saiu do navegador.
+
+--- Todo o tráfego do teste é gravado em disco como rastro de rede (rastro.py),
+    anexado ao relatório HTML quando o teste falha.
 
 --- Outros testes comentados ao final permitem verificar diferentes tipos de assinatura
     (Standard, Profissional) e diferentes configurações (com/sem integração Asaas).
 ================================================================================
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from seleniumwire import webdriver
-from auxiliar import logger
-from time import sleep, time
+from auxiliar import logger, log_da_execucao
+from selenium.common.exceptions import TimeoutException
+from functools import partial
+from random import randint
+from time import monotonic
+import os
 import unittest
 import Pages
-import json
-from pprint import pprint
+import api_assinaturas
+import bloqueio
+import captura
+import checkpoints
+import comandos
+import navegador
+import rastro
+import rede
+import sessao
 
 # Lista de assinaturas disponíveis no sistema
 nomes_de_assinaturas = ["Venda+", "Standard", "Professional", "Chile", "Portugal", "Telecom"]
 
+# Endereço da plataforma testada
+url_plataforma = "https://platform.ecotx.dev/"
+
+# Política de captura de rede dos navegadores: guarda as chamadas de API (sem recursos estáticos),
+# apenas os corpos das requisições de assinatura e no máximo 500 requisições por navegador; os corpos
+# ficam inteiros em .captura/ (request.arquivo_corpo) e só os primeiros 16 KB ficam em memória
+politica_de_captura = captura.PoliticaDeCaptura(
+    excluir=captura.EXCLUIR_ESTATICOS,
+    corpos=[r"subscription"],
+    max_corpo_bytes=16 * 1024,
+    max_requisicoes=500,
+    diretorio_spool=".captura",
+)
+
+# Navegação enxuta (opcional, NAVEGACAO_ENXUTA=1): bloqueia imagens, fontes, mídia e analytics
+politica_de_bloqueio = bloqueio.PoliticaDeBloqueio() if bloqueio.ativo() else None
+navegador.pool.fabrica = partial(navegador.criar_driver, politica_de_captura, politica_de_bloqueio)
+
+# Modo híbrido (opcional, MODO_HIBRIDO=1): os casos com payload já gravado são criados direto pela API,
+# e apenas os casos de smoke_ui continuam sempre pelo formulário
+modo_hibrido = os.environ.get("MODO_HIBRIDO") == "1"
+smoke_ui = {("Venda+", False)}
+
 # Classe de teste para o fluxo de login e criação de assinaturas
 class TestLogin(unittest.TestCase):
     # Método executado antes de cada teste para configurar o ambiente
     def setUp(self):
         logger.debug("🛠️ Configurando ambiente para o teste")
 
-        # Configura as opções do navegador Chrome
-        self.options = Options()
-        self.options.add_argument("--headless")
-        self.options.add_argument("--start-maximized")
-        self.service = Service("drivers/chromedriver")
-        self.driver = webdriver.Chrome(service=self.service, options=self.options)
+        # Obtém um navegador do pool do worker (reaproveitado ou novo), devolvido mesmo se o setUp falhar
+        self.driver = navegador.pool.obter()
+        self.addCleanup(navegador.pool.devolver, self.driver)
+
+        # Grava o rastro de rede do teste em disco (mantido no relatório apenas se o teste falhar)
+        self.rastro = rastro.GravadorDeRastro.iniciar(self.driver, self.id())
+        self.addCleanup(self.rastro.finalizar)
 
         # Acessa a URL da plataforma
-        self.driver.get("https://platform.ecotx.dev/")
+        self.driver.get(url_plataforma)
         
         # Inicializa as páginas que serão utilizadas nos testes
         self.login_page = Pages.LoginPage(self.driver)
         self.web_page = Pages.MainWebPage(self.driver)
-        self.backoffice = Pages.Backoffice(self.driver)
         self.backoffice_criar_assinatura = Pages.BackofficeCriarAssinatura(self.driver)
+        self.navegacao = Pages.Navegacao(self.driver, url_plataforma)
 
-        # Efetua login na plataforma
-        self.login_page.preencher_usuario("nicolas.o.rossoni@gmail.com")
-        self.login_page.preencher_senha("123456")
-        self.login_page.clicar_login()
-        self.login_page.aguardar_carregar()
-        
-        # Navega até a área de criação de assinaturas no backoffice
-        self.web_page.trocar_org("Vigilant")
-        self.web_page.trocar_area("Backoffice")
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        self.backoffice.aguardar_carregar() 
-        self.backoffice.trocar_area("Gerenciamento de Assinaturas")
-        self.backoffice.trocar_sub_area("Criar nova assinatura")
-
-    # Método para verificar a criação de uma assinatura
+        # Restaura a sessão salva pelo worker ou efetua login na plataforma (o tempo gasto é o do checkpoint "logado")
+        inicio_login = monotonic()
+        self.sessao = sessao.CacheDeSessao(self.driver, url_plataforma)
+        if not self.sessao.restaurar(self.login_page, self.web_page.org_button):
+            self.login_page.preencher_usuario("nicolas.o.rossoni@gmail.com")
+            self.login_page.preencher_senha("123456")
+            self.login_page.clicar_login()
+            self.login_page.aguardar_carregar()
+            self.sessao.salvar()
+        self.tempo_login = monotonic() - inicio_login
+
+    # Método que abre a área de criação de assinaturas no backoffice (pela rota lembrada ou pelos menus)
+    def navegar_ate_criacao(self):
+        self.navegacao.ir_para_criacao_de_assinatura("Vigilant")
+
+    # Método para verificar a criação de uma assinatura (pela API no modo híbrido, quando já há modelo gravado)
     def verificar_criacao_assinatura(self, tipo_assinatura, com_asaas):
+        if modo_hibrido and (tipo_assinatura, com_asaas) not in smoke_ui:
+            modelo = api_assinaturas.carregar_modelo(tipo_assinatura, com_asaas)
+            if modelo is not None:
+                self.verificar_criacao_assinatura_api(tipo_assinatura, com_asaas, modelo)
+                return
+
         max_wait_time = 120
-        start_time = time()
+        criar = self.backoffice_criar_assinatura
+        chave_da_assinatura = randint(10, 99)
         
-        # Cria a assinatura para um usuário existente
-        acessos, cobrança_no_asaas, chave_da_assinatura = self.backoffice_criar_assinatura.criar_assinatura_usuario_existente(tipo_assinatura, com_asaas)
-        
-        # Verifica se a requisição foi bem sucedida dentro do tempo limite
-        while time() - start_time < max_wait_time:
-            # Percorre todas as requisições feitas pelo navegador
-            for request in self.driver.requests:
-                # Verifica se é uma requisição relacionada a assinaturas e se tem resposta
-                if 'subscription' in request.url and request.response:
-                    # Verifica se a resposta não foi bem sucedida (status diferente de 200)
-                    if request.response.status_code != 200:
-                        logger.error(f"❌ Erro: A requisição teve status {request.response.status_code}")
-                        print("\n=== RESPOSTA DA API ===")
-                        pprint(json.loads(request.response.body.decode('utf-8')))  # Exibe formatado de forma legível
-                        print("======================\n")
-                        self.fail(f"Erro na requisição para {tipo_assinatura}: Status {request.response.status_code}")
-                        
-                    logger.info(f"✅ Assinatura criada para o acesso '{acessos}' com cobrança no Asaas[{cobrança_no_asaas}] e chave = {chave_da_assinatura}.")
-                    return
-            sleep(2)  
+        # Registra a expectativa da requisição de assinatura antes de disparar o fluxo
+        expectativa = rede.MonitorDeRede.para(self.driver).esperar("subscription", metodo="POST")
+
+        # Cria a assinatura para um usuário existente em etapas; uma etapa que falha é refeita a partir do
+        # checkpoint válido mais próximo, sem repetir o teste inteiro. O envio chega ao checkpoint quando a requisição
+        # é respondida e nunca é refeito depois que ela saiu do navegador (evita assinatura duplicada)
+        fluxo = (checkpoints.FluxoComCheckpoints(f"Criação da assinatura {tipo_assinatura}")
+                 .checkpoint_alcancado("logado", self.login_page.logado, self.tempo_login)
+                 .etapa("no_backoffice", self.navegar_ate_criacao, criar.formulario_vazio)
+                 .etapa("formulario_parcial", criar.selecionar_usuario_e_org, criar.usuario_e_org_selecionados)
+                 .etapa("formulario_preenchido", partial(criar.preencher_assinatura, tipo_assinatura, chave_da_assinatura), lambda: False)
+                 .etapa("enviado", partial(criar.concluir, com_asaas), expectativa.resolvida.is_set, expectativa.enviada))
+        fluxo.executar()
+        acessos = fluxo.resultado("formulario_preenchido")
+        cobrança_no_asaas = com_asaas
         
-        # Se o tempo expirar sem encontrar a requisição esperada, o teste falha
-        self.fail(f"Timeout: Nenhuma requisição para subscription foi detectada em {max_wait_time} segundos")
+        # Aguarda a resposta da requisição dentro do tempo limite (resolvida assim que a resposta chega)
+        try:
+            response = expectativa.aguardar(max_wait_time)
+        except TimeoutException:
+            self.fail(f"Timeout: Nenhuma requisição para subscription foi detectada em {max_wait_time} segundos")
+
+        self.conferir_resposta(tipo_assinatura, response.status_code, expectativa.corpo, acessos, cobrança_no_asaas, chave_da_assinatura)
+
+        # Grava o payload enviado pelo formulário para os próximos casos pelo modo híbrido
+        api_assinaturas.salvar_modelo(tipo_assinatura, com_asaas, chave_da_assinatura, acessos, expectativa.request)
+
+    # Método para verificar a criação de uma assinatura enviando o payload do formulário direto à API
+    def verificar_criacao_assinatura_api(self, tipo_assinatura, com_asaas, modelo):
+        # Pela API o teste quase não envia comandos WebDriver, então o orçamento medido tem histórico próprio
+        comandos.marcar_caminho("api")
+        chave_da_assinatura = randint(10, 99)
+        response = api_assinaturas.criar_assinatura(self.driver, modelo, chave_da_assinatura)
+        self.conferir_resposta(tipo_assinatura, response.status_code, response.body, modelo["acessos"], com_asaas, chave_da_assinatura)
+
+    # Método que confere a resposta da criação e registra o resultado (mesmo formato nos dois caminhos)
+    def conferir_resposta(self, tipo_assinatura, status_code, corpo, acessos, cobrança_no_asaas, chave_da_assinatura):
+        # Verifica se a resposta não foi bem sucedida (status diferente de 200)
+        if status_code != 200:
+            logger.error(f"❌ Erro: A requisição teve status {status_code}")
+            rede.exibir_corpo(corpo)
+            self.fail(f"Erro na requisição para {tipo_assinatura}: Status {status_code}")
+            
+        logger.info(f"✅ Assinatura criada para o acesso '{acessos}' com cobrança no Asaas[{cobrança_no_asaas}] e chave = {chave_da_assinatura}.")
     
     
     # Teste para criar assinatura do tipo Venda+, Standard e Profissional sem integração com Asaas
@@ -124,11 +195,11 @@ class TestLogin(unittest.TestCase):
     """ 
     # Método executado após cada teste para limpar o ambiente
     def tearDown(self):
-        self.driver.quit()
         logger.debug("🔄 Ambiente zerado após o teste.")
 
 if __name__ == "__main__":
-    unittest.main()
+    with log_da_execucao():
+        unittest.main()
 
 # Para rodar e gerar relatório:
 # pytest TestSuit.py -n auto --html=TestSuit_report.html
\ No newline at end of file
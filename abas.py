@@ -0,0 +1,177 @@
+"""
+================================================================================
+--- Este arquivo implementa o modo de várias abas: um único navegador (um Chrome
+    e um proxy do selenium-wire) executa vários fluxos independentes, cada um em
+    uma aba dentro do seu próprio contexto de navegação (CDP
+    Target.createBrowserContext), com cookies e storage isolados.
+
+--- Estrutura principal:
+    1. Fluxo: Um fluxo em execução (aba, contexto, resultado ou erro)
+       - requisicoes: Requisições capturadas feitas pelo fluxo
+
+    2. NavegadorCompartilhado: Classe que executa os fluxos no mesmo navegador
+       - abrir_fluxo: Cria o contexto isolado e a aba do fluxo
+       - executar: Executa as funções dos fluxos, uma thread por fluxo, intercalando
+         os comandos WebDriver de todas elas
+       - fechar: Fecha os contextos dos fluxos e volta à aba original
+
+--- Intercalação: os comandos WebDriver de cada fluxo passam por uma trava única
+    e, antes de cada comando, o navegador é levado para a aba do fluxo (o
+    switchToWindow só é enviado quando a aba atual é de outro fluxo). Um fluxo
+    que espera (intervalo entre as tentativas das esperas do auxiliar.py, resposta
+    da rede) não segura a trava, e os demais fluxos avançam nesse tempo.
+
+--- Atribuição das requisições: o User-Agent de cada aba recebe a marca
+    rede.MARCA_FLUXO seguida do nome do fluxo, que o selenium-wire vê em todas as
+    requisições da aba (rede.fluxo_da_requisicao, MonitorDeRede.esperar(fluxo=...)).
+    As abas que o próprio fluxo abre (como a do Backoffice) recebem a marca na
+    primeira troca do fluxo para elas.
+
+--- As funções dos fluxos recebem o Fluxo e usam fluxo.driver com as classes do
+    Pages.py normalmente. As trocas de aba entram nas métricas (abas_trocas).
+    O modo é usado pelo gerador de carga (Carga.py --fluxos-por-navegador); a
+    suíte de testes continua com um fluxo por navegador.
+    Sem suporte a contextos de navegação, cada fluxo ganha uma aba comum (storage
+    compartilhado) e um aviso no log.
+================================================================================
+"""
+import re
+import threading
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from auxiliar import logger
+import metricas
+import rede
+
+# Comando do chromedriver que executa um comando CDP
+COMANDO_CDP = "executeCdpCommand"
+
+# Classe que representa um fluxo executado em uma aba do navegador compartilhado
+class Fluxo:
+    def __init__(self, driver, nome, aba, contexto):
+        self.driver = driver
+        self.nome = nome
+        self.aba = aba
+        self.contexto = contexto
+        self.abas_marcadas = set()
+        self.resultado = None
+        self.erro = None
+
+    # Método que retorna as requisições capturadas feitas por este fluxo
+    def requisicoes(self):
+        return [request for request in self.driver.requests if rede.fluxo_da_requisicao(request) == self.nome]
+
+# Classe que executa vários fluxos isolados no mesmo navegador, intercalando seus comandos
+class NavegadorCompartilhado:
+    def __init__(self, driver):
+        self.driver = driver
+        self.aba_original = driver.current_window_handle
+        self.aba_atual = self.aba_original
+        self.agente = driver.execute_script("return navigator.userAgent;")
+        self.fluxos = []
+        self.trava = threading.RLock()
+        self._local = threading.local()
+        self._execute = driver.command_executor.execute
+        driver.command_executor.execute = self._executar_comando
+        # O monitor de rede é instalado antes das threads dos fluxos, que registram suas expectativas nele
+        rede.MonitorDeRede.para(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+    # Método que cria o contexto isolado e a aba de um fluxo, com a marca do fluxo no User-Agent
+    def abrir_fluxo(self, nome):
+        nome = re.sub(r"\s+", "_", nome)
+        try:
+            contexto = self.driver.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            alvo = self.driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank", "browserContextId": contexto})["targetId"]
+            aba = next(handle for handle in self.driver.window_handles if handle.endswith(alvo))
+        except (WebDriverException, StopIteration):
+            logger.info(f"⚠️ Contexto isolado indisponível para o fluxo {nome}, usando uma aba comum (storage compartilhado).")
+            contexto = None
+            self.driver.switch_to.window(self.aba_original)
+            self.driver.switch_to.new_window("tab")
+            aba = self.driver.current_window_handle
+
+        # A troca para a aba instala nela a coleta de erros JavaScript (tempos_limite.instalar)
+        fluxo = Fluxo(self.driver, nome, aba, contexto)
+        with self.trava:
+            self.driver.switch_to.window(aba)
+            self._marcar_aba(fluxo)
+        self.fluxos.append(fluxo)
+        logger.debug(f"ℹ️ Fluxo {nome} aberto na aba {aba} (contexto {contexto}).")
+        return fluxo
+
+    # Método que executa as funções dos fluxos ({nome: função que recebe o Fluxo}) em paralelo e retorna os fluxos
+    def executar(self, funcoes):
+        fluxos = [self.abrir_fluxo(nome) for nome in funcoes]
+        threads = [threading.Thread(target=self._rodar, args=(fluxo, funcao), name=f"fluxo-{fluxo.nome}")
+                   for fluxo, funcao in zip(fluxos, funcoes.values())]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return fluxos
+
+    # Método executado na thread do fluxo: associa a thread ao fluxo e guarda o resultado ou o erro
+    def _rodar(self, fluxo, funcao):
+        self._local.fluxo = fluxo
+        try:
+            fluxo.resultado = funcao(fluxo)
+        except Exception as erro:
+            fluxo.erro = erro
+            logger.error(f"❌ Erro: Fluxo {fluxo.nome} interrompido: {type(erro).__name__}: {erro}")
+
+    # Envolve o command executor: leva o navegador para a aba do fluxo da thread antes de cada comando
+    def _executar_comando(self, comando, params):
+        fluxo = getattr(self._local, "fluxo", None)
+        with self.trava:
+            if fluxo is not None and comando != Command.SWITCH_TO_WINDOW and self.aba_atual != fluxo.aba:
+                self._execute(Command.SWITCH_TO_WINDOW, {"handle": fluxo.aba})
+                self.aba_atual = fluxo.aba
+                metricas.incrementar("abas_trocas")
+
+            resposta = self._execute(comando, params)
+            if comando == Command.SWITCH_TO_WINDOW and resposta.get("status", 0) == 0:
+                # O próprio fluxo trocou de janela (por exemplo, para uma aba aberta por um link ou window.open)
+                self.aba_atual = params["handle"]
+                if fluxo is not None:
+                    fluxo.aba = params["handle"]
+                    if fluxo.aba not in fluxo.abas_marcadas:
+                        self._marcar_aba(fluxo)
+            elif comando == Command.W3C_GET_WINDOW_HANDLES and fluxo is not None and fluxo.contexto is not None:
+                resposta["value"] = self._janelas_do_contexto(resposta["value"], fluxo.contexto)
+            return resposta
+
+    # Método que põe a marca do fluxo no User-Agent da aba atual (o override do CDP vale só para a aba em que é enviado)
+    # Numa aba aberta pelo próprio fluxo, as requisições feitas antes da troca para ela ficam sem a marca
+    def _marcar_aba(self, fluxo):
+        self._execute(COMANDO_CDP, {"cmd": "Emulation.setUserAgentOverride",
+                                    "params": {"userAgent": f"{self.agente} {rede.MARCA_FLUXO}{fluxo.nome}"}})
+        fluxo.abas_marcadas.add(fluxo.aba)
+
+    # Método que filtra as janelas que pertencem ao contexto do fluxo (para window_handles não ver as abas dos outros)
+    def _janelas_do_contexto(self, janelas, contexto):
+        alvos = self._execute(COMANDO_CDP, {"cmd": "Target.getTargets", "params": {}})["value"]["targetInfos"]
+        do_contexto = {alvo["targetId"] for alvo in alvos if alvo.get("browserContextId") == contexto}
+        return [janela for janela in janelas if any(janela.endswith(alvo) for alvo in do_contexto)]
+
+    # Método que fecha os contextos e as abas dos fluxos, volta à aba original e restaura o command executor
+    def fechar(self):
+        with self.trava:
+            for fluxo in self.fluxos:
+                try:
+                    if fluxo.contexto is not None:
+                        self._execute(COMANDO_CDP, {"cmd": "Target.disposeBrowserContext",
+                                                    "params": {"browserContextId": fluxo.contexto}})
+                    else:
+                        self._execute(Command.SWITCH_TO_WINDOW, {"handle": fluxo.aba})
+                        self._execute(Command.CLOSE, {})
+                except WebDriverException:
+                    continue
+            self.fluxos.clear()
+            self.driver.command_executor.execute = self._execute
+            self.driver.switch_to.window(self.aba_original)
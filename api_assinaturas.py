@@ -0,0 +1,147 @@
+"""
+================================================================================
+--- Este arquivo implementa o modo híbrido de criação de assinaturas: o navegador
+    faz login uma vez e o payload enviado pelo formulário (capturado pelo
+    selenium-wire) é reenviado direto à API por uma sessão HTTP com pool de
+    conexões, sem preencher o formulário a cada caso da matriz de testes.
+
+--- Estrutura principal:
+    1. Biblioteca de modelos (.cache_api/modelos.json):
+       - salvar_modelo: Grava a requisição enviada pelo formulário para (plano, Asaas)
+       - carregar_modelo: Retorna o modelo gravado para (plano, Asaas), se houver
+
+    2. ClienteDeAssinaturas: Sessão HTTP (urllib3) com as credenciais do navegador
+       - do_navegador: Cria o cliente com os cookies e o token de autorização do navegador
+       - criar: Reenvia o modelo trocando a chave da assinatura
+
+    3. criar_assinatura: Usa o cliente do worker (criado uma vez) e o renova se a
+       API recusar as credenciais
+
+--- Os modelos são gravados pelos testes que passam pelo formulário, então um caso
+    só usa a API depois de ter passado pela interface ao menos uma vez.
+
+--- No modelo, os valores derivados da chave (nome, e-mail, telefone e preço do
+    formulário) são trocados pelos da nova chave antes do envio.
+================================================================================
+"""
+import fcntl
+import json
+import os
+from collections import namedtuple
+import urllib3
+from urllib.parse import urlsplit
+from auxiliar import logger
+
+# Arquivo da biblioteca de modelos de requisição e trava que serializa as gravações entre workers
+ARQUIVO_MODELOS = os.path.join(".cache_api", "modelos.json")
+ARQUIVO_TRAVA = os.path.join(".cache_api", "modelos.trava")
+
+# Cabeçalhos que não são copiados do modelo (definidos pela própria sessão HTTP ou exclusivos do navegador)
+CABECALHOS_IGNORADOS = {"host", "content-length", "cookie", "connection", "accept-encoding", "proxy-connection"}
+
+# Resposta da API no mesmo formato usado pelas verificações dos testes
+Resposta = namedtuple("Resposta", ["status_code", "body"])
+
+# Cliente do worker, criado a partir do primeiro navegador logado
+_cliente = None
+
+# Função que carrega todos os modelos gravados
+def _carregar_modelos():
+    try:
+        with open(ARQUIVO_MODELOS) as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+# Função que grava o payload enviado pelo formulário como modelo para (plano, Asaas)
+def salvar_modelo(plano, com_asaas, chave, acessos, request):
+    modelo = {
+        "metodo": request.method,
+        "url": request.url,
+        "cabecalhos": {nome: valor for nome, valor in request.headers.items() if nome.lower() not in CABECALHOS_IGNORADOS},
+        "corpo": request.body.decode("utf-8"),
+        "chave": chave,
+        "acessos": acessos,
+    }
+
+    # Leitura, alteração e gravação sob a trava, para que workers gravando planos diferentes ao mesmo tempo não
+    # percam os modelos um do outro; o arquivo temporário evita que uma leitura sem trava o veja pela metade
+    os.makedirs(os.path.dirname(ARQUIVO_MODELOS), exist_ok=True)
+    with open(ARQUIVO_TRAVA, "w") as trava:
+        fcntl.flock(trava, fcntl.LOCK_EX)
+        modelos = _carregar_modelos()
+        modelos[f"{plano}|{com_asaas}"] = modelo
+        temporario = f"{ARQUIVO_MODELOS}.{os.getpid()}"
+        with open(temporario, "w") as arquivo:
+            json.dump(modelos, arquivo)
+        os.replace(temporario, ARQUIVO_MODELOS)
+    logger.debug(f"ℹ️ Modelo de requisição salvo para {plano} com Asaas[{com_asaas}].")
+
+# Função que retorna o modelo gravado para (plano, Asaas), ou None
+def carregar_modelo(plano, com_asaas):
+    return _carregar_modelos().get(f"{plano}|{com_asaas}")
+
+# Função que troca, em todo o corpo, os valores derivados da chave antiga pelos da nova
+def _trocar_chave(valor, antiga, nova):
+    if isinstance(valor, dict):
+        return {nome: _trocar_chave(item, antiga, nova) for nome, item in valor.items()}
+    if isinstance(valor, list):
+        return [_trocar_chave(item, antiga, nova) for item in valor]
+    if isinstance(valor, str):
+        for trecho in ("SeleniumBot", "41999900"):
+            valor = valor.replace(f"{trecho}{antiga}", f"{trecho}{nova}")
+        return f"{nova}000" if valor == f"{antiga}000" else valor
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool) and valor == antiga * 1000:
+        return nova * 1000
+    return valor
+
+# Classe que envia requisições à API com as credenciais do navegador, reaproveitando as conexões
+class ClienteDeAssinaturas:
+    def __init__(self, cookies, autorizacao=None):
+        self.cookies = cookies
+        self.autorizacao = autorizacao
+        self.http = urllib3.PoolManager(maxsize=4, retries=False, timeout=urllib3.Timeout(connect=10, read=120))
+
+    # Método que cria o cliente com os cookies e o último token de autorização usados pelo navegador
+    @classmethod
+    def do_navegador(cls, driver):
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        autorizacao = next((request.headers["Authorization"] for request in reversed(driver.requests)
+                            if request.headers.get("Authorization")), None)
+        return cls(cookies, autorizacao)
+
+    # Método que monta o cabeçalho Cookie com os cookies válidos para o host
+    def _cookies_para(self, host):
+        validos = [cookie for cookie in self.cookies
+                   if host == cookie["domain"].lstrip(".") or host.endswith("." + cookie["domain"].lstrip("."))]
+        return "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in validos)
+
+    # Método que reenvia o modelo à API com a nova chave e retorna a resposta
+    def criar(self, modelo, chave):
+        corpo = modelo["corpo"]
+        try:
+            corpo = json.dumps(_trocar_chave(json.loads(corpo), modelo["chave"], chave))
+        except ValueError:
+            logger.debug("⚠️ Corpo do modelo não é JSON, será reenviado sem alterações.")
+
+        cabecalhos = dict(modelo["cabecalhos"])
+        cabecalhos["Cookie"] = self._cookies_para(urlsplit(modelo["url"]).hostname)
+        if self.autorizacao:
+            cabecalhos = {nome: valor for nome, valor in cabecalhos.items() if nome.lower() != "authorization"}
+            cabecalhos["Authorization"] = self.autorizacao
+
+        resposta = self.http.request(modelo["metodo"], modelo["url"], body=corpo.encode("utf-8"), headers=cabecalhos)
+        return Resposta(resposta.status, resposta.data)
+
+# Função que cria a assinatura pela API com o cliente do worker, renovando as credenciais se forem recusadas
+def criar_assinatura(driver, modelo, chave):
+    global _cliente
+    if _cliente is None:
+        _cliente = ClienteDeAssinaturas.do_navegador(driver)
+
+    resposta = _cliente.criar(modelo, chave)
+    if resposta.status_code in (401, 403):
+        logger.debug("⚠️ Credenciais recusadas pela API, renovando a partir do navegador.")
+        _cliente = ClienteDeAssinaturas.do_navegador(driver)
+        resposta = _cliente.criar(modelo, chave)
+    return resposta
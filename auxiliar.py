@@ -5,13 +5,41 @@
 
 --- Estrutura principal:
     1. Funções de interação com elementos da interface:
-       - find_element: Localiza um elemento na página com timeout
+       - find_element: Localiza um elemento na página com timeout (presente ou, com
+         visivel=True, visível, para campos e botões mostrados só após o carregamento)
+       - find_any_element: Localiza o primeiro de vários elementos que aparecer
        - wait_for_element: Aguarda um elemento desaparecer da página
-       - find_element_in_element: Busca um elemento dentro de outro elemento
+       - find_element_in_element: Busca um elemento dentro de outro elemento pelo texto,
+         com uma única chamada ao navegador por tentativa
 
-    2. Configuração do sistema de logging:
-       - Configuração do logger para registrar informações no arquivo TestSuit.log
-       - Formatação das mensagens com timestamp e níveis de log (DEBUG, INFO, ERROR)
+    2. Esperas por eventos da página (substituem sleeps fixos):
+       - wait_for_angular: Aguarda o Angular ficar estável
+       - wait_for_ng_select_options: Aguarda as opções de um ng-select contendo um texto
+       - wait_for_xhr: Aguarda a requisição de busca capturada pelo selenium-wire responder
+       - send_keys_to_ng_select: Digita num ng-select e aguarda as três esperas acima, em sequência
+
+    3. Preenchimento em lote:
+       - fill_inputs: Preenche vários campos de texto em um único execute_script,
+         disparando os eventos input, change e blur que o Angular escuta
+
+    4. Sistema de logging (configurado pelo conftest.py, não na importação):
+       - configurar_log: Liga o logger a uma fila gravada em segundo plano, um arquivo
+         JSON lines por worker, com o nível da execução (NIVEL_LOG)
+       - encerrar_log: Grava os registros pendentes e desliga o logger do arquivo
+       - limpar_logs / mesclar_logs: Apagam os arquivos dos workers e os juntam, em
+         ordem de instante, no TestSuit.log
+       - log_da_execucao: Faz todo o ciclo acima em execuções fora do pytest
+
+--- As funções de interação e espera são cronometradas como etapas do teste
+    (instrumentacao.py).
+
+--- find_element e wait_for_element usam, sem tempo informado, o tempo-limite
+    adaptativo do localizador, e todas as esperas por elementos são interrompidas
+    antes do tempo-limite quando a plataforma responde HTTP 5xx ou a página tem um
+    erro JavaScript (tempos_limite.py).
+
+--- As funções de espera aceitam tanto uma tupla (By, valor) quanto um localizador
+    do registro (localizadores.py), que tenta várias estratégias em ordem.
 
 --- Estas funções auxiliares são utilizadas pelos arquivos Pages.py e TestSuit.py
     para simplificar o código de automação, reduzir duplicação e melhorar a
@@ -20,53 +48,357 @@
 """
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import quote
+import glob
+import heapq
+import json
 import logging
-from time import sleep
+import os
+import queue
+from time import sleep, monotonic
+from localizadores import Localizador
+from instrumentacao import medido, teste_atual
+from tempos_limite import FalhaAntecipada
+import metricas
+import tempos_limite
+
+# Script que retorna o primeiro descendente visível (em ordem do documento) cujo texto contém a busca
+SCRIPT_BUSCAR_POR_TEXTO = """
+const busca = arguments[1].toLowerCase();
+for (const el of arguments[0].querySelectorAll("*")) {
+    if (el.getClientRects().length && (el.innerText || "").trim().toLowerCase().includes(busca)) return el;
+}
+return null;
+"""
+
+# Script que verifica se todas as aplicações Angular da página estão estáveis (sem HTTP ou timers pendentes)
+SCRIPT_ANGULAR_ESTAVEL = """
+if (!window.getAllAngularTestabilities) return true;
+return window.getAllAngularTestabilities().every(t => t.isStable());
+"""
+
+# Script que verifica se o ng-select aberto terminou de carregar e exibe opções contendo o texto
+SCRIPT_NG_SELECT_PRONTO = """
+const texto = (arguments[0] || "").toLowerCase();
+if (document.querySelector("ng-select .ng-spinner-loader")) return false;
+const opcoes = document.querySelectorAll("ng-dropdown-panel .ng-option:not(.ng-option-disabled)");
+return Array.from(opcoes).some(o => o.textContent.toLowerCase().includes(texto));
+"""
+
+# Script que preenche vários campos de uma vez, como o Angular espera de uma digitação: foco, valor pelo setter
+# nativo, eventos input e change e perda de foco (blur). Cada item é [elemento, valor] ou [âncora, [valores]],
+# que preenche os campos seguintes à âncora na ordem do TAB; retorna os valores que ficaram nos campos
+SCRIPT_PREENCHER_CAMPOS = """
+const tabulaveis = () => Array.from(document.querySelectorAll("input, select, textarea, button, a[href], [tabindex]"))
+    .filter(el => el.tabIndex >= 0 && !el.disabled && el.getClientRects().length);
+const definir = (el, valor) => {
+    if (el.type === "date" && /^\\d{8}$/.test(valor)) valor = `${valor.slice(4)}-${valor.slice(2, 4)}-${valor.slice(0, 2)}`;
+    const prototipo = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(prototipo, "value").set.call(el, valor);
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    el.blur();
+    return el.value;
+};
+const preenchidos = [];
+for (const [elemento, valor] of arguments[0]) {
+    if (!Array.isArray(valor)) {
+        preenchidos.push(definir(elemento, valor));
+        continue;
+    }
+    const ordem = tabulaveis();
+    const inicio = ordem.indexOf(elemento);
+    const seguintes = ordem.slice(inicio + 1, inicio + 1 + valor.length);
+    if (inicio < 0 || seguintes.length < valor.length) throw new Error("Campos seguintes à âncora não encontrados");
+    valor.forEach((v, i) => preenchidos.push(definir(seguintes[i], v)));
+}
+return preenchidos;
+"""
+
+# Função que monta a condição de presença para um localizador do registro ou uma tupla (By, valor)
+def _presenca(path):
+    if isinstance(path, Localizador):
+        return path.encontrar
+    return EC.presence_of_element_located(path)
+
+# Função que monta a condição de visibilidade para um localizador do registro ou uma tupla (By, valor)
+def _visibilidade(path):
+    if isinstance(path, Localizador):
+        return path.visivel
+    return EC.visibility_of_element_located(path)
+
+# Função que monta a condição de invisibilidade para um localizador do registro ou uma tupla (By, valor)
+def _invisibilidade(path):
+    if isinstance(path, Localizador):
+        return path.invisivel
+    return EC.invisibility_of_element_located(path)
+
+# Função que retorna a chave do histórico de esperas de um localizador do registro (None para tuplas)
+def _chave_espera(path, evento):
+    return f"{path.nome}:{evento}" if isinstance(path, Localizador) else None
 
 # Função que espera elemento aparecer e retorna o elemento
-def find_element(driver, path, tempo=120):
+# Sem tempo informado, o tempo-limite vem do histórico do localizador (tempos_limite.py); com visivel=True espera
+# o elemento ficar visível (um elemento presente mas oculto não recebe cliques nem teclas)
+@medido
+def find_element(driver, path, tempo=None, visivel=False):
+    inicio = monotonic()
+    chave = _chave_espera(path, "aparecer")
+    tempo = tempo or tempos_limite.limite(chave)
     try:
         element = WebDriverWait(driver, tempo).until(
-        EC.presence_of_element_located(path)
+        tempos_limite.com_sinais_de_falha(_visibilidade(path) if visivel else _presenca(path))
         )
+        if chave:
+            tempos_limite.registrar(chave, monotonic() - inicio)
         return element
 
+    except FalhaAntecipada as erro:
+        logger.error(f"❌ Erro: Espera interrompida antes do tempo-limite: {erro.msg} -> Elemento:{path}")
+        raise
+
     except TimeoutException:
-        logger.error(f"❌ Erro: O elemento não apareceu dentro de {tempo} segundos. -> Elemento:{path}")
+        logger.error(f"❌ Erro: O elemento não apareceu dentro de {tempo:.0f} segundos. -> Elemento:{path}")
+        raise
+
+    # Latência de resolução dos localizadores do registro (inclusive quando estouram o tempo)
+    finally:
+        if isinstance(path, Localizador):
+            path.registrar_latencia(monotonic() - inicio)
+
+# Função que espera o primeiro de vários elementos aparecer e retorna esse elemento
+@medido
+def find_any_element(driver, paths, tempo=120):
+    try:
+        element = WebDriverWait(driver, tempo).until(
+        tempos_limite.com_sinais_de_falha(EC.any_of(*[_presenca(path) for path in paths]))
+        )
+        return element
+
+    except FalhaAntecipada as erro:
+        logger.error(f"❌ Erro: Espera interrompida antes do tempo-limite: {erro.msg} -> Elementos:{paths}")
+        raise
+
+    except TimeoutException:
+        logger.error(f"❌ Erro: Nenhum dos elementos apareceu dentro de {tempo} segundos. -> Elementos:{paths}")
         raise
     
 # Função que espera elemento desaparecer e retorna True
-def wait_for_element(driver, path, tempo=120):
+# Sem tempo informado, o tempo-limite vem do histórico do localizador (tempos_limite.py)
+@medido
+def wait_for_element(driver, path, tempo=None):
+    inicio = monotonic()
+    chave = _chave_espera(path, "desaparecer")
+    tempo = tempo or tempos_limite.limite(chave)
     try:
         WebDriverWait(driver, tempo).until(
-        EC.invisibility_of_element_located(path)
+        tempos_limite.com_sinais_de_falha(_invisibilidade(path))
         )
+        if chave:
+            tempos_limite.registrar(chave, monotonic() - inicio)
         return True
 
+    except FalhaAntecipada as erro:
+        logger.error(f"❌ Erro: Espera interrompida antes do tempo-limite: {erro.msg} -> Elemento:{path}")
+        raise
+
     except TimeoutException:
-        logger.error(f"❌ Erro: O elemento não desapareceu dentro de {tempo} segundos. -> Elemento:{path}")
+        logger.error(f"❌ Erro: O elemento não desapareceu dentro de {tempo:.0f} segundos. -> Elemento:{path}")
         raise
 
-# Função que encontra um elemento dentro de um elemento pai
-def find_element_in_element(elemento_pai, texto_busca, tentativas=10):
-    for tentativa in range(tentativas):
-        for element in elemento_pai.find_elements(By.XPATH, ".//*"):
-            if texto_busca.lower() in element.text.strip().lower():
-                return element
-        logger.debug(f"⚠️ Tentativa {tentativa + 1}: O elemento de texto {texto_busca}, não apareceu na seleção.")
-        sleep(3)
-    
-    logger.error(f"❌ Erro: O elemento de texto {texto_busca}, não apareceu na seleção.") 
-    raise
+# Função que verifica se há requisição pendente (sem resposta) contendo o texto na URL desde o instante informado
+def _requisicao_pendente(driver, texto, desde):
+    trechos = {texto.lower(), quote(texto, safe="").lower()}
+    for request in reversed(driver.requests):
+        if request.date < desde:
+            return False
+        if request.response is None and any(trecho in request.url.lower() for trecho in trechos):
+            return True
+    return False
+
+# Função que espera as aplicações Angular da página ficarem estáveis e retorna se conseguiu
+@medido
+def wait_for_angular(driver, tempo=10):
+    try:
+        WebDriverWait(driver, tempo, poll_frequency=0.2).until(
+        lambda d: d.execute_script(SCRIPT_ANGULAR_ESTAVEL)
+        )
+        return True
+
+    except TimeoutException:
+        logger.debug(f"⚠️ O Angular não estabilizou dentro de {tempo} segundos, seguindo mesmo assim.")
+        return False
+
+# Função que espera as opções de um ng-select aparecerem contendo o texto e retorna se conseguiu
+@medido
+def wait_for_ng_select_options(driver, texto="", tempo=10):
+    try:
+        WebDriverWait(driver, tempo, poll_frequency=0.2).until(
+        lambda d: d.execute_script(SCRIPT_NG_SELECT_PRONTO, texto)
+        )
+        return True
+
+    except TimeoutException:
+        logger.debug(f"⚠️ As opções do ng-select para '{texto}' não apareceram dentro de {tempo} segundos, seguindo mesmo assim.")
+        return False
+
+# Função que espera a requisição (XHR) com o texto na URL, feita desde o instante informado, receber resposta
+@medido
+def wait_for_xhr(driver, texto, desde, tempo=10):
+    try:
+        WebDriverWait(driver, tempo, poll_frequency=0.2).until(
+        lambda d: not _requisicao_pendente(d, texto, desde)
+        )
+        return True
+
+    except TimeoutException:
+        logger.debug(f"⚠️ A requisição de busca por '{texto}' não respondeu dentro de {tempo} segundos, seguindo mesmo assim.")
+        return False
+
+# Função que digita num ng-select e espera a busca terminar (XHR respondida, opções filtradas e Angular estável)
+# A busca é o texto completo já digitado no campo; o tempo é o limite máximo das três esperas juntas:
+# ao estourar, o fluxo segue como seguiria após um sleep fixo
+@medido
+def send_keys_to_ng_select(driver, campo, teclas, busca=None, tempo=10):
+    busca = busca or teclas
+    desde = datetime.now()
+    limite = monotonic() + tempo
+    campo.send_keys(teclas)
+
+    # Cada espera recebe o tempo que sobrou das anteriores (com um mínimo para uma última verificação)
+    def restante():
+        return max(limite - monotonic(), 0.2)
+    return (wait_for_xhr(driver, busca, desde, restante())
+            and wait_for_ng_select_options(driver, busca, restante())
+            and wait_for_angular(driver, restante()))
 
-# Configuração do logger
+# Função que preenche vários campos de texto com um único comando ao navegador e retorna os valores que ficaram nos campos
+# Cada item é (elemento, valor) ou (âncora, [valores]), que preenche os campos seguintes à âncora na ordem do TAB.
+# Campos que dependem de teclas de verdade (buscas do ng-select) continuam com send_keys
+@medido
+def fill_inputs(driver, campos):
+    campos = [[elemento, list(valor) if isinstance(valor, (list, tuple)) else str(valor)] for elemento, valor in campos]
+    preenchidos = driver.execute_script(SCRIPT_PREENCHER_CAMPOS, campos)
+    metricas.incrementar("campos_preenchidos_em_lote", len(preenchidos))
+    logger.debug(f"ℹ️ {len(preenchidos)} campos preenchidos em lote: {preenchidos}")
+    return preenchidos
+
+# Função que encontra um elemento dentro de um elemento pai pelo texto (sem diferenciar maiúsculas)
+# A busca inteira é feita no navegador por um único execute_script por tentativa, com intervalo crescente entre tentativas
+@medido
+def find_element_in_element(elemento_pai, texto_busca, tempo=30):
+    driver = elemento_pai.parent
+    inicio = monotonic()
+    intervalo = 0.1
+    idas_e_voltas = 0
+    while True:
+        idas_e_voltas += 1
+        element = driver.execute_script(SCRIPT_BUSCAR_POR_TEXTO, elemento_pai, texto_busca)
+        if element is not None or monotonic() - inicio + intervalo > tempo:
+            break
+        sleep(intervalo)
+        intervalo = min(intervalo * 2, 1.0)
+
+    metricas.incrementar("find_element_in_element_idas_e_voltas", idas_e_voltas)
+    if element is None:
+        logger.error(f"❌ Erro: O elemento de texto {texto_busca}, não apareceu na seleção. ({idas_e_voltas} idas e voltas)")
+        raise TimeoutException(f"O elemento de texto {texto_busca} não apareceu dentro de {tempo} segundos")
+
+    logger.debug(f"ℹ️ Elemento de texto {texto_busca} encontrado com {idas_e_voltas} ida(s) e volta(s) ao navegador.")
+    return element
+
+# Logger compartilhado pela automação (sem handlers até configurar_log, para que importar o módulo seja barato)
 logger = logging.getLogger("MeuLogger")
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
 
-# Handler para o arquivo de log
-file_handler = logging.FileHandler("TestSuit.log", mode="w")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+# Diretório dos arquivos de log dos workers, arquivo mesclado da execução e formato das linhas mescladas
+DIRETORIO_LOGS = ".logs"
+ARQUIVO_LOG = "TestSuit.log"
+FORMATO_DATA = "%Y-%m-%d %H:%M:%S"
+
+# Listener que grava os registros da fila em segundo plano (um por processo)
+_listener = None
+
+# Classe que escreve cada registro como uma linha JSON (instante, worker, teste, nível e mensagem)
+class FormatoJson(logging.Formatter):
+    def format(self, record):
+        return json.dumps({"instante": record.created, "worker": record.worker, "teste": record.teste,
+                           "nivel": record.levelname, "mensagem": record.getMessage()}, ensure_ascii=False)
+
+# Filtro que identifica, na thread que gerou o registro, o worker e o teste em execução
+class ContextoDoRegistro(logging.Filter):
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def filter(self, record):
+        record.worker = self.worker
+        record.teste = teste_atual()
+        return True
+
+# Função que liga o logger a uma fila gravada em segundo plano no arquivo do worker (.logs/log_<worker>.jsonl)
+# O nível vem do argumento ou da variável NIVEL_LOG (padrão DEBUG)
+def configurar_log(nivel=None):
+    global _listener
+    if _listener is not None:
+        return
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    os.makedirs(DIRETORIO_LOGS, exist_ok=True)
+    arquivo = logging.FileHandler(os.path.join(DIRETORIO_LOGS, f"log_{worker}.jsonl"), mode="a", encoding="utf-8")
+    arquivo.setFormatter(FormatoJson())
+
+    fila = queue.SimpleQueue()
+    handler = QueueHandler(fila)
+    handler.addFilter(ContextoDoRegistro(worker))
+    logger.setLevel(nivel or os.environ.get("NIVEL_LOG", "DEBUG").upper())
+    logger.addHandler(handler)
+    _listener = QueueListener(fila, arquivo)
+    _listener.start()
+
+# Função que grava os registros pendentes na fila e desliga o logger do arquivo
+def encerrar_log():
+    global _listener
+    if _listener is None:
+        return
+    for handler in [handler for handler in logger.handlers if isinstance(handler, QueueHandler)]:
+        logger.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+# Função que apaga os arquivos de log dos workers de execuções anteriores
+def limpar_logs():
+    for caminho in glob.glob(os.path.join(DIRETORIO_LOGS, "log_*.jsonl")):
+        os.remove(caminho)
+
+# Função que junta os arquivos dos workers no TestSuit.log, em ordem de instante
+def mesclar_logs(destino=ARQUIVO_LOG):
+    arquivos = [open(caminho, encoding="utf-8") for caminho in sorted(glob.glob(os.path.join(DIRETORIO_LOGS, "log_*.jsonl")))]
+    try:
+        # Cada arquivo já está em ordem de instante, então basta intercalá-los
+        registros = heapq.merge(*[map(json.loads, filter(str.strip, arquivo)) for arquivo in arquivos],
+                                key=lambda registro: registro["instante"])
+        with open(destino, "w", encoding="utf-8") as saida:
+            for registro in registros:
+                instante = datetime.fromtimestamp(registro["instante"]).strftime(FORMATO_DATA)
+                origem = f"[{registro['worker']}] " if len(arquivos) > 1 else ""
+                saida.write(f"{instante} - {registro['nivel']} - {origem}{registro['mensagem']}\n")
+    finally:
+        for arquivo in arquivos:
+            arquivo.close()
+
+# Context manager com o ciclo completo do log para execuções fora do pytest (python TestSuit.py)
+@contextmanager
+def log_da_execucao(nivel=None):
+    limpar_logs()
+    configurar_log(nivel)
+    try:
+        yield
+    finally:
+        encerrar_log()
+        mesclar_logs()
@@ -0,0 +1,176 @@
+"""
+================================================================================
+--- Este arquivo implementa o modo de "navegação enxuta", que bloqueia recursos
+    que os testes não precisam (imagens, fontes, mídia, analytics e scripts de
+    terceiros) para acelerar os carregamentos de página.
+
+--- Estrutura principal:
+    1. PoliticaDeBloqueio: Tipos de recurso e hosts bloqueados
+
+    2. Bloqueador: Interceptador de requisições do selenium-wire que responde
+       aos recursos bloqueados com uma resposta vazia, sem acessar a rede
+       - coletar_resumo: Devolve e zera as estatísticas de bloqueio
+
+    3. Funções de uso:
+       - ativo: Diz se o modo está ligado (variável de ambiente NAVEGACAO_ENXUTA=1)
+       - configurar_chrome: Ajusta as opções do Chrome (sem tráfego de fundo)
+       - aplicar: Instala o bloqueador num navegador recém-criado
+       - registrar_resumo: Registra nas métricas os bloqueios do teste
+
+    4. Benchmark (python bloqueio.py): Compara o tempo até o splash-screen sumir
+       com e sem bloqueio
+
+--- O tipo do recurso vem do cabeçalho Sec-Fetch-Dest enviado pelo Chrome (ou da
+    extensão da URL). Os bytes economizados são estimados pelos tamanhos dos
+    recursos medidos na última execução sem bloqueio (.cache_bloqueio/).
+================================================================================
+"""
+import json
+import os
+import re
+import threading
+from auxiliar import logger
+import metricas
+
+# Tipos de recurso e hosts bloqueados por padrão
+TIPOS_PADRAO = ("image", "font", "media")
+HOSTS_PADRAO = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+    "hotjar.com", "clarity.ms", "intercom.io", "fonts.googleapis.com", "fonts.gstatic.com",
+)
+
+# Extensões usadas para identificar o tipo quando o Chrome não envia Sec-Fetch-Dest
+EXTENSOES = {
+    "image": r"\.(png|jpe?g|gif|svg|ico|webp|avif)(\?|$)",
+    "font": r"\.(woff2?|ttf|otf|eot)(\?|$)",
+    "media": r"\.(mp4|webm|mp3|ogg|wav)(\?|$)",
+}
+
+# Arquivo com os tamanhos dos recursos medidos sem bloqueio
+ARQUIVO_TAMANHOS = os.path.join(".cache_bloqueio", "tamanhos.json")
+
+# Classe que descreve os recursos bloqueados na navegação enxuta
+class PoliticaDeBloqueio:
+    def __init__(self, tipos=TIPOS_PADRAO, hosts=HOSTS_PADRAO):
+        self.tipos = set(tipos)
+        self.hosts = tuple(hosts)
+
+    # Método que diz se a requisição deve ser bloqueada
+    def bloquear(self, request):
+        if request.host.endswith(self.hosts):
+            return True
+        tipo = request.headers.get("Sec-Fetch-Dest")
+        if tipo:
+            return tipo in self.tipos
+        return any(re.search(EXTENSOES[tipo], request.path) for tipo in self.tipos if tipo in EXTENSOES)
+
+# Classe que intercepta as requisições do navegador e responde às bloqueadas sem acessar a rede
+class Bloqueador:
+    def __init__(self, driver, politica):
+        self.politica = politica
+        self.tamanhos = _carregar_tamanhos()
+        self.trava = threading.Lock()
+        self.bloqueadas = 0
+        self.bytes_economizados = 0
+        driver.request_interceptor = self._interceptar
+
+    # Interceptador do selenium-wire: responde com 204 vazio aos recursos bloqueados
+    def _interceptar(self, request):
+        if not self.politica.bloquear(request):
+            return
+        request.create_response(status_code=204, headers={"Content-Length": "0"}, body=b"")
+        with self.trava:
+            self.bloqueadas += 1
+            self.bytes_economizados += self.tamanhos.get(request.url, 0)
+
+    # Método que devolve as estatísticas de bloqueio e as zera
+    def coletar_resumo(self):
+        with self.trava:
+            resumo = {"requisicoes": self.bloqueadas, "bytes_economizados": self.bytes_economizados}
+            self.bloqueadas = 0
+            self.bytes_economizados = 0
+        return resumo
+
+# Função que carrega os tamanhos dos recursos medidos sem bloqueio
+def _carregar_tamanhos():
+    try:
+        with open(ARQUIVO_TAMANHOS) as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+# Função que diz se o modo de navegação enxuta está ligado nesta execução
+def ativo():
+    return os.environ.get("NAVEGACAO_ENXUTA") == "1"
+
+# Função que ajusta as opções do Chrome para não gerar tráfego de fundo (atualizações, extensões, notificações)
+def configurar_chrome(options):
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-sync")
+    options.add_experimental_option("prefs", {"profile.default_content_setting_values.notifications": 2})
+
+# Função que instala o bloqueador no navegador recém-criado
+def aplicar(driver, politica):
+    driver.bloqueador = Bloqueador(driver, politica)
+
+# Função que registra nas métricas os bloqueios do teste e zera os contadores
+def registrar_resumo(driver):
+    bloqueador = getattr(driver, "bloqueador", None)
+    if bloqueador is None:
+        return
+    resumo = bloqueador.coletar_resumo()
+    metricas.incrementar("bloqueio_requisicoes", resumo["requisicoes"])
+    metricas.incrementar("bloqueio_bytes_economizados", resumo["bytes_economizados"])
+    logger.info(f"ℹ️ Navegação enxuta: {resumo['requisicoes']} requisições bloqueadas (~{resumo['bytes_economizados']} bytes economizados).")
+
+# Benchmark: tempo até o splash-screen sumir, com e sem bloqueio
+if __name__ == "__main__":
+    import argparse
+    import statistics
+    from time import perf_counter
+    from selenium.webdriver.common.by import By
+    import auxiliar as aux
+    import navegador
+    import rede
+
+    parser = argparse.ArgumentParser(description="Compara o carregamento da plataforma com e sem navegação enxuta.")
+    parser.add_argument("--url", default="https://platform.ecotx.dev/")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    splash_screen = (By.XPATH, '//*[@id="splash-screen"]')
+    politica = PoliticaDeBloqueio()
+    tamanhos = {}
+    resultados = {}
+
+    # Guarda o tamanho de cada recurso que seria bloqueado (usado na estimativa de bytes economizados)
+    def medir_tamanho(request, response):
+        if politica.bloquear(request):
+            tamanhos[request.url] = len(response.body)
+
+    for modo, politica_bloqueio in (("sem bloqueio", None), ("com bloqueio", politica)):
+        tempos = []
+        for _ in range(args.repeticoes):
+            driver = navegador.criar_driver(politica_bloqueio=politica_bloqueio)
+            try:
+                if politica_bloqueio is None:
+                    rede.MonitorDeRede.para(driver).adicionar_ouvinte(medir_tamanho)
+                inicio = perf_counter()
+                driver.get(args.url)
+                aux.wait_for_element(driver, splash_screen)
+                tempos.append(perf_counter() - inicio)
+            finally:
+                driver.quit()
+        resultados[modo] = tempos
+
+        # Após a rodada sem bloqueio os tamanhos medidos ficam disponíveis para a estimativa
+        if politica_bloqueio is None:
+            os.makedirs(os.path.dirname(ARQUIVO_TAMANHOS), exist_ok=True)
+            with open(ARQUIVO_TAMANHOS, "w") as arquivo:
+                json.dump(tamanhos, arquivo)
+
+    for modo, tempos in resultados.items():
+        print(f"{modo}: mediana {statistics.median(tempos):.2f} s | média {statistics.mean(tempos):.2f} s | mín {min(tempos):.2f} s | máx {max(tempos):.2f} s")
+    print(f"recursos bloqueáveis medidos: {len(tamanhos)} ({sum(tamanhos.values())} bytes por carregamento)")
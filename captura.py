@@ -0,0 +1,204 @@
+"""
+================================================================================
+--- Este arquivo implementa a política de captura de rede dos navegadores, que
+    limita o que o selenium-wire guarda das requisições feitas pela plataforma
+    (scripts, fontes, imagens, polling), mantendo apenas o que os testes usam.
+
+--- Estrutura principal:
+    1. PoliticaDeCaptura: Configuração da captura
+       - incluir / excluir: Expressões regulares de URL guardadas / nunca guardadas
+       - corpos: Expressões regulares de URL cujos corpos são guardados
+       - max_corpo_bytes: Tamanho máximo de corpo mantido em memória
+       - max_requisicoes: Quantidade máxima de requisições retidas (buffer circular)
+       - diretorio_spool: Diretório onde os corpos guardados são gravados por inteiro
+
+    2. ArmazenamentoComPolitica: Envolve o armazenamento do selenium-wire e aplica
+       a política a cada requisição e resposta salva
+       - apagar_spool: Apaga os corpos gravados em disco (chamado ao fechar o navegador)
+
+    3. Funções de uso:
+       - opcoes_seleniumwire: Opções do selenium-wire correspondentes à política
+       - aplicar: Instala a política num navegador recém-criado e apaga os corpos
+         gravados em disco quando ele é fechado
+       - registrar_resumo: Registra nas métricas o resumo do teste e zera os contadores
+
+--- A política é aplicada no armazenamento e não nos 'scopes' do selenium-wire,
+    para que os interceptadores (rede.py) continuem recebendo todas as respostas.
+    Requisições fora da política continuam passando pelo proxy, só não são guardadas.
+
+--- O armazenamento acompanha as requisições guardadas na mesma ordem do buffer
+    circular do selenium-wire: quando uma requisição sai do buffer (ou o buffer é
+    limpo), a URL que aguardava resposta e os corpos gravados em disco dela também
+    são esquecidos, então requisições sem resposta (abortadas, bloqueadas) não se
+    acumulam enquanto o navegador estiver aberto.
+================================================================================
+"""
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from auxiliar import logger
+import metricas
+
+# Recursos estáticos que nunca interessam aos testes
+EXCLUIR_ESTATICOS = [r"\.(js|css|png|jpe?g|gif|svg|ico|webp|woff2?|ttf|eot|map)(\?|$)"]
+
+# Classe que descreve o que o selenium-wire deve guardar das requisições
+class PoliticaDeCaptura:
+    def __init__(self, incluir=(), excluir=(), corpos=(), max_corpo_bytes=256 * 1024, max_requisicoes=500, diretorio_spool=None):
+        self.incluir = [re.compile(padrao) for padrao in incluir]
+        self.excluir = [re.compile(padrao) for padrao in excluir]
+        self.corpos = [re.compile(padrao) for padrao in corpos]
+        self.max_corpo_bytes = max_corpo_bytes
+        self.max_requisicoes = max_requisicoes
+        self.diretorio_spool = diretorio_spool
+
+    # Método que diz se a requisição deve ser guardada
+    def guardar(self, url):
+        if any(padrao.search(url) for padrao in self.excluir):
+            return False
+        return not self.incluir or any(padrao.search(url) for padrao in self.incluir)
+
+    # Método que diz se o corpo da requisição/resposta deve ser guardado
+    def guardar_corpo(self, url):
+        return any(padrao.search(url) for padrao in self.corpos)
+
+# Política padrão: guarda as chamadas de API, mas só os corpos das requisições de assinatura
+POLITICA_PADRAO = PoliticaDeCaptura(excluir=EXCLUIR_ESTATICOS, corpos=[r"subscription"])
+
+# Classe que envolve o armazenamento do selenium-wire aplicando a política de captura
+class ArmazenamentoComPolitica:
+    def __init__(self, armazenamento, politica):
+        self._armazenamento = armazenamento
+        self._politica = politica
+        # Requisições guardadas, na ordem do buffer: {id: [url aguardando resposta ou None, arquivos gravados em disco]}
+        self._guardadas = OrderedDict()
+        self._trava = threading.Lock()
+        self._zerar_contadores()
+
+    # Demais operações (load_requests, clear_requests, find, ...) vão direto ao armazenamento original
+    def __getattr__(self, nome):
+        return getattr(self._armazenamento, nome)
+
+    # Chamado pelo selenium-wire ao capturar uma requisição
+    def save_request(self, request):
+        if not self._politica.guardar(request.url):
+            # Recebe um id para que a resposta ainda passe pelos interceptadores, mas não é guardada
+            request.id = str(uuid.uuid4())
+            self._contar(descartadas=1, bytes_descartados=len(request.body))
+            return
+
+        self._armazenamento.save_request(request)
+        with self._trava:
+            self._guardadas[request.id] = [request.url, []]
+            # O buffer do selenium-wire descarta as mais antigas além de max_requisicoes
+            while len(self._guardadas) > self._politica.max_requisicoes:
+                self._apagar_arquivos(self._guardadas.popitem(last=False)[1][1])
+        self._aplicar_corpo(request, request.url, request.id, "requisicao")
+        self._contar(capturadas=1)
+
+    # Chamado pelo selenium-wire ao capturar uma resposta
+    def save_response(self, request_id, response):
+        with self._trava:
+            guardada = self._guardadas.get(request_id)
+            url = guardada[0] if guardada else None
+            if guardada:
+                guardada[0] = None
+        if url is None:
+            self._contar(bytes_descartados=len(response.body))
+            return
+
+        self._aplicar_corpo(response, url, request_id, "resposta")
+        self._armazenamento.save_response(request_id, response)
+
+    # Chamado por 'del driver.requests': também esquece as requisições aguardando resposta e apaga os corpos em disco
+    def clear_requests(self):
+        self.apagar_spool()
+        self._armazenamento.clear_requests()
+
+    # Método que esquece todas as requisições guardadas e apaga os corpos delas gravados em disco
+    def apagar_spool(self):
+        with self._trava:
+            guardadas = list(self._guardadas.values())
+            self._guardadas.clear()
+        for _, arquivos in guardadas:
+            self._apagar_arquivos(arquivos)
+
+    # Método que devolve o resumo dos contadores e os zera
+    def coletar_resumo(self):
+        with self._trava:
+            resumo = dict(self._contadores)
+            self._zerar_contadores()
+        return resumo
+
+    # Descarta, grava em disco ou trunca o corpo conforme a política
+    def _aplicar_corpo(self, mensagem, url, request_id, sufixo):
+        corpo = mensagem.body
+        if not corpo:
+            return
+        if not self._politica.guardar_corpo(url):
+            mensagem.body = b""
+            self._contar(bytes_descartados=len(corpo))
+            return
+
+        if self._politica.diretorio_spool:
+            os.makedirs(self._politica.diretorio_spool, exist_ok=True)
+            mensagem.arquivo_corpo = os.path.join(self._politica.diretorio_spool, f"{request_id}_{sufixo}")
+            with open(mensagem.arquivo_corpo, "wb") as arquivo:
+                arquivo.write(corpo)
+            with self._trava:
+                guardada = self._guardadas.get(request_id)
+                if guardada:
+                    guardada[1].append(mensagem.arquivo_corpo)
+            # A requisição pode ter saído do buffer enquanto o corpo era gravado
+            if not guardada:
+                self._apagar_arquivos([mensagem.arquivo_corpo])
+
+        mantido = corpo[:self._politica.max_corpo_bytes]
+        mensagem.body = mantido
+        self._contar(bytes_capturados=len(mantido), bytes_descartados=len(corpo) - len(mantido))
+
+    @staticmethod
+    def _apagar_arquivos(arquivos):
+        for caminho in arquivos:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    def _contar(self, **valores):
+        with self._trava:
+            for nome, valor in valores.items():
+                self._contadores[nome] += valor
+
+    def _zerar_contadores(self):
+        self._contadores = {"capturadas": 0, "descartadas": 0, "bytes_capturados": 0, "bytes_descartados": 0}
+
+# Função que retorna as opções do selenium-wire correspondentes à política
+def opcoes_seleniumwire(politica):
+    return {"request_storage": "memory", "request_storage_max_size": politica.max_requisicoes}
+
+# Função que instala a política de captura no navegador recém-criado e apaga os corpos em disco quando ele é fechado
+def aplicar(driver, politica):
+    armazenamento = ArmazenamentoComPolitica(driver.backend.storage, politica)
+    driver.backend.storage = armazenamento
+
+    encerrar = driver.quit
+    def quit_apagando_spool():
+        try:
+            encerrar()
+        finally:
+            armazenamento.apagar_spool()
+    driver.quit = quit_apagando_spool
+
+# Função que registra nas métricas o resumo de captura do teste e zera os contadores
+def registrar_resumo(driver):
+    armazenamento = driver.backend.storage
+    if not isinstance(armazenamento, ArmazenamentoComPolitica):
+        return
+    resumo = armazenamento.coletar_resumo()
+    for nome, valor in resumo.items():
+        metricas.incrementar(f"captura_{nome}", valor)
+    logger.info(f"ℹ️ Captura de rede do teste: {resumo['capturadas']} requisições guardadas ({resumo['bytes_capturados']} bytes), "
+                f"{resumo['descartadas']} descartadas ({resumo['bytes_descartados']} bytes).")
@@ -0,0 +1,128 @@
+"""
+================================================================================
+--- Este arquivo implementa os checkpoints de fluxo: um fluxo do Pages.py é
+    dividido em etapas nomeadas e, quando uma etapa falha, o fluxo é retomado a
+    partir do checkpoint válido mais próximo, em vez de repetir o teste inteiro
+    (novo navegador, login, troca de organização e navegação até o backoffice).
+
+--- Estrutura principal:
+    1. FluxoComCheckpoints: Classe que executa as etapas de um fluxo
+       - checkpoint_alcancado: Registra um checkpoint já alcançado fora do fluxo
+         (por exemplo, o login feito no setUp)
+       - etapa: Acrescenta uma etapa; ao terminar, ela vira um checkpoint
+       - executar: Executa as etapas e, em caso de falha, retoma do checkpoint
+         válido mais próximo, no máximo max_retomadas vezes
+       - resultado: Retorna o valor devolvido por uma etapa
+
+--- Cada etapa tem uma verificação que diz se o navegador ainda está naquele
+    checkpoint (por exemplo, formulário aberto e sem usuário selecionado). A
+    retomada volta para o checkpoint mais recente cuja verificação passa. Se a
+    verificação da própria etapa que falhou passa, a etapa conta como concluída.
+
+--- Uma etapa com efeito fora do navegador (por exemplo, o envio da assinatura)
+    informa em 'irreversivel' como saber se o efeito já aconteceu; nesse caso a
+    falha não é retomada, para não repetir o efeito (assinatura duplicada).
+
+--- Cada retomada é registrada no log e nas métricas: 'retomadas' conta as
+    retomadas e as amostras 'retomada:<checkpoint>' guardam o tempo economizado
+    (o tempo que as etapas até o checkpoint levaram e que um novo teste repetiria).
+================================================================================
+"""
+from time import monotonic
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from auxiliar import logger
+import metricas
+
+# Quantidade padrão de retomadas por fluxo
+MAX_RETOMADAS_PADRAO = 2
+
+# Classe que representa uma etapa do fluxo e o checkpoint alcançado ao terminá-la
+class Etapa:
+    def __init__(self, nome, acao, valido, irreversivel=None):
+        self.nome = nome
+        self.acao = acao
+        self.valido = valido
+        self.irreversivel = irreversivel
+        self.duracao = None
+        self.resultado = None
+
+# Classe que executa as etapas de um fluxo com retomada a partir do checkpoint válido mais próximo
+class FluxoComCheckpoints:
+    def __init__(self, nome, max_retomadas=MAX_RETOMADAS_PADRAO):
+        self.nome = nome
+        self.max_retomadas = max_retomadas
+        self.etapas = []
+        self.retomadas = []
+
+    # Método que registra um checkpoint alcançado antes do fluxo, com o tempo que levou para alcançá-lo
+    def checkpoint_alcancado(self, nome, valido, duracao):
+        etapa = Etapa(nome, None, valido)
+        etapa.duracao = duracao
+        self.etapas.append(etapa)
+        return self
+
+    # Método que acrescenta uma etapa ao fluxo; 'valido' diz se o navegador ainda está no checkpoint da etapa e
+    # 'irreversivel' (opcional) diz se a etapa já teve efeito fora do navegador e não pode ser refeita
+    def etapa(self, nome, acao, valido, irreversivel=None):
+        self.etapas.append(Etapa(nome, acao, valido, irreversivel))
+        return self
+
+    # Método que executa as etapas pendentes e retorna o resultado da última
+    def executar(self):
+        resultado = None
+        indice = next((i for i, etapa in enumerate(self.etapas) if etapa.duracao is None), len(self.etapas))
+        while indice < len(self.etapas):
+            etapa = self.etapas[indice]
+            inicio = monotonic()
+            try:
+                resultado = etapa.resultado = etapa.acao()
+            except (TimeoutException, WebDriverException) as erro:
+                if self._checkpoint_valido(etapa):
+                    logger.info(f"🔁 {self.nome}: '{etapa.nome}' falhou ({type(erro).__name__}), mas o checkpoint já foi alcançado.")
+                elif etapa.irreversivel is not None and etapa.irreversivel():
+                    logger.error(f"❌ Erro: {self.nome} falhou em '{etapa.nome}' depois do efeito da etapa, que não é refeita.")
+                    raise
+                else:
+                    indice = self._retomar(etapa, erro)
+                    continue
+            etapa.duracao = monotonic() - inicio
+            indice += 1
+        return resultado
+
+    # Método que retorna o resultado da etapa com o nome informado
+    def resultado(self, nome):
+        return next(etapa.resultado for etapa in self.etapas if etapa.nome == nome)
+
+    # Método que escolhe o checkpoint de retomada e retorna o índice da próxima etapa (ou relança o erro)
+    def _retomar(self, etapa_com_falha, erro):
+        if len(self.retomadas) >= self.max_retomadas:
+            logger.error(f"❌ Erro: {self.nome} falhou em '{etapa_com_falha.nome}' após {len(self.retomadas)} retomada(s).")
+            raise erro
+
+        anteriores = self.etapas[:self.etapas.index(etapa_com_falha)]
+        for indice in range(len(anteriores) - 1, -1, -1):
+            if self._checkpoint_valido(anteriores[indice]):
+                break
+        else:
+            logger.error(f"❌ Erro: {self.nome} falhou em '{etapa_com_falha.nome}' e nenhum checkpoint é válido para retomar.")
+            raise erro
+
+        checkpoint = anteriores[indice]
+        economia = sum(etapa.duracao for etapa in anteriores[:indice + 1])
+        self.retomadas.append((etapa_com_falha.nome, checkpoint.nome, economia))
+        metricas.incrementar("retomadas")
+        metricas.amostrar(f"retomada:{checkpoint.nome}", economia)
+        logger.info(f"🔁 {self.nome}: '{etapa_com_falha.nome}' falhou ({type(erro).__name__}), retomando do checkpoint "
+                    f"'{checkpoint.nome}' ({economia:.1f} segundos economizados).")
+
+        # As etapas depois do checkpoint serão refeitas
+        for etapa in self.etapas[indice + 1:]:
+            etapa.duracao = None
+        return indice + 1
+
+    # Método que verifica se o navegador ainda está no checkpoint (uma verificação que falha conta como inválida)
+    def _checkpoint_valido(self, etapa):
+        try:
+            return bool(etapa.valido())
+        except WebDriverException:
+            return False
@@ -0,0 +1,214 @@
+"""
+================================================================================
+--- Este arquivo implementa o perfil de comandos WebDriver: cada comando que um
+    navegador criado pelo navegador.py envia ao chromedriver é contado e
+    cronometrado, por tipo de comando e pelo método do Pages.py que o originou.
+
+--- Estrutura principal:
+    1. instalar: Envolve o command executor do navegador para registrar cada comando
+    2. coletar: Devolve o perfil do teste atual e o zera (chamado pelo conftest.py)
+    3. orcamento: Decorador dos testes que declaram um orçamento de comandos
+       e/ou de tempo em comandos; o teste falha quando o corpo passa do orçamento
+    4. Orçamento medido (.historico/comandos.json): apenas informativo, compara
+       o perfil de cada teste com o das execuções anteriores
+       - marcar_caminho: Separa o histórico de um teste com caminhos de custos diferentes
+       - comparar_com_medido: Devolve o aviso do teste que passou do orçamento
+         medido e guarda o perfil no histórico
+       - gravar_processo / mesclar: Gravam os perfis de cada worker e os juntam
+         no histórico ao final da execução
+    5. perfil_html: Tabela do perfil de um teste (com o aviso, se houver) para o
+       relatório HTML
+
+--- A origem de um comando é o método do Pages.py aberto mais interno
+    (instrumentacao.py) e, quando o comando vem de uma função do auxiliar.py
+    chamada por ele, também o nome dessa função, para mostrar os auxiliares que
+    multiplicam comandos (por exemplo find_element_in_element).
+
+--- O tempo de um comando é a ida e volta ao chromedriver, sem o tratamento da
+    resposta pelo Selenium. Os totais de cada teste vão para as métricas
+    comandos_webdriver e comandos_webdriver_s.
+
+--- O orçamento medido é o p95 dos comandos e do tempo em comandos das últimas
+    execuções aprovadas do teste (o perfil inteiro, com o setUp) multiplicado
+    por FATOR_ORCAMENTO, a partir de MIN_AMOSTRAS execuções. Ele nunca falha o teste, só gera um aviso no
+    relatório e a métrica orcamentos_medidos_excedidos: as esperas repetem
+    comandos enquanto aguardam, então a contagem e o tempo variam com a latência
+    da plataforma. A falha fica para os orçamentos declarados com orcamento().
+================================================================================
+"""
+import functools
+import glob
+import html
+import json
+import os
+import threading
+from time import perf_counter
+import instrumentacao
+import metricas
+
+# Arquivo do histórico de perfis e parâmetros do orçamento medido
+ARQUIVO_HISTORICO = os.path.join(".historico", "comandos.json")
+FATOR_ORCAMENTO = 1.5
+MIN_AMOSTRAS = 5
+MAX_AMOSTRAS = 50
+
+# Perfil do teste atual ({(origem, comando): [quantidade, segundos]}) e totais do processo (comandos, segundos)
+_trava = threading.Lock()
+_perfil = {}
+_totais = [0, 0.0]
+
+# Histórico carregado do disco e perfis medidos por este processo ({teste: [[comandos, segundos], ...]})
+_historico = None
+_novos = {}
+
+# Caminho seguido pelo teste atual (marcar_caminho), que separa o seu histórico
+_caminho = None
+
+# Função que envolve o command executor do navegador para contar e cronometrar cada comando
+# O total do navegador fica também em driver.comandos_enviados
+def instalar(driver):
+    executor = driver.command_executor
+    execute = executor.execute
+    driver.comandos_enviados = 0
+
+    def execute_perfilado(comando, params):
+        origem = instrumentacao.origem_atual()
+        inicio = perf_counter()
+        try:
+            return execute(comando, params)
+        finally:
+            duracao = perf_counter() - inicio
+            driver.comandos_enviados += 1
+            _registrar(origem, comando, duracao)
+    executor.execute = execute_perfilado
+
+# Função que soma um comando ao perfil do teste atual, aos totais do processo e às métricas
+def _registrar(origem, comando, duracao):
+    with _trava:
+        registro = _perfil.setdefault((origem, comando), [0, 0.0])
+        registro[0] += 1
+        registro[1] += duracao
+        _totais[0] += 1
+        _totais[1] += duracao
+        metricas.incrementar("comandos_webdriver")
+        metricas.incrementar("comandos_webdriver_s", duracao)
+
+# Função que devolve o perfil do teste atual, do comando mais demorado para o mais rápido, e o zera
+def coletar():
+    with _trava:
+        perfil = sorted(((origem, comando, quantidade, segundos) for (origem, comando), (quantidade, segundos) in _perfil.items()),
+                        key=lambda linha: linha[3], reverse=True)
+        _perfil.clear()
+    return perfil
+
+# Função que retorna o histórico de perfis, carregando-o do disco na primeira chamada
+def _carregar():
+    global _historico
+    if _historico is None:
+        try:
+            with open(ARQUIVO_HISTORICO) as arquivo:
+                _historico = json.load(arquivo)
+        except (OSError, ValueError):
+            _historico = {}
+    return _historico
+
+# Função que calcula o orçamento medido de um teste (comandos, segundos), ou (None, None) sem histórico suficiente
+def orcamento_medido(teste):
+    amostras = _carregar().get(teste, []) + _novos.get(teste, [])
+    if len(amostras) < MIN_AMOSTRAS:
+        return None, None
+    return (round(metricas.percentil([comandos for comandos, _ in amostras], 95) * FATOR_ORCAMENTO),
+            metricas.percentil([segundos for _, segundos in amostras], 95) * FATOR_ORCAMENTO)
+
+# Decorador de teste que falha o teste quando o corpo dele envia mais comandos ou gasta mais tempo em comandos que o
+# orçamento declarado (o setUp, com login e navegador, fica fora do orçamento)
+def orcamento(comandos=None, segundos=None):
+    if comandos is None and segundos is None:
+        raise ValueError("Informe o orçamento de comandos e/ou de segundos (o orçamento medido não falha testes)")
+
+    def decorador(teste):
+        @functools.wraps(teste)
+        def teste_com_orcamento(self, *args, **kwargs):
+            comandos_antes, segundos_antes = _totais
+            resultado = teste(self, *args, **kwargs)
+            usados, gastos = _totais[0] - comandos_antes, _totais[1] - segundos_antes
+            excedidos = _excedidos(usados, gastos, comandos, segundos)
+            if excedidos:
+                metricas.incrementar("orcamentos_excedidos")
+                self.fail("Orçamento excedido: " + excedidos + ". Veja o perfil de comandos no relatório.")
+            return resultado
+        return teste_com_orcamento
+    return decorador
+
+# Função que descreve o que passou dos limites de comandos e de segundos (ou devolve "" se nada passou)
+def _excedidos(usados, gastos, limite_comandos, limite_segundos):
+    excedidos = []
+    if limite_comandos is not None and usados > limite_comandos:
+        excedidos.append(f"{usados} comandos WebDriver (orçamento de {limite_comandos})")
+    if limite_segundos is not None and gastos > limite_segundos:
+        excedidos.append(f"{gastos:.2f} segundos em comandos WebDriver (orçamento de {limite_segundos:.2f} segundos)")
+    return "; ".join(excedidos)
+
+# Função que o teste chama para informar o caminho que seguiu quando os caminhos têm custos diferentes
+# (por exemplo, a criação pela API do modo híbrido), para que cada caminho tenha seu próprio histórico
+def marcar_caminho(caminho):
+    global _caminho
+    _caminho = caminho
+
+# Função que compara o perfil do teste com o orçamento medido e devolve o aviso, ou None dentro do orçamento
+# Só os perfis de testes aprovados e dentro do orçamento entram no histórico, para uma regressão não virar o novo normal
+def comparar_com_medido(teste, perfil, aprovado=True):
+    global _caminho
+    chave = "|".join(filter(None, (teste, _caminho)))
+    _caminho = None
+    usados, gastos = sum(linha[2] for linha in perfil), sum(linha[3] for linha in perfil)
+    excedidos = _excedidos(usados, gastos, *orcamento_medido(chave))
+    if excedidos:
+        metricas.incrementar("orcamentos_medidos_excedidos")
+        return f"Acima do orçamento medido: {excedidos}"
+    if aprovado and perfil:
+        _novos.setdefault(chave, []).append([usados, round(gastos, 3)])
+    return None
+
+# Função que grava os perfis medidos por este processo (uma parte por worker)
+def gravar_processo():
+    if not _novos:
+        return
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    os.makedirs(os.path.dirname(ARQUIVO_HISTORICO), exist_ok=True)
+    with open(os.path.join(os.path.dirname(ARQUIVO_HISTORICO), f"comandos_{worker}.json"), "w") as arquivo:
+        json.dump(_novos, arquivo)
+    _novos.clear()
+
+# Função que junta as partes dos workers no histórico, mantendo os últimos MAX_AMOSTRAS perfis de cada teste
+def mesclar():
+    historico = dict(_carregar())
+    partes = glob.glob(os.path.join(os.path.dirname(ARQUIVO_HISTORICO), "comandos_*.json"))
+    for caminho in partes:
+        try:
+            with open(caminho) as arquivo:
+                for teste, amostras in json.load(arquivo).items():
+                    historico[teste] = (historico.get(teste, []) + amostras)[-MAX_AMOSTRAS:]
+        except (OSError, ValueError):
+            pass
+        os.remove(caminho)
+    if not partes:
+        return
+
+    temporario = f"{ARQUIVO_HISTORICO}.{os.getpid()}"
+    with open(temporario, "w") as arquivo:
+        json.dump(historico, arquivo, indent=1, sort_keys=True)
+    os.replace(temporario, ARQUIVO_HISTORICO)
+
+# Função que monta a tabela HTML do perfil de comandos de um teste, com o aviso do orçamento medido
+def perfil_html(perfil, aviso=None):
+    if not perfil:
+        return ""
+    total, tempo_total = sum(linha[2] for linha in perfil), sum(linha[3] for linha in perfil)
+    linhas = "".join(f"<tr><td>{html.escape(origem)}</td><td>{html.escape(comando)}</td><td>{quantidade}</td>"
+                     f"<td>{segundos * 1000:.0f}</td><td>{segundos * 1000 / quantidade:.1f}</td></tr>"
+                     for origem, comando, quantidade, segundos in perfil)
+    aviso_html = f'<div style="color:#b35c00">⚠️ {html.escape(aviso)}</div>' if aviso else ""
+    return (f'<div style="margin:4px 0;font:11px monospace"><b>Comandos WebDriver: {total} em {tempo_total:.2f} s</b>{aviso_html}'
+            "<table><tr><th>Origem</th><th>Comando</th><th>Quantidade</th><th>Total (ms)</th><th>Médio (ms)</th></tr>"
+            f"{linhas}</table></div>")
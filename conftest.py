@@ -0,0 +1,242 @@
+"""
+================================================================================
+--- Este arquivo integra as métricas e a instrumentação da automação ao pytest
+    e ao pytest-html.
+
+--- Estrutura principal:
+    1. pytest_sessionstart / pytest_runtest_setup: Preparam os spans e o log da
+       execução e abrem o span raiz de cada teste
+    2. pytest_runtest_makereport: Anexa as métricas, a cascata de etapas, o perfil
+       de comandos WebDriver (comandos.py, com o aviso do orçamento medido) e,
+       nos testes com falha, o rastro de rede (rastro.py) ao relatório
+    3. pytest_runtest_logreport: Soma as métricas no processo principal
+    4. pytest_sessionfinish: Mescla os spans, os logs, as esperas e os perfis de
+       comandos gravados por cada worker e atualiza o histórico de durações dos testes
+    5. pytest_terminal_summary: Exibe os totais, as etapas mais lentas, o
+       makespan previsto e real e a vazão por nó da grade no terminal
+    6. pytest_html_results_summary: Exibe os totais, a tabela p50/p95 por etapa,
+       o makespan e a vazão por nó da grade (grade.py) no TestSuit_report.html
+    7. pytest_xdist_make_scheduler: Distribui os testes entre os workers do mais
+       longo para o mais curto (escalonador.py)
+
+--- As métricas viajam em report.user_properties, que o pytest-xdist serializa
+    dos workers para o processo principal, então os totais consideram todos
+    os workers da execução (pytest -n auto).
+
+--- Os hooks só valem para as suítes que usam o navegador (SUITES_DE_NAVEGADOR):
+    os testes de unidade (testes_unidade/) não mexem no TestSuit.log, nos
+    históricos nem nas métricas da execução.
+================================================================================
+"""
+import os
+import pytest
+from time import monotonic
+import auxiliar
+import comandos
+import duracoes
+import grade
+import instrumentacao
+import metricas
+import rastro
+import tempos_limite
+
+try:
+    from pytest_html import extras
+except ImportError:
+    extras = None
+
+# Arquivos das suítes que usam o navegador, as únicas instrumentadas por estes hooks
+SUITES_DE_NAVEGADOR = ("TestSuit.py", "Benchmark.py")
+
+# Indica se a execução inclui uma suíte que usa o navegador (definido no pytest_configure)
+suite_de_navegador = False
+
+# Spans de todos os workers, mesclados ao final da execução
+spans_da_execucao = []
+
+# Testes do processo com alguma fase com falha (o rastro de rede só é mantido para eles)
+testes_com_falha = set()
+
+# Makespan previsto pelo histórico e real da execução (em segundos), calculados ao final da execução
+makespan_da_execucao = {}
+
+# Início da execução e vazão de cada nó da grade (grade.py), calculada ao final da execução
+inicio_da_execucao = monotonic()
+vazao_por_no = []
+
+# Indica se o processo é o principal (e não um worker do pytest-xdist)
+def _processo_principal(config):
+    return not hasattr(config, "workerinput")
+
+# Indica se o teste (nodeid) pertence a uma das suítes que usam o navegador
+def _teste_de_navegador(nodeid):
+    return os.path.basename(nodeid.split("::")[0]) in SUITES_DE_NAVEGADOR
+
+# Verifica, pelos argumentos da linha de comando (os mesmos nos workers), se a execução inclui uma suíte do navegador
+def pytest_configure(config):
+    global suite_de_navegador
+    suite_de_navegador = any(_teste_de_navegador(argumento) for argumento in config.args)
+
+# Apaga os spans e logs de execuções anteriores antes de os workers começarem e liga o log do processo
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+    if not suite_de_navegador:
+        return
+    if _processo_principal(session.config):
+        instrumentacao.limpar_execucao()
+        auxiliar.limpar_logs()
+    auxiliar.configurar_log()
+
+# Abre o span raiz do teste antes do setUp
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    if _teste_de_navegador(item.nodeid):
+        instrumentacao.iniciar_teste(item.nodeid)
+
+# Anexa as métricas, o perfil de comandos e o rastro de rede do teste ao relatório da fase de teardown (a última do teste)
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if not _teste_de_navegador(item.nodeid):
+        return
+    report = outcome.get_result()
+    if report.failed:
+        testes_com_falha.add(item.nodeid)
+    if report.when == "teardown":
+        # O orçamento medido só avisa (antes de coletar as métricas, para contar orcamentos_medidos_excedidos)
+        perfil = comandos.coletar()
+        aviso = comandos.comparar_com_medido(item.nodeid, perfil, aprovado=item.nodeid not in testes_com_falha)
+        if aviso:
+            auxiliar.logger.warning(f"⚠️ {item.nodeid}: {aviso}")
+        report.user_properties.append(("metricas", metricas.coletar()))
+        waterfall = instrumentacao.waterfall_html(instrumentacao.finalizar_teste())
+        if waterfall and extras is not None:
+            report.extra = getattr(report, "extra", []) + [extras.html(waterfall)]
+        perfil_html = comandos.perfil_html(perfil, aviso)
+        if perfil_html and extras is not None:
+            report.extra = getattr(report, "extra", []) + [extras.html(perfil_html)]
+
+        # O rastro de rede fica no relatório apenas quando o teste falhou
+        caminho_rastro = rastro.coletar()
+        if caminho_rastro and item.nodeid not in testes_com_falha:
+            rastro.descartar(caminho_rastro)
+        elif caminho_rastro and extras is not None:
+            report.extra = getattr(report, "extra", []) + [extras.url(caminho_rastro, name="Rastro de rede (HAR)")]
+
+# Mescla os spans e os logs dos workers e atualiza o histórico de durações antes de o pytest-html gerar o relatório
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    if not suite_de_navegador:
+        return
+    # Cada worker grava o que restou na fila e suas esperas antes de avisar o processo principal que terminou
+    auxiliar.encerrar_log()
+    tempos_limite.gravar_processo()
+    comandos.gravar_processo()
+    if _processo_principal(session.config):
+        spans_da_execucao[:] = instrumentacao.mesclar_execucao()
+        auxiliar.mesclar_logs()
+        tempos_limite.mesclar()
+        comandos.mesclar()
+        duracoes_testes = duracoes.duracoes_execucao()
+        if duracoes_testes:
+            # A previsão usa o histórico de antes desta execução, o mesmo visto pelo escalonador
+            estimativas = duracoes.estimativas(duracoes.carregar(), duracoes_testes)
+            makespan_da_execucao["previsto"] = duracoes.makespan_previsto(estimativas, duracoes.workers_execucao())
+            makespan_da_execucao["real"] = duracoes.makespan_real()
+            makespan_da_execucao["workers"] = duracoes.workers_execucao()
+            duracoes.gravar_execucao(duracoes_testes)
+        vazao_por_no[:] = grade.resumo_por_no(monotonic() - inicio_da_execucao)
+
+# Soma as métricas, a duração e o nó da grade de cada teste recebido (localmente ou vindo de um worker)
+def pytest_runtest_logreport(report):
+    # Os testes de unidade não entram no histórico de durações usado pelo escalonador
+    if not _teste_de_navegador(report.nodeid):
+        return
+    duracoes.acumular(report)
+    for nome, valor in report.user_properties:
+        if nome == "metricas":
+            metricas.acumular(valor)
+            if "no_da_grade" in valor:
+                grade.acumular(valor["no_da_grade"], duracoes.duracoes_execucao()[report.nodeid])
+
+# Usa o escalonador "mais longo primeiro" no modo de distribuição padrão do pytest-xdist
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("dist") == "load":
+        from escalonador import EscalonadorMaisLongoPrimeiro
+        return EscalonadorMaisLongoPrimeiro(config, log)
+    return None
+
+# Descreve o makespan previsto e o real da execução
+def _resumo_makespan():
+    if not makespan_da_execucao:
+        return None
+    previsto, real = makespan_da_execucao["previsto"], makespan_da_execucao["real"]
+    return f"previsto={previsto:.1f}s real={real:.1f}s diferença={real - previsto:+.1f}s workers={makespan_da_execucao['workers']}"
+
+# Resume a vazão de cada nó da grade: testes, tempo ocupado e testes por minuto
+def _resumo_vazao():
+    return [f"{no}: testes={testes} ocupado={ocupado:.1f}s vazão={vazao:.2f} testes/min"
+            for no, testes, ocupado, vazao in vazao_por_no]
+
+# Resume as amostras de cada métrica, da mais lenta (maior p95) para a mais rápida
+def _resumo_amostras():
+    resumos = []
+    for nome, valores in metricas.amostras().items():
+        p50, p95 = metricas.percentil(valores, 50), metricas.percentil(valores, 95)
+        resumos.append((p95, f"{nome}: n={len(valores)} p50={p50:.3f} p95={p95:.3f} máx={max(valores):.3f}"))
+    return [linha for _, linha in sorted(resumos, reverse=True)]
+
+# Exibe os totais das métricas ao final da execução
+def pytest_terminal_summary(terminalreporter):
+    if not suite_de_navegador:
+        return
+    totais = metricas.totais()
+    amostras = _resumo_amostras()
+    if totais:
+        terminalreporter.write_sep("-", "métricas da execução")
+        for nome, valor in totais.items():
+            terminalreporter.write_line(f"{nome}: {valor:g}")
+    if amostras:
+        terminalreporter.write_sep("-", "amostras da execução (mais lentas primeiro)")
+        for linha in amostras:
+            terminalreporter.write_line(linha)
+    resumo = instrumentacao.resumo_por_etapa(spans_da_execucao)
+    if resumo:
+        terminalreporter.write_sep("-", "etapas mais lentas (p95)")
+        for nome, quantidade, p50, p95 in resumo[:10]:
+            terminalreporter.write_line(f"{nome}: n={quantidade} p50={p50:.3f} p95={p95:.3f}")
+    makespan = _resumo_makespan()
+    if makespan:
+        terminalreporter.write_sep("-", "makespan")
+        terminalreporter.write_line(makespan)
+    if vazao_por_no:
+        terminalreporter.write_sep("-", "vazão por nó")
+        for linha in _resumo_vazao():
+            terminalreporter.write_line(linha)
+
+# Exibe os totais das métricas no resumo do relatório HTML
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    if not suite_de_navegador:
+        return
+    from py.xml import html, raw
+    totais = metricas.totais()
+    amostras = _resumo_amostras()
+    if totais:
+        postfix.append(html.h2("Métricas da execução"))
+        postfix.append(html.ul([html.li(f"{nome}: {valor:g}") for nome, valor in totais.items()]))
+    if amostras:
+        postfix.append(html.h2("Amostras da execução (mais lentas primeiro)"))
+        postfix.append(html.ul([html.li(linha) for linha in amostras]))
+    resumo = instrumentacao.resumo_por_etapa(spans_da_execucao)
+    if resumo:
+        postfix.append(html.h2("Tempo por etapa"))
+        postfix.append(html.div(raw(instrumentacao.tabela_html(resumo))))
+    makespan = _resumo_makespan()
+    if makespan:
+        postfix.append(html.h2("Makespan"))
+        postfix.append(html.p(makespan))
+    if vazao_por_no:
+        postfix.append(html.h2("Vazão por nó"))
+        postfix.append(html.ul([html.li(linha) for linha in _resumo_vazao()]))
@@ -0,0 +1,97 @@
+"""
+================================================================================
+--- Este arquivo mantém o histórico de duração de cada teste entre execuções e
+    calcula, a partir dele, a previsão do makespan (tempo do worker que termina
+    por último) para comparar com o makespan real da execução.
+
+--- Estrutura principal:
+    1. Histórico (.historico/duracoes.json):
+       - carregar: Lê as últimas durações gravadas de cada teste
+       - gravar_execucao: Acrescenta as durações da execução atual ao histórico
+       - estimativas: Estima a duração de cada teste pela mediana do histórico
+
+    2. Execução atual:
+       - acumular: Soma a duração das fases de cada teste e guarda o worker que o executou
+       - makespan_real: Maior soma de durações entre os workers
+
+    3. makespan_previsto: Simula a distribuição "mais longo primeiro" das
+       estimativas entre os workers e devolve o makespan previsto
+
+--- O histórico é atualizado apenas pelo processo principal ao final de cada
+    execução; o escalonador do pytest-xdist (escalonador.py) e o resumo do
+    conftest.py usam as mesmas estimativas.
+
+--- Testes sem histórico recebem a mediana das estimativas conhecidas (ou
+    DURACAO_PADRAO, na primeira execução).
+================================================================================
+"""
+import heapq
+import json
+import os
+from collections import defaultdict
+import metricas
+
+# Arquivo do histórico, quantidade de durações guardadas por teste e duração assumida sem histórico
+ARQUIVO_HISTORICO = os.path.join(".historico", "duracoes.json")
+MAX_AMOSTRAS = 10
+DURACAO_PADRAO = 60.0
+
+# Duração e worker de cada teste da execução atual (preenchidos no processo principal)
+_duracoes_execucao = defaultdict(float)
+_worker_execucao = {}
+
+# Função que lê o histórico de durações ({nodeid: [durações]})
+def carregar(arquivo=ARQUIVO_HISTORICO):
+    try:
+        with open(arquivo) as historico:
+            return json.load(historico)
+    except (OSError, ValueError):
+        return {}
+
+# Função que acrescenta as durações da execução ao histórico, mantendo as últimas MAX_AMOSTRAS de cada teste
+def gravar_execucao(duracoes, arquivo=ARQUIVO_HISTORICO):
+    historico = carregar(arquivo)
+    for nodeid, duracao in duracoes.items():
+        historico[nodeid] = (historico.get(nodeid, []) + [round(duracao, 3)])[-MAX_AMOSTRAS:]
+
+    # Grava em um arquivo temporário e substitui, para não deixar o histórico pela metade
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    temporario = f"{arquivo}.{os.getpid()}"
+    with open(temporario, "w") as saida:
+        json.dump(historico, saida, indent=1, sort_keys=True)
+    os.replace(temporario, arquivo)
+
+# Função que estima a duração de cada teste pela mediana do seu histórico
+def estimativas(historico, nodeids):
+    conhecidas = {nodeid: metricas.percentil(historico[nodeid], 50) for nodeid in nodeids if historico.get(nodeid)}
+    padrao = metricas.percentil(list(conhecidas.values()), 50) if conhecidas else DURACAO_PADRAO
+    return {nodeid: conhecidas.get(nodeid, padrao) for nodeid in nodeids}
+
+# Função que simula a distribuição "mais longo primeiro" entre os workers e devolve o makespan previsto
+def makespan_previsto(estimativas_testes, workers):
+    cargas = [0.0] * max(1, workers)
+    for duracao in sorted(estimativas_testes.values(), reverse=True):
+        # O próximo teste mais longo vai para o worker que fica livre primeiro
+        heapq.heapreplace(cargas, cargas[0] + duracao)
+    return max(cargas)
+
+# Função que soma a duração de uma fase (setup, call, teardown) ao teste e guarda o worker que a executou
+def acumular(report):
+    _duracoes_execucao[report.nodeid] += report.duration
+    node = getattr(report, "node", None)
+    _worker_execucao[report.nodeid] = node.gateway.id if node is not None else "principal"
+
+# Função que devolve a duração total de cada teste da execução atual
+def duracoes_execucao():
+    return dict(_duracoes_execucao)
+
+# Função que devolve a quantidade de workers que executaram testes na execução atual
+def workers_execucao():
+    return len(set(_worker_execucao.values()))
+
+# Função que devolve o makespan real: a maior soma de durações entre os workers
+def makespan_real():
+    cargas = defaultdict(float)
+    for nodeid, duracao in _duracoes_execucao.items():
+        cargas[_worker_execucao[nodeid]] += duracao
+    return max(cargas.values(), default=0.0)
@@ -0,0 +1,70 @@
+"""
+================================================================================
+--- Este arquivo implementa o escalonador do pytest-xdist que distribui os testes
+    do mais longo para o mais curto (longest-processing-time first), usando o
+    histórico de durações de duracoes.py.
+
+--- Estrutura principal:
+    1. EscalonadorMaisLongoPrimeiro: Escalonador derivado do LoadScheduling
+       - schedule: Ordena os testes pela duração estimada e entrega os mais
+         longos primeiro, um por worker a cada rodada
+       - check_schedule: Mantém cada worker com no máximo dois testes na fila,
+         para que o próximo teste mais longo vá para o worker que ficar livre
+
+--- É ativado pelo hook pytest_xdist_make_scheduler do conftest.py no modo de
+    distribuição padrão (--dist load); os outros modos do pytest-xdist seguem
+    com os escalonadores originais.
+
+--- O worker precisa de dois testes na fila para executar o primeiro (o pytest
+    passa o teste seguinte para o teardown), por isso a fila mínima é dois.
+================================================================================
+"""
+from xdist.scheduler import LoadScheduling
+import duracoes
+
+# Classe que distribui os testes entre os workers do mais longo para o mais curto
+class EscalonadorMaisLongoPrimeiro(LoadScheduling):
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.historico = duracoes.carregar()
+
+    # Método que ordena a coleção pela duração estimada e faz a distribuição inicial
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Distribuição inicial já feita (por exemplo, um worker novo entrou): apenas completa as filas
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+        estimativas = duracoes.estimativas(self.historico, self.collection)
+        self.pending[:] = sorted(range(len(self.collection)), key=lambda indice: -estimativas[self.collection[indice]])
+
+        # Duas rodadas de um teste por worker: os mais longos começam ao mesmo tempo em workers diferentes
+        for _ in range(2):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    # Método que entrega o próximo teste mais longo ao worker que acabou de liberar espaço na fila
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            self._send_tests(node, max(0, 2 - len(self.node2pending[node])))
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
@@ -0,0 +1,190 @@
+"""
+================================================================================
+--- Este arquivo implementa os backends dos navegadores da automação: o Chrome
+    local (chromedriver em drivers/) ou sessões remotas em nós WebDriver/Grid,
+    com uma fila de sessões que distribui os navegadores entre os nós.
+
+--- Estrutura principal:
+    1. BackendLocal: Inicia o Chrome com o chromedriver local
+
+    2. BackendRemoto: Inicia o Chrome em um dos nós remotos
+       - iniciar: Aguarda uma vaga na fila de sessões, cria a sessão no nó e
+         libera a vaga quando o navegador é fechado
+       - ChromeRemoto: Sessão remota do selenium-wire (captura de rede pelo proxy
+         local, que o Chrome do nó usa como proxy) com os comandos CDP do Chrome
+
+    3. FilaDeSessoes: Vagas dos nós (capacidade de cada um), compartilhadas entre
+       os workers do pytest-xdist por arquivos travados em .grade/
+
+    4. backend_da_execucao: Escolhe o backend pela variável GRADE_NOS
+
+    5. Vazão por nó: acumular / resumo_por_no somam os testes executados em cada
+       nó para o relatório (conftest.py)
+
+--- GRADE_NOS lista os nós como "url@capacidade" separados por vírgula (por
+    exemplo "http://10.0.0.5:4444@4,http://10.0.0.6:4444@2"); sem capacidade, o
+    nó recebe CAPACIDADE_PADRAO sessões. Cada nó pode ser um chromedriver, um
+    Selenium Grid (que tem sua própria fila interna) ou um nó do grade_local.py.
+
+--- O Chrome do nó precisa alcançar o proxy do selenium-wire desta máquina:
+    ENDERECO_PROXY é o endereço desta máquina visto pelos nós (padrão 127.0.0.1,
+    suficiente para o grade_local.py). GRADE_ESPERA é o tempo máximo na fila.
+
+--- As vagas são ocupadas em largura (primeira vaga de cada nó, depois a
+    segunda...), então os navegadores ficam equilibrados entre os nós mesmo com
+    vários workers pedindo sessões ao mesmo tempo.
+================================================================================
+"""
+import fcntl
+import os
+import re
+from collections import defaultdict
+from time import monotonic, sleep
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from seleniumwire import webdriver
+from auxiliar import logger
+import metricas
+
+# Diretório das vagas da fila de sessões, capacidade padrão de um nó e tempo máximo de espera por uma vaga
+DIRETORIO_VAGAS = ".grade"
+CAPACIDADE_PADRAO = 1
+ESPERA_PADRAO = 300
+INTERVALO_FILA = 0.5
+
+# Testes executados e tempo ocupado de cada nó (preenchidos no processo principal)
+_testes_por_no = defaultdict(int)
+_tempo_por_no = defaultdict(float)
+
+# Classe que inicia o Chrome com o chromedriver local
+class BackendLocal:
+    nome = "local"
+
+    # Método que cria o navegador com as opções do Chrome e do selenium-wire
+    def iniciar(self, options, opcoes_seleniumwire):
+        driver = webdriver.Chrome(service=Service("drivers/chromedriver"), options=options, seleniumwire_options=opcoes_seleniumwire)
+        driver.no_da_grade = self.nome
+        return driver
+
+# Classe da sessão remota do selenium-wire com os comandos CDP do Chrome
+# A configuração automática de proxy do selenium-wire usa desired_capabilities (removido no Selenium 4.10),
+# então o proxy é passado ao Chrome do nó pelas próprias opções
+class ChromeRemoto(webdriver.Remote):
+    def __init__(self, url, options, endereco_proxy, opcoes_seleniumwire):
+        # O proxy só escuta fora do loopback quando os nós estão em outras máquinas
+        opcoes_seleniumwire = dict(opcoes_seleniumwire, addr="127.0.0.1" if endereco_proxy == "127.0.0.1" else "0.0.0.0")
+        self._setup_backend(opcoes_seleniumwire)
+        options.add_argument(f"--proxy-server={endereco_proxy}:{self.backend.address()[1]}")
+        # Como no webdriver.Chrome do selenium-wire: sem isso o Chrome acessa localhost/127.0.0.1 direto, fora do proxy
+        options.add_argument("--proxy-bypass-list=<-loopback>")
+        options.set_capability("acceptInsecureCerts", True)
+        try:
+            RemoteWebDriver.__init__(self, command_executor=ChromiumRemoteConnection(url, "goog", "chrome"), options=options)
+        except Exception:
+            self.backend.shutdown()
+            raise
+
+    # Método que executa um comando do Chrome DevTools Protocol na aba atual (como o webdriver.Chrome)
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+# Classe que representa uma vaga ocupada em um nó
+class Vaga:
+    def __init__(self, no, arquivo):
+        self.no = no
+        self.arquivo = arquivo
+
+    # Método que devolve a vaga para a fila
+    def liberar(self):
+        if not self.arquivo.closed:
+            fcntl.flock(self.arquivo, fcntl.LOCK_UN)
+            self.arquivo.close()
+
+# Classe da fila de sessões: cada vaga de um nó é um arquivo travado enquanto a sessão está aberta
+class FilaDeSessoes:
+    def __init__(self, nos, espera=ESPERA_PADRAO):
+        self.nos = nos
+        self.espera = espera
+        os.makedirs(DIRETORIO_VAGAS, exist_ok=True)
+        # Vagas em largura: a primeira de cada nó, depois a segunda de cada nó, e assim por diante
+        self.vagas = [(url, indice) for indice in range(max(nos.values())) for url, capacidade in nos.items() if indice < capacidade]
+
+    # Método que aguarda e ocupa a primeira vaga livre (o processo que morre libera a vaga automaticamente)
+    def reservar(self):
+        inicio = monotonic()
+        avisado = False
+        while True:
+            for url, indice in self.vagas:
+                arquivo = open(os.path.join(DIRETORIO_VAGAS, f"{nome_do_no(url)}_{indice}.vaga"), "w")
+                try:
+                    fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    arquivo.close()
+                    continue
+                metricas.incrementar("grade_espera_s", monotonic() - inicio)
+                return Vaga(url, arquivo)
+
+            if monotonic() - inicio > self.espera:
+                raise TimeoutException(f"Nenhuma vaga livre nos nós da grade em {self.espera} segundos")
+            if not avisado:
+                logger.info("⏳ Todos os nós da grade estão ocupados, aguardando uma vaga na fila de sessões.")
+                avisado = True
+            sleep(INTERVALO_FILA)
+
+# Classe que inicia o Chrome em um dos nós remotos, passando pela fila de sessões
+class BackendRemoto:
+    def __init__(self, nos, endereco_proxy="127.0.0.1", espera=ESPERA_PADRAO):
+        self.fila = FilaDeSessoes(nos, espera)
+        self.endereco_proxy = endereco_proxy
+
+    # Método que ocupa uma vaga, cria a sessão no nó e devolve a vaga quando o navegador é fechado
+    def iniciar(self, options, opcoes_seleniumwire):
+        vaga = self.fila.reservar()
+        try:
+            driver = ChromeRemoto(vaga.no, options, self.endereco_proxy, opcoes_seleniumwire)
+        except Exception:
+            vaga.liberar()
+            raise
+        driver.no_da_grade = nome_do_no(vaga.no)
+        logger.debug(f"ℹ️ Navegador iniciado no nó {driver.no_da_grade}.")
+
+        encerrar = driver.quit
+        def quit_liberando_vaga():
+            try:
+                encerrar()
+            finally:
+                vaga.liberar()
+        driver.quit = quit_liberando_vaga
+        return driver
+
+# Função que monta o nome curto de um nó (host_porta) a partir da URL
+def nome_do_no(url):
+    return re.sub(r"^\w+://|/.*$", "", url).replace(":", "_")
+
+# Função que interpreta GRADE_NOS ("url@capacidade,...") em {url: capacidade}
+def ler_nos(texto):
+    nos = {}
+    for item in filter(None, (parte.strip() for parte in texto.split(","))):
+        url, capacidade = re.fullmatch(r"(.+?)(?:@(\d+))?", item).groups()
+        nos[url] = int(capacidade) if capacidade else CAPACIDADE_PADRAO
+    return nos
+
+# Função que escolhe o backend da execução: remoto quando GRADE_NOS está definida, local caso contrário
+def backend_da_execucao():
+    nos = ler_nos(os.environ.get("GRADE_NOS", ""))
+    if not nos:
+        return BackendLocal()
+    return BackendRemoto(nos, os.environ.get("ENDERECO_PROXY", "127.0.0.1"),
+                         float(os.environ.get("GRADE_ESPERA", ESPERA_PADRAO)))
+
+# Função que soma um teste executado em um nó, com sua duração
+def acumular(no, duracao):
+    _testes_por_no[no] += 1
+    _tempo_por_no[no] += duracao
+
+# Função que resume cada nó: testes, tempo ocupado e vazão (testes por minuto) na duração da execução
+def resumo_por_no(duracao_execucao):
+    return [(no, testes, _tempo_por_no[no], testes * 60 / duracao_execucao if duracao_execucao else 0.0)
+            for no, testes in sorted(_testes_por_no.items())]
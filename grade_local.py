@@ -0,0 +1,122 @@
+"""
+================================================================================
+--- Este arquivo implementa uma grade local para testar a distribuição de
+    navegadores entre nós em uma única máquina Linux: cada nó é um chromedriver
+    em uma porta própria, opcionalmente preso a um conjunto de núcleos da CPU,
+    como se fosse outra máquina.
+
+--- Estrutura principal:
+    1. GradeLocal: Classe que sobe e derruba os nós
+       - iniciar: Sobe um chromedriver por nó e aguarda todos responderem
+       - grade_nos: Valor de GRADE_NOS para usar os nós (grade.py)
+       - encerrar: Derruba os nós
+
+    2. Execução direta:
+       python grade_local.py --nos 3 --sessoes 2
+           sobe os nós e exibe o GRADE_NOS correspondente até Ctrl+C
+       python grade_local.py --nos 3 --sessoes 2 -- pytest TestSuit.py -n 6
+           sobe os nós, executa o comando com GRADE_NOS definido e derruba os nós
+
+--- Com --nucleos-por-no, cada nó (e os Chromes que ele abre) fica restrito aos
+    seus núcleos (sched_setaffinity), o que faz os nós terem capacidades
+    parecidas com as de máquinas separadas e deixa o balanceamento visível na
+    vazão por nó do relatório.
+================================================================================
+"""
+import argparse
+import os
+import subprocess
+import sys
+from time import monotonic, sleep
+from urllib.error import URLError
+from urllib.request import urlopen
+from auxiliar import logger
+
+# Executável do chromedriver, porta do primeiro nó e tempo máximo para os nós responderem
+CHROMEDRIVER = "drivers/chromedriver"
+PORTA_INICIAL = 4445
+TEMPO_INICIO = 20
+
+# Classe que sobe vários chromedrivers locais como nós de uma grade
+class GradeLocal:
+    def __init__(self, nos=2, sessoes=2, nucleos_por_no=None, porta_inicial=PORTA_INICIAL):
+        self.nos = nos
+        self.sessoes = sessoes
+        self.nucleos_por_no = nucleos_por_no
+        self.portas = [porta_inicial + indice for indice in range(nos)]
+        self.processos = []
+
+    # Método que sobe um chromedriver por nó e aguarda todos responderem
+    def iniciar(self):
+        nucleos = sorted(os.sched_getaffinity(0))
+        for indice, porta in enumerate(self.portas):
+            afinidade = None
+            if self.nucleos_por_no:
+                inicio = indice * self.nucleos_por_no % len(nucleos)
+                afinidade = set(nucleos[inicio:inicio + self.nucleos_por_no]) or set(nucleos)
+            self.processos.append(subprocess.Popen(
+                [CHROMEDRIVER, f"--port={porta}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                preexec_fn=(lambda afinidade=afinidade: os.sched_setaffinity(0, afinidade)) if afinidade else None,
+            ))
+            logger.debug(f"🛠️ Nó da grade local na porta {porta}" + (f" (núcleos {sorted(afinidade)})" if afinidade else ""))
+
+        for porta in self.portas:
+            self._aguardar(porta)
+        return self
+
+    # Método que aguarda o chromedriver da porta responder ao /status
+    def _aguardar(self, porta):
+        limite = monotonic() + TEMPO_INICIO
+        while True:
+            try:
+                with urlopen(f"http://127.0.0.1:{porta}/status", timeout=2):
+                    return
+            except (URLError, OSError):
+                if monotonic() > limite:
+                    self.encerrar()
+                    raise RuntimeError(f"O nó da grade local na porta {porta} não respondeu em {TEMPO_INICIO} segundos")
+                sleep(0.2)
+
+    # Método que monta o valor de GRADE_NOS para os nós da grade local
+    def grade_nos(self):
+        return ",".join(f"http://127.0.0.1:{porta}@{self.sessoes}" for porta in self.portas)
+
+    # Método que derruba os nós
+    def encerrar(self):
+        for processo in self.processos:
+            processo.terminate()
+        for processo in self.processos:
+            try:
+                processo.wait(5)
+            except subprocess.TimeoutExpired:
+                processo.kill()
+        self.processos.clear()
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    comando = []
+    if "--" in argumentos:
+        argumentos, comando = argumentos[:argumentos.index("--")], argumentos[argumentos.index("--") + 1:]
+
+    parser = argparse.ArgumentParser(description="Sobe uma grade local de chromedrivers para testar a distribuição entre nós.")
+    parser.add_argument("--nos", type=int, default=2, help="Quantidade de nós")
+    parser.add_argument("--sessoes", type=int, default=2, help="Sessões simultâneas por nó")
+    parser.add_argument("--nucleos-por-no", type=int, help="Núcleos da CPU de cada nó (sem isso, todos os nós dividem a máquina)")
+    parser.add_argument("--porta-inicial", type=int, default=PORTA_INICIAL)
+    args = parser.parse_args(argumentos)
+
+    # Sem log_da_execucao: o comando executado (pytest) grava e mescla o próprio TestSuit.log
+    grade_local = GradeLocal(args.nos, args.sessoes, args.nucleos_por_no, args.porta_inicial).iniciar()
+    print(f"GRADE_NOS={grade_local.grade_nos()}")
+    codigo = 0
+    try:
+        if comando:
+            codigo = subprocess.call(comando, env=dict(os.environ, GRADE_NOS=grade_local.grade_nos()))
+        else:
+            while True:
+                sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        grade_local.encerrar()
+    sys.exit(codigo)
@@ -0,0 +1,188 @@
+"""
+================================================================================
+--- Este arquivo implementa a instrumentação por etapas da automação: cada método
+    das classes do Pages.py e cada espera do auxiliar.py vira um intervalo
+    cronometrado (span), aninhado dentro do teste em execução.
+
+--- Estrutura principal:
+    1. Registro de spans:
+       - span: Context manager que cronometra uma etapa
+       - medido: Decorador que cronometra cada chamada de uma função
+       - instrumentar: Decorador de classe que aplica 'medido' a todos os métodos públicos
+
+    2. Ciclo de vida do teste (chamado pelo conftest.py):
+       - iniciar_teste: Abre o span raiz do teste
+       - finalizar_teste: Fecha o span raiz e grava os spans do teste em JSON lines
+       - limpar_execucao / mesclar_execucao: Apagam e juntam os arquivos dos workers
+       - teste_atual: Nome do teste em execução (usado nos registros de log)
+       - origem_atual: Método do Pages.py (e função auxiliar) em execução na thread,
+         usado como origem dos comandos WebDriver (comandos.py)
+
+    3. Relatório:
+       - waterfall_html: Cascata das etapas de um teste
+       - resumo_por_etapa / tabela_html: Tabela p50/p95 de cada etapa da execução
+
+--- Os spans de cada worker do pytest-xdist são gravados em .instrumentacao/
+    spans_<worker>.jsonl e, ao final da execução, mesclados em ordem de início
+    em .instrumentacao/spans.jsonl. Fora de um teste os spans não são registrados.
+================================================================================
+"""
+import functools
+import glob
+import html
+import json
+import os
+import threading
+from contextlib import contextmanager
+from itertools import count
+from time import time
+from localizadores import Localizador
+import metricas
+
+# Diretório dos arquivos de spans e arquivo mesclado da execução
+DIRETORIO = ".instrumentacao"
+ARQUIVO_MESCLADO = os.path.join(DIRETORIO, "spans.jsonl")
+
+# Prefixo dos spans dos métodos das páginas, usados como origem dos comandos WebDriver (comandos.py)
+PREFIXO_PAGINAS = "Pages."
+
+# Estado do teste atual: pilha de spans abertos por thread e spans já fechados
+_local = threading.local()
+_trava = threading.Lock()
+_ids = count(1)
+_teste = {"nome": None, "raiz": None, "spans": []}
+
+# Função que retorna a pilha de spans abertos da thread atual
+def _pilha():
+    if not hasattr(_local, "pilha"):
+        _local.pilha = []
+    return _local.pilha
+
+# Context manager que cronometra uma etapa, aninhada no span aberto da thread (ou na raiz do teste)
+@contextmanager
+def span(nome):
+    if _teste["nome"] is None:
+        yield
+        return
+
+    pilha = _pilha()
+    pai = pilha[-1] if pilha else _teste["raiz"]
+    registro = {"id": next(_ids), "pai": pai["id"], "profundidade": pai["profundidade"] + 1,
+                "teste": _teste["nome"], "nome": nome, "inicio": time()}
+    pilha.append(registro)
+    try:
+        yield
+    finally:
+        pilha.pop()
+        registro["duracao"] = time() - registro["inicio"]
+        with _trava:
+            _teste["spans"].append(registro)
+
+# Decorador que cronometra cada chamada da função (o nome do localizador, se houver, vai no nome da etapa)
+def medido(func):
+    nome = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def envolvido(*args, **kwargs):
+        detalhe = next((arg.nome for arg in args if isinstance(arg, Localizador)), None)
+        with span(nome if detalhe is None else f"{nome}[{detalhe}]"):
+            return func(*args, **kwargs)
+    return envolvido
+
+# Decorador de classe que cronometra todos os métodos públicos
+def instrumentar(classe):
+    for nome, atributo in list(vars(classe).items()):
+        if callable(atributo) and not nome.startswith("_"):
+            setattr(classe, nome, medido(atributo))
+    return classe
+
+# Função que abre o span raiz do teste
+def iniciar_teste(nome_teste):
+    _teste.update(nome=nome_teste, spans=[], raiz={"id": next(_ids), "pai": None, "profundidade": 0,
+                                                   "teste": nome_teste, "nome": "teste", "inicio": time()})
+
+# Função que retorna o nome do teste em execução (ou None fora de um teste)
+def teste_atual():
+    return _teste["nome"]
+
+# Função que retorna a origem da chamada atual da thread: o método do Pages.py aberto mais interno e, quando a
+# chamada está dentro de uma função chamada por ele (por exemplo do auxiliar.py), também o nome dessa função
+def origem_atual():
+    pilha = _pilha()
+    if not pilha:
+        return "teste"
+    interna = pilha[-1]["nome"].split("[", 1)[0]
+    metodo = next((registro["nome"].split("[", 1)[0] for registro in reversed(pilha)
+                   if registro["nome"].startswith(PREFIXO_PAGINAS)), None)
+    if metodo is None or metodo == interna:
+        return interna
+    return f"{metodo} > {interna}"
+
+# Função que fecha o span raiz, grava os spans do teste no arquivo do worker e os retorna
+def finalizar_teste():
+    if _teste["nome"] is None:
+        return []
+    raiz = _teste["raiz"]
+    raiz["duracao"] = time() - raiz["inicio"]
+    with _trava:
+        spans = sorted([raiz] + _teste["spans"], key=lambda registro: registro["inicio"])
+        _teste.update(nome=None, raiz=None, spans=[])
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    os.makedirs(DIRETORIO, exist_ok=True)
+    with open(os.path.join(DIRETORIO, f"spans_{worker}.jsonl"), "a") as arquivo:
+        for registro in spans:
+            arquivo.write(json.dumps(dict(registro, worker=worker)) + "\n")
+    return spans
+
+# Função que apaga os arquivos de spans de execuções anteriores
+def limpar_execucao():
+    for caminho in glob.glob(os.path.join(DIRETORIO, "spans*.jsonl")):
+        os.remove(caminho)
+
+# Função que junta os arquivos dos workers em um único arquivo, em ordem de início, e retorna os spans
+def mesclar_execucao():
+    spans = []
+    for caminho in glob.glob(os.path.join(DIRETORIO, "spans_*.jsonl")):
+        with open(caminho) as arquivo:
+            spans.extend(json.loads(linha) for linha in arquivo if linha.strip())
+    spans.sort(key=lambda registro: registro["inicio"])
+    if spans:
+        with open(ARQUIVO_MESCLADO, "w") as arquivo:
+            arquivo.writelines(json.dumps(registro) + "\n" for registro in spans)
+    return spans
+
+# Função que calcula, para cada etapa, a quantidade de chamadas, p50 e p95 (em segundos), da mais lenta para a mais rápida
+def resumo_por_etapa(spans):
+    duracoes = {}
+    for registro in spans:
+        if registro["pai"] is not None:
+            duracoes.setdefault(registro["nome"], []).append(registro["duracao"])
+    resumo = [(nome, len(valores), metricas.percentil(valores, 50), metricas.percentil(valores, 95))
+              for nome, valores in duracoes.items()]
+    return sorted(resumo, key=lambda linha: linha[3], reverse=True)
+
+# Função que desenha a cascata (waterfall) das etapas de um teste em HTML
+def waterfall_html(spans):
+    raiz = next((registro for registro in spans if registro["pai"] is None), None)
+    if raiz is None or raiz["duracao"] <= 0:
+        return ""
+    linhas = []
+    for registro in spans:
+        esquerda = 100 * (registro["inicio"] - raiz["inicio"]) / raiz["duracao"]
+        largura = max(100 * registro["duracao"] / raiz["duracao"], 0.2)
+        linhas.append(
+            f'<div style="display:flex;font:11px monospace;line-height:16px">'
+            f'<div style="width:45%;padding-left:{registro["profundidade"] * 12}px;overflow:hidden;white-space:nowrap">'
+            f'{html.escape(registro["nome"])} ({registro["duracao"]:.2f} s)</div>'
+            f'<div style="width:55%;position:relative"><div style="position:absolute;left:{esquerda:.2f}%;'
+            f'width:{largura:.2f}%;height:12px;top:2px;background:#4a90d9"></div></div></div>'
+        )
+    return '<div style="margin:4px 0">' + "".join(linhas) + "</div>"
+
+# Função que monta a tabela HTML de p50/p95 por etapa
+def tabela_html(resumo):
+    linhas = "".join(f"<tr><td>{html.escape(nome)}</td><td>{quantidade}</td><td>{p50:.3f}</td><td>{p95:.3f}</td></tr>"
+                     for nome, quantidade, p50, p95 in resumo)
+    return ("<table><tr><th>Etapa</th><th>Chamadas</th><th>p50 (s)</th><th>p95 (s)</th></tr>"
+            f"{linhas}</table>")
@@ -0,0 +1,149 @@
+"""
+================================================================================
+--- Este arquivo implementa o registro central de localizadores usado por todas
+    as classes do Pages.py. Cada elemento lógico da interface tem uma lista
+    ordenada de estratégias: primeiro uma ancorada no próprio elemento (id,
+    placeholder, rótulo, tipo do campo ou componente Angular) e, por último, o
+    XPath absoluto original, que só é tentado quando a página mudou.
+
+--- Estrutura principal:
+    1. Localizador: Elemento lógico com suas estratégias de busca
+       - encontrar / encontrar_todos: Buscam o elemento tentando as estratégias em ordem
+       - visivel: Retorna o primeiro elemento visível encontrado
+       - invisivel: Verifica se nenhuma estratégia encontra o elemento visível
+       - registrar_latencia: Guarda o tempo que o elemento levou para ser resolvido
+
+    2. Registro:
+       - registrar: Cadastra um elemento lógico no registro
+       - obter: Retorna o localizador cadastrado com o nome informado
+
+--- Cada localizador lembra qual estratégia funcionou por último e a tenta primeiro
+    nas buscas seguintes. Como cada estratégia ausente custa um find_elements por
+    tentativa do WebDriverWait, a lista não repete o mesmo caminho em outra sintaxe. As latências de resolução são enviadas às métricas como
+    amostras 'localizador:<nome>', para que os seletores mais lentos apareçam no
+    resumo da execução.
+================================================================================
+"""
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
+import metricas
+
+# Registro de todos os elementos lógicos, indexado pelo nome
+REGISTRO = {}
+
+# Classe que representa um elemento lógico da interface e suas estratégias de busca
+class Localizador:
+    def __init__(self, nome, estrategias):
+        self.nome = nome
+        self.estrategias = list(estrategias)
+        self.preferida = 0
+
+    def __repr__(self):
+        return f"Localizador({self.nome})"
+
+    # Método que retorna os índices das estratégias, começando pela última que funcionou
+    def _ordem(self):
+        return [self.preferida] + [indice for indice in range(len(self.estrategias)) if indice != self.preferida]
+
+    # Método que retorna todos os elementos da primeira estratégia que encontrar algum
+    def encontrar_todos(self, driver):
+        for indice in self._ordem():
+            elementos = driver.find_elements(*self.estrategias[indice])
+            if elementos:
+                self.preferida = indice
+                return elementos
+        return []
+
+    # Método que retorna o primeiro elemento encontrado ou False (usado como condição do WebDriverWait)
+    def encontrar(self, driver):
+        elementos = self.encontrar_todos(driver)
+        return elementos[0] if elementos else False
+
+    # Método que retorna o primeiro elemento visível encontrado ou False (usado como condição do WebDriverWait)
+    def visivel(self, driver):
+        try:
+            return next((elemento for elemento in self.encontrar_todos(driver) if elemento.is_displayed()), False)
+        except StaleElementReferenceException:
+            return False
+
+    # Método que verifica se nenhuma estratégia encontra o elemento visível (usado como condição do WebDriverWait)
+    def invisivel(self, driver):
+        try:
+            return not any(elemento.is_displayed() for elemento in self.encontrar_todos(driver))
+        except StaleElementReferenceException:
+            return True
+
+    # Método que guarda a latência de resolução do elemento nas métricas
+    def registrar_latencia(self, segundos):
+        metricas.amostrar(f"localizador:{self.nome}", segundos)
+
+# Função que cadastra um elemento lógico no registro e o retorna
+def registrar(nome, *estrategias):
+    REGISTRO[nome] = Localizador(nome, estrategias)
+    return REGISTRO[nome]
+
+# Função que retorna o localizador cadastrado com o nome informado
+def obter(nome):
+    return REGISTRO[nome]
+
+# Prefixo comum dos campos do formulário de criação de assinatura
+_FORM = "/html[1]/body[1]/app-layout[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/app-subscriptions-management[1]/app-create-new-subscription[1]/div[1]/div[2]/div[1]/div[2]"
+
+# Função que monta o XPath de um trecho do ng-select do formulário de assinatura identificado pelo seu placeholder
+def _ng_select(placeholder, trecho):
+    return (By.XPATH, f"//app-create-new-subscription//ng-select[.//*[contains(concat(' ', normalize-space(@class), ' '), ' ng-placeholder ')]"
+                      f"[normalize-space()='{placeholder}']]{trecho}")
+
+# Página de login
+registrar("login.usuario", (By.ID, "username"))
+registrar("login.senha", (By.ID, "password"))
+registrar("login.entrar", (By.ID, "kt_sign_in_submit"))
+registrar("web.splash", (By.ID, "splash-screen"))
+
+# Página principal (ancorados nos componentes do menu; o XPath absoluto original fica por último)
+registrar("web.botao_org",
+          (By.CSS_SELECTOR, "app-main-side-menu ul > app-menu-item:first-of-type"),
+          (By.XPATH, "/html/body/app-layout/div/app-main-side-menu/div/div/div[2]/div[1]/ul/app-menu-item"))
+registrar("web.lista_orgs",
+          (By.XPATH, "//app-org-sub-menu-item/div/div/div[3]"),
+          (By.XPATH, "/html/body/app-layout/div/app-org-sub-menu-item/div/div/div[3]"))
+registrar("web.lista_areas",
+          (By.CSS_SELECTOR, "app-main-side-menu ul"),
+          (By.XPATH, "/html/body/app-layout/div/app-main-side-menu/div/div/div[2]/div[1]/ul"))
+
+# Backoffice
+registrar("backoffice.lista_areas",
+          (By.CSS_SELECTOR, "app-aside ul"),
+          (By.XPATH, "/html/body/app-layout/div/div/app-aside/div[2]/div/ul"))
+registrar("backoffice.splash", (By.CSS_SELECTOR, "app-splash-screen"))
+
+# Formulário de criação de assinatura (ancorados em ids, placeholders, rótulos e tipos dos campos)
+registrar("assinatura.tipo_usuario_existente", (By.ID, "inlineRadio1"))
+registrar("assinatura.tipo_novo_usuario", (By.ID, "inlineRadio2"))
+registrar("assinatura.usuario_existente",
+          _ng_select("Usuário", "//input"),
+          (By.XPATH, _FORM + "/div[1]/form[1]/div[2]/div[1]/ng-select[1]/div[1]/div[1]/div[3]/input[1]"))
+registrar("assinatura.usuario_selecionado",
+          _ng_select("Usuário", "//*[contains(concat(' ', normalize-space(@class), ' '), ' ng-value ')]"),
+          (By.XPATH, "//app-create-new-subscription//form/div[2]/div[1]/ng-select//*[contains(concat(' ', normalize-space(@class), ' '), ' ng-value ')]"))
+registrar("assinatura.org_selecionada",
+          _ng_select("Organização", "//*[contains(concat(' ', normalize-space(@class), ' '), ' ng-value ')]"),
+          (By.XPATH, "//app-create-new-subscription//form/div[2]/div[2]/ng-select//*[contains(concat(' ', normalize-space(@class), ' '), ' ng-value ')]"))
+registrar("assinatura.plano",
+          _ng_select("Assinatura", "//input"),
+          (By.XPATH, _FORM + "/div[1]/form[1]/div[3]/div[1]/ng-select[1]/div[1]/div[1]/div[3]/input[1]"))
+registrar("assinatura.acessos",
+          (By.XPATH, "//app-create-new-subscription//form//label[normalize-space()='Acessos']/../following-sibling::div[1]//input"),
+          (By.XPATH, "/html/body/app-layout/div/div/div/div/div/div/app-subscriptions-management/app-create-new-subscription/div/div[2]/div/div[2]/div[1]/form/div[4]/div[2]/input"))
+registrar("assinatura.preco",
+          (By.CSS_SELECTOR, "app-create-new-subscription form input[placeholder='Preço']"),
+          (By.XPATH, _FORM + "/div[1]/form[1]/div[5]/div[1]/input[1]"))
+registrar("assinatura.flag_asaas",
+          (By.CSS_SELECTOR, "app-create-new-subscription form input[type='checkbox'] + label"),
+          (By.XPATH, "/html/body/app-layout/div/div/div/div/div/div/app-subscriptions-management/app-create-new-subscription/div/div[2]/div/div[2]/div[1]/form/div[9]/div/span/label"))
+registrar("assinatura.concluir",
+          (By.XPATH, "//app-create-new-subscription//form/parent::div/following-sibling::div//button"),
+          (By.XPATH, _FORM + "/div[2]/div[2]/button[1]"))
+registrar("assinatura.confirmar",
+          (By.XPATH, "//app-create-new-subscription//form/parent::div/following-sibling::div//button"),
+          (By.XPATH, _FORM + "/div[2]/div[2]/button[1]"))
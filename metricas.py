@@ -0,0 +1,74 @@
+"""
+================================================================================
+--- Este arquivo centraliza as métricas de execução coletadas durante os testes
+    (logins evitados, tempos de inicialização, contagens de requisições, etc.).
+
+--- Estrutura principal:
+    1. Métricas do teste atual:
+       - incrementar: Soma um valor a uma métrica do teste em execução
+       - registrar: Define o valor de uma métrica do teste em execução
+       - amostrar: Guarda uma amostra (latência, duração) de uma métrica
+       - coletar: Devolve as métricas do teste e as zera para o próximo
+
+    2. Métricas da execução:
+       - acumular: Soma as métricas de um teste ao total da execução
+       - totais: Devolve o total acumulado de cada métrica
+       - amostras: Devolve as amostras reunidas de cada métrica
+       - percentil: Calcula um percentil de uma lista de amostras
+
+--- As métricas de cada teste são anexadas ao relatório pelo conftest.py, o que
+    permite que o pytest-xdist as leve dos workers até o processo principal,
+    onde são somadas e exibidas no terminal e no TestSuit_report.html.
+================================================================================
+"""
+
+# Métricas do teste em execução (zeradas a cada coleta)
+_metricas_teste = {}
+
+# Métricas somadas e amostras reunidas de todos os testes da execução
+_metricas_execucao = {}
+_amostras_execucao = {}
+
+# Função que soma um valor a uma métrica do teste atual
+def incrementar(nome, valor=1):
+    _metricas_teste[nome] = _metricas_teste.get(nome, 0) + valor
+
+# Função que define o valor de uma métrica do teste atual
+def registrar(nome, valor):
+    _metricas_teste[nome] = valor
+
+# Função que guarda uma amostra (por exemplo, uma latência) de uma métrica do teste atual
+def amostrar(nome, valor):
+    _metricas_teste.setdefault(nome, []).append(valor)
+
+# Função que devolve as métricas do teste atual e as zera
+def coletar():
+    coletadas = dict(_metricas_teste)
+    _metricas_teste.clear()
+    return coletadas
+
+# Função que soma as métricas de um teste ao total da execução
+def acumular(metricas_teste):
+    for nome, valor in metricas_teste.items():
+        if isinstance(valor, (int, float)):
+            _metricas_execucao[nome] = _metricas_execucao.get(nome, 0) + valor
+        elif isinstance(valor, list):
+            _amostras_execucao.setdefault(nome, []).extend(valor)
+
+# Função que devolve o total acumulado de cada métrica
+def totais():
+    return dict(sorted(_metricas_execucao.items()))
+
+# Função que devolve as amostras reunidas de cada métrica
+def amostras():
+    return dict(sorted(_amostras_execucao.items()))
+
+# Função que calcula o percentil (0 a 100) de uma lista de valores, por interpolação linear
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
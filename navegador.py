@@ -0,0 +1,223 @@
+"""
+================================================================================
+--- Este arquivo implementa a criação dos navegadores usados nos testes e um pool
+    que os reaproveita entre testes do mesmo worker, evitando abrir um Chrome
+    (e o proxy do selenium-wire) novo a cada teste.
+
+--- Estrutura principal:
+    1. criar_driver: Cria um Chrome do selenium-wire com as opções da automação,
+       no chromedriver local ou em um nó remoto (backend, grade.py),
+       as políticas de captura de rede (captura.py) e de bloqueio (bloqueio.py)
+       e a coleta de respostas 5xx (rede.py) e de erros JavaScript das esperas
+       (tempos_limite.py); cada
+       comando WebDriver enviado entra no perfil de comandos (comandos.py)
+
+    2. PoolDeNavegadores: Classe que empresta e recebe de volta os navegadores
+       - obter: Entrega um navegador saudável (reaproveitado ou novo)
+       - devolver: Recebe o navegador, limpa o estado e decide se ele é reciclado
+       - encerrar: Fecha todos os navegadores do pool
+
+    3. memoria_mb: Memória ocupada por um navegador (chromedriver e processos do Chrome,
+       ou o heap JavaScript da página nos navegadores remotos)
+
+    4. pool: Instância do pool do processo atual (um por worker do pytest-xdist),
+       encerrada automaticamente quando o processo termina
+
+--- Entre um teste e outro o navegador é zerado: requisições capturadas e ouvintes
+    de rede apagados, janelas extras fechadas, cookies e storage limpos. Um
+    navegador é reciclado depois de um número máximo de usos, quando a memória
+    passa do limite ou quando falha na verificação de saúde.
+
+--- Os tempos de inicialização e de limpeza são registrados nas métricas
+    (navegador_inicializacao_s, navegador_limpeza_s) junto com as contagens de
+    navegadores criados, reaproveitados e reciclados e de comandos WebDriver
+    enviados em cada teste (comandos_webdriver). O nó do navegador de cada teste
+    vai em no_da_grade, para a vazão por nó do relatório.
+================================================================================
+"""
+import atexit
+import os
+from time import perf_counter
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+from auxiliar import logger
+import bloqueio
+import captura
+import comandos
+import grade
+import metricas
+import rede
+import tempos_limite
+
+# Limites padrão de reaproveitamento de um navegador
+MAX_USOS_PADRAO = 20
+MAX_MEMORIA_MB_PADRAO = 1500
+
+# Backend dos navegadores da execução: chromedriver local ou nós remotos (GRADE_NOS, grade.py)
+backend = grade.backend_da_execucao()
+
+# Tipos de dados apagados de cada origem visitada durante a limpeza
+TIPOS_STORAGE = "local_storage,session_storage,indexeddb,websql,cache_storage,service_workers"
+
+# Função que cria um Chrome do selenium-wire com as opções da automação, a política de captura de rede
+# e, opcionalmente, a política de bloqueio da navegação enxuta
+def criar_driver(politica_captura=captura.POLITICA_PADRAO, politica_bloqueio=None):
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--start-maximized")
+    # Sem isso o Chrome não passa pelo proxy do selenium-wire ao acessar localhost (simulador da plataforma)
+    options.add_argument("--proxy-bypass-list=<-loopback>")
+    if politica_bloqueio is not None:
+        bloqueio.configurar_chrome(options)
+    driver = backend.iniciar(options, captura.opcoes_seleniumwire(politica_captura))
+    captura.aplicar(driver, politica_captura)
+    rede.MonitorDeRede.para(driver)
+    tempos_limite.instalar(driver)
+    comandos.instalar(driver)
+    if politica_bloqueio is not None:
+        bloqueio.aplicar(driver, politica_bloqueio)
+    return driver
+
+# Função que mede a memória (MB) do chromedriver e de todos os processos do Chrome abaixo dele
+def memoria_mb(driver):
+    # Navegadores remotos (grade.py) não têm processos nesta máquina: usa o heap JavaScript da página
+    if getattr(driver, "service", None) is None:
+        return _memoria_js_mb(driver)
+    try:
+        filhos = {}
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                with open(f"/proc/{pid}/stat") as arquivo:
+                    ppid = int(arquivo.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                continue
+            filhos.setdefault(ppid, []).append(int(pid))
+
+        total_kb = 0
+        pendentes = [driver.service.process.pid]
+        while pendentes:
+            pid = pendentes.pop()
+            pendentes.extend(filhos.get(pid, []))
+            try:
+                with open(f"/proc/{pid}/status") as arquivo:
+                    total_kb += sum(int(linha.split()[1]) for linha in arquivo if linha.startswith("VmRSS:"))
+            except OSError:
+                continue
+        return total_kb / 1024
+
+    # Fora do Linux usa o heap JavaScript da página como aproximação
+    except OSError:
+        return _memoria_js_mb(driver)
+
+# Função que mede o heap JavaScript da página (MB), aproximação da memória do navegador
+def _memoria_js_mb(driver):
+    return driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0;") / (1024 * 1024)
+
+# Classe para emprestar e reaproveitar navegadores entre testes
+class PoolDeNavegadores:
+    def __init__(self, fabrica=criar_driver, max_usos=MAX_USOS_PADRAO, max_memoria_mb=MAX_MEMORIA_MB_PADRAO):
+        self.fabrica = fabrica
+        self.max_usos = max_usos
+        self.max_memoria_mb = max_memoria_mb
+        self.livres = []
+        self.usos = {}
+
+    # Método para entregar um navegador saudável, reaproveitando um livre quando possível
+    def obter(self):
+        while self.livres:
+            driver = self.livres.pop()
+            if self._saudavel(driver):
+                self.usos[driver] += 1
+                metricas.incrementar("navegadores_reaproveitados")
+                metricas.registrar("no_da_grade", getattr(driver, "no_da_grade", "local"))
+                return driver
+            logger.debug("⚠️ Navegador do pool não respondeu, será substituído.")
+            self._descartar(driver)
+
+        inicio = perf_counter()
+        driver = self.fabrica()
+        duracao = perf_counter() - inicio
+        self.usos[driver] = 1
+        metricas.incrementar("navegadores_criados")
+        metricas.incrementar("navegador_inicializacao_s", duracao)
+        logger.debug(f"ℹ️ Navegador iniciado em {duracao:.2f} segundos.")
+        metricas.registrar("no_da_grade", getattr(driver, "no_da_grade", "local"))
+        return driver
+
+    # Método para receber um navegador de volta, limpando-o ou reciclando-o
+    def devolver(self, driver):
+        if self.usos.get(driver, 0) >= self.max_usos:
+            logger.debug(f"ℹ️ Navegador reciclado após {self.usos[driver]} usos.")
+            self._reciclar(driver)
+            return
+
+        inicio = perf_counter()
+        try:
+            self._limpar(driver)
+            memoria = memoria_mb(driver)
+        except WebDriverException:
+            logger.debug("⚠️ Falha ao limpar o navegador, será reciclado.")
+            self._reciclar(driver)
+            return
+        duracao = perf_counter() - inicio
+        metricas.incrementar("navegador_limpeza_s", duracao)
+        logger.debug(f"ℹ️ Navegador limpo em {duracao:.2f} segundos ({memoria:.0f} MB).")
+
+        if memoria > self.max_memoria_mb:
+            logger.debug(f"ℹ️ Navegador reciclado por uso de memória ({memoria:.0f} MB).")
+            self._reciclar(driver)
+            return
+        self.livres.append(driver)
+
+    # Método para fechar todos os navegadores livres do pool
+    def encerrar(self):
+        while self.livres:
+            self._descartar(self.livres.pop())
+
+    # Método que zera o estado do navegador entre testes
+    def _limpar(self, driver):
+        captura.registrar_resumo(driver)
+        bloqueio.registrar_resumo(driver)
+        del driver.requests
+        if getattr(driver, "monitor_de_rede", None):
+            driver.monitor_de_rede.limpar()
+
+        # Fecha as janelas extras, guardando as origens visitadas para limpar o storage
+        origens = set()
+        principal, *extras = driver.window_handles
+        for handle in extras:
+            driver.switch_to.window(handle)
+            origens.add(driver.execute_script("return window.location.origin;"))
+            driver.close()
+        driver.switch_to.window(principal)
+        origens.add(driver.execute_script("return window.location.origin;"))
+
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origem in origens - {"null"}:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origem, "storageTypes": TIPOS_STORAGE})
+        driver.get("about:blank")
+
+    # Método que confere se o navegador ainda responde aos comandos
+    def _saudavel(self, driver):
+        try:
+            driver.execute_script("return 1;")
+            return len(driver.window_handles) > 0
+        except WebDriverException:
+            return False
+
+    # Método que fecha o navegador e registra a reciclagem
+    def _reciclar(self, driver):
+        metricas.incrementar("navegadores_reciclados")
+        self._descartar(driver)
+
+    # Método que fecha o navegador e o retira do pool
+    def _descartar(self, driver):
+        self.usos.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+# Pool do processo atual (um por worker do pytest-xdist)
+pool = PoolDeNavegadores()
+atexit.register(pool.encerrar)
@@ -0,0 +1,142 @@
+"""
+================================================================================
+--- Este arquivo implementa o rastro de rede de cada teste: cada par
+    requisição/resposta é gravado, assim que a resposta chega, como uma entrada
+    HAR em um arquivo JSON lines compactado (gzip) em disco, sem acumular o
+    tráfego em memória.
+
+--- Estrutura principal:
+    1. GravadorDeRastro: Ouvinte do MonitorDeRede (rede.py) que grava o rastro
+       - iniciar: Cria o gravador do teste e o registra no monitor do navegador
+       - __call__: Grava a entrada HAR de um par requisição/resposta
+       - finalizar: Remove o ouvinte, fecha o arquivo e o entrega ao conftest.py
+
+    2. coletar / descartar: Usadas pelo conftest.py ao final do teste para anexar
+       o rastro ao relatório (teste com falha) ou apagá-lo (teste aprovado)
+
+    3. Execução direta: python rastro.py .rastros/<teste>.jsonl.gz > rastro.har
+       converte o rastro em um HAR completo (DevTools, visualizadores de HAR)
+
+--- O início e a duração de cada entrada vão do envio real da requisição
+    (request.envio, anotado pelo MonitorDeRede) até a resposta; quando o envio
+    não foi visto, a entrada começa na resposta e é marcada com _envioDesconhecido.
+
+--- Os rastros ficam em .rastros/ e só são mantidos para os testes que falharam.
+    Os cabeçalhos de credenciais (Cookie, Set-Cookie, Authorization) são gravados
+    mascarados e os corpos só entram quando são texto, até MAX_CORPO_BYTES.
+================================================================================
+"""
+import gzip
+import json
+import os
+import re
+import threading
+from seleniumwire.utils import decode
+from auxiliar import logger
+import rede
+
+# Diretório dos rastros, tamanho máximo de corpo gravado e cabeçalhos mascarados
+DIRETORIO_RASTROS = ".rastros"
+MAX_CORPO_BYTES = 64 * 1024
+CABECALHOS_MASCARADOS = {"cookie", "set-cookie", "authorization"}
+
+# Tipos de conteúdo cujos corpos são gravados como texto
+TIPOS_TEXTO = ("json", "text", "xml", "javascript", "x-www-form-urlencoded")
+
+# Rastro finalizado do teste atual, aguardando o conftest.py decidir se fica no relatório
+_rastro_do_teste = None
+
+# Função que converte os cabeçalhos do selenium-wire no formato HAR, mascarando as credenciais
+def _cabecalhos(headers):
+    return [{"name": nome, "value": "***" if nome.lower() in CABECALHOS_MASCARADOS else valor}
+            for nome, valor in headers.items()]
+
+# Função que monta o conteúdo HAR de um corpo (texto até MAX_CORPO_BYTES, nada para binários)
+def _conteudo(corpo, headers):
+    tipo = headers.get("Content-Type", "")
+    conteudo = {"size": len(corpo), "mimeType": tipo}
+    if corpo and any(texto in tipo for texto in TIPOS_TEXTO):
+        conteudo["text"] = corpo[:MAX_CORPO_BYTES].decode("utf-8", errors="replace")
+    return conteudo
+
+# Classe que grava o rastro de rede de um teste em disco, uma entrada HAR por resposta
+class GravadorDeRastro:
+    def __init__(self, driver, nome_teste):
+        self.driver = driver
+        self.caminho = os.path.join(DIRETORIO_RASTROS, re.sub(r"[^\w.-]+", "_", nome_teste) + ".jsonl.gz")
+        self.entradas = 0
+        self.trava = threading.Lock()
+        os.makedirs(DIRETORIO_RASTROS, exist_ok=True)
+        self.arquivo = gzip.open(self.caminho, "wt", encoding="utf-8")
+
+    # Método que cria o gravador do teste e o registra no monitor de rede do navegador
+    @classmethod
+    def iniciar(cls, driver, nome_teste):
+        gravador = cls(driver, nome_teste)
+        rede.MonitorDeRede.para(driver).adicionar_ouvinte(gravador)
+        return gravador
+
+    # Chamado pelo monitor a cada resposta (nas threads do proxy); grava a entrada e a descarta
+    def __call__(self, request, response):
+        corpo = decode(response.body, response.headers.get("Content-Encoding", "identity"))
+        # request.date é o instante em que o selenium-wire recriou a requisição, junto da resposta; o envio real vem do MonitorDeRede
+        envio = request.envio or response.date
+        tempo_ms = round((response.date - envio).total_seconds() * 1000, 1)
+        entrada = {
+            "startedDateTime": envio.astimezone().isoformat(),
+            "time": tempo_ms,
+            "request": {
+                "method": request.method, "url": request.url, "httpVersion": "HTTP/1.1",
+                "headers": _cabecalhos(request.headers), "cookies": [],
+                "queryString": [{"name": nome, "value": str(valor)} for nome, valor in request.params.items()],
+                "postData": _conteudo(request.body, request.headers),
+                "headersSize": -1, "bodySize": len(request.body),
+            },
+            "response": {
+                "status": response.status_code, "statusText": response.reason, "httpVersion": "HTTP/1.1",
+                "headers": _cabecalhos(response.headers), "cookies": [],
+                "content": _conteudo(corpo, response.headers),
+                "redirectURL": response.headers.get("Location", ""), "headersSize": -1, "bodySize": len(response.body),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": tempo_ms, "receive": 0},
+        }
+        if request.envio is None:
+            entrada["_envioDesconhecido"] = True
+        linha = json.dumps(entrada, ensure_ascii=False)
+        with self.trava:
+            if not self.arquivo.closed:
+                self.arquivo.write(linha + "\n")
+                self.entradas += 1
+
+    # Método que para a gravação, fecha o arquivo e o deixa para o conftest.py decidir se fica no relatório
+    def finalizar(self):
+        global _rastro_do_teste
+        rede.MonitorDeRede.para(self.driver).remover_ouvinte(self)
+        with self.trava:
+            self.arquivo.close()
+        _rastro_do_teste = self.caminho
+        logger.debug(f"ℹ️ Rastro de rede com {self.entradas} entradas gravado em {self.caminho}.")
+
+# Função que retorna (e esquece) o rastro finalizado do teste atual, ou None
+def coletar():
+    global _rastro_do_teste
+    caminho, _rastro_do_teste = _rastro_do_teste, None
+    return caminho
+
+# Função que apaga o rastro de um teste aprovado
+def descartar(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+# Função que converte um rastro JSON lines compactado em um HAR completo
+def para_har(caminho):
+    with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+        entradas = [json.loads(linha) for linha in arquivo if linha.strip()]
+    return {"log": {"version": "1.2", "creator": {"name": "TestsAutomation", "version": "1.0"}, "entries": entradas}}
+
+if __name__ == "__main__":
+    import sys
+    json.dump(para_har(sys.argv[1]), sys.stdout, ensure_ascii=False, indent=1)
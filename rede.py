@@ -0,0 +1,216 @@
+"""
+================================================================================
+--- Este arquivo implementa as asserções de rede da automação, baseadas nos
+    interceptadores de resposta do selenium-wire: em vez de varrer
+    driver.requests periodicamente, o teste registra o que espera antes de
+    agir e é avisado no instante em que a resposta chega.
+
+--- Estrutura principal:
+    1. MonitorDeRede: Interceptador único instalado em cada navegador, que repassa
+       cada par requisição/resposta para os ouvintes registrados e anota as
+       respostas HTTP 5xx (respostas_5xx, usadas pelas esperas do tempos_limite.py)
+       - Guarda o instante em que cada requisição saiu do navegador e o entrega
+         aos ouvintes em request.envio
+       - para: Retorna o monitor do navegador, instalando-o na primeira chamada
+       - esperar: Registra uma ExpectativaDeRequisicao
+       - adicionar_ouvinte / remover_ouvinte / limpar: Gerenciam os ouvintes
+
+    2. ExpectativaDeRequisicao: Expectativa do tipo "URL contém 'subscription'
+       e tem resposta", resolvida pelo interceptador
+       - aguardar: Bloqueia até a resposta chegar ou o tempo acabar
+       - enviada: Diz se a requisição já saiu do navegador, mesmo sem resposta
+       - corpo_json / exibir_resposta: Diagnóstico formatado da resposta
+
+    3. corpo_json / exibir_corpo: O mesmo diagnóstico para qualquer corpo de resposta
+
+    4. fluxo_da_requisicao: Fluxo (aba do abas.py) que fez uma requisição, lido da
+       marca MARCA_FLUXO no User-Agent
+
+--- Os ouvintes são chamados nas threads do proxy do selenium-wire, por isso
+    devem ser rápidos e não podem usar o driver.
+
+--- O selenium-wire recria a requisição entregue ao interceptador de resposta,
+    então request.date é o instante da resposta, não o do envio. O instante do
+    envio é anotado quando o armazenamento do selenium-wire guarda a requisição
+    e casado, pelo método e pela URL, com a resposta mais antiga pendente;
+    request.envio fica None quando o envio não foi visto (por exemplo, se foi
+    descartado por MAX_ENVIOS_PENDENTES).
+================================================================================
+"""
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pprint import pprint
+from selenium.common.exceptions import TimeoutException
+from seleniumwire.utils import decode
+from auxiliar import logger
+
+# Marca acrescentada ao User-Agent de cada aba do abas.py, seguida do nome do fluxo
+MARCA_FLUXO = "TestsAutomation-Fluxo/"
+
+# Quantidade máxima de requisições aguardando resposta (as que nunca recebem resposta não se acumulam)
+MAX_ENVIOS_PENDENTES = 1000
+
+# Classe que repassa cada resposta capturada pelo selenium-wire para os ouvintes registrados
+class MonitorDeRede:
+    def __init__(self, driver):
+        self.driver = driver
+        self.ouvintes = []
+        self.respostas_5xx = []
+        self.envios = OrderedDict()
+        self.trava = threading.Lock()
+        self._anotar_envios(driver.backend.storage)
+        driver.response_interceptor = self._interceptar
+
+    # Método que retorna o monitor do navegador, instalando-o na primeira chamada
+    @classmethod
+    def para(cls, driver):
+        if getattr(driver, "monitor_de_rede", None) is None:
+            driver.monitor_de_rede = cls(driver)
+        return driver.monitor_de_rede
+
+    # Método para registrar uma função chamada com (request, response) a cada resposta
+    def adicionar_ouvinte(self, ouvinte):
+        with self.trava:
+            self.ouvintes.append(ouvinte)
+
+    # Método para remover um ouvinte registrado
+    def remover_ouvinte(self, ouvinte):
+        with self.trava:
+            if ouvinte in self.ouvintes:
+                self.ouvintes.remove(ouvinte)
+
+    # Método para remover todos os ouvintes e as respostas 5xx anotadas (usado entre um teste e outro)
+    def limpar(self):
+        with self.trava:
+            self.ouvintes.clear()
+            self.respostas_5xx.clear()
+
+    # Método para registrar a expectativa de uma requisição antes de disparar a ação (apenas do fluxo, se informado)
+    def esperar(self, trecho_url, metodo=None, fluxo=None):
+        expectativa = ExpectativaDeRequisicao(self, trecho_url, metodo, fluxo)
+        self.adicionar_ouvinte(expectativa)
+        return expectativa
+
+    # Método que envolve o armazenamento do selenium-wire para anotar o instante de envio de cada requisição
+    # (o armazenamento recebe a requisição original, com o id e a data do envio, antes de ela sair para a rede)
+    def _anotar_envios(self, armazenamento):
+        save_request = armazenamento.save_request
+        save_response = armazenamento.save_response
+
+        def save_request_anotando(request):
+            save_request(request)
+            with self.trava:
+                self.envios[request.id] = (request.method, request.url, request.date)
+                while len(self.envios) > MAX_ENVIOS_PENDENTES:
+                    self.envios.popitem(last=False)
+
+        # Respostas que não passaram pelo interceptador (por exemplo, as criadas pelo bloqueio.py) esquecem o envio aqui
+        def save_response_esquecendo(request_id, response):
+            if not getattr(response, "_envio_retirado", False):
+                with self.trava:
+                    self.envios.pop(request_id, None)
+            save_response(request_id, response)
+
+        armazenamento.save_request = save_request_anotando
+        armazenamento.save_response = save_response_esquecendo
+
+    # Método que retira o envio pendente mais antigo da requisição (método e URL), ou None se não foi visto
+    def _retirar_envio(self, request):
+        for request_id, (metodo, url, envio) in self.envios.items():
+            if metodo == request.method and url == request.url:
+                del self.envios[request_id]
+                return envio
+        return None
+
+    # Interceptador do selenium-wire: anota as respostas 5xx e repassa o par requisição/resposta aos ouvintes
+    def _interceptar(self, request, response):
+        with self.trava:
+            request.envio = self._retirar_envio(request)
+            response._envio_retirado = True
+            if response.status_code >= 500:
+                self.respostas_5xx.append((request.date, response.status_code, request.url))
+            ouvintes = list(self.ouvintes)
+        for ouvinte in ouvintes:
+            try:
+                ouvinte(request, response)
+            except Exception as erro:
+                logger.error(f"❌ Erro: Ouvinte de rede falhou para {request.url}: {erro}")
+
+# Classe que representa uma requisição esperada, resolvida assim que a resposta chega
+class ExpectativaDeRequisicao:
+    def __init__(self, monitor, trecho_url, metodo=None, fluxo=None):
+        self.monitor = monitor
+        self.trecho_url = trecho_url
+        self.metodo = metodo
+        self.fluxo = fluxo
+        self.request = None
+        self.response = None
+        self.corpo = b""
+        self.resolvida = threading.Event()
+        self.desde = datetime.now()
+
+    # Chamado pelo monitor para cada resposta; guarda a primeira que atende à expectativa
+    def __call__(self, request, response):
+        if self.resolvida.is_set() or self.trecho_url not in request.url:
+            return
+        if self.metodo and request.method != self.metodo:
+            return
+        if self.fluxo and fluxo_da_requisicao(request) != self.fluxo:
+            return
+        self.request = request
+        self.response = response
+        self.corpo = decode(response.body, response.headers.get("Content-Encoding", "identity"))
+        self.resolvida.set()
+
+    # Método que aguarda a resposta esperada e a retorna
+    def aguardar(self, tempo=120):
+        try:
+            if not self.resolvida.wait(tempo):
+                logger.error(f"❌ Erro: Nenhuma requisição para {self.trecho_url} foi detectada em {tempo} segundos")
+                raise TimeoutException(f"Nenhuma requisição para {self.trecho_url} foi detectada em {tempo} segundos")
+            return self.response
+        finally:
+            self.monitor.remover_ouvinte(self)
+
+    # Método que verifica se a requisição esperada já saiu do navegador (respondida ou ainda pendente)
+    # A varredura de driver.requests só acontece sem resposta, quando é preciso decidir se uma ação pode ser repetida
+    def enviada(self):
+        if self.resolvida.is_set():
+            return True
+        for request in reversed(self.monitor.driver.requests):
+            if request.date < self.desde:
+                return False
+            if (self.trecho_url in request.url and (not self.metodo or request.method == self.metodo)
+                    and (not self.fluxo or fluxo_da_requisicao(request) == self.fluxo)):
+                return True
+        return False
+
+    # Método que retorna o corpo da resposta interpretado como JSON (ou o texto, se não for JSON)
+    def corpo_json(self):
+        return corpo_json(self.corpo)
+
+    # Método que exibe o corpo da resposta formatado de forma legível
+    def exibir_resposta(self):
+        exibir_corpo(self.corpo)
+
+# Função que interpreta um corpo de resposta como JSON (ou o devolve como texto, se não for JSON)
+def corpo_json(corpo):
+    texto = corpo.decode("utf-8", errors="replace")
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return texto
+
+# Função que exibe um corpo de resposta formatado de forma legível
+def exibir_corpo(corpo):
+    print("\n=== RESPOSTA DA API ===")
+    pprint(corpo_json(corpo))
+    print("======================\n")
+
+# Função que retorna o nome do fluxo (aba do abas.py) que fez a requisição, ou None fora do modo de abas
+def fluxo_da_requisicao(request):
+    marca = re.search(re.escape(MARCA_FLUXO) + r"(\S+)", request.headers.get("User-Agent", ""))
+    return marca.group(1) if marca else None
@@ -0,0 +1,96 @@
+"""
+================================================================================
+--- Este arquivo implementa a memória de rotas usada pela navegação direta do
+    Pages.py: para cada tela de destino, guarda a URL que abriu a tela com
+    sucesso, para que os próximos testes vão direto até ela sem passar pelos
+    menus de organização, área e sub-área.
+
+--- Estrutura principal:
+    1. ROTAS_CONHECIDAS / conhecer: Rotas conhecidas de cada destino, por plataforma
+    2. candidatas: URLs a tentar para um destino, da lembrada para as conhecidas
+    3. lembrar / esquecer: Gravam ou apagam a URL que resolveu o destino
+
+--- As rotas são gravadas em .cache_rotas/rotas.json, por plataforma, destino e
+    organização, e compartilhadas entre os workers do pytest-xdist. Quando a
+    navegação direta falha, a rota é esquecida e a URL aberta pelo caminho de
+    cliques passa a ser a lembrada.
+
+--- As rotas não levam a organização: a tela abre na organização ativa da
+    sessão, que o Pages.Navegacao deixa ativa antes de abrir a rota. A
+    organização só separa as rotas lembradas.
+
+--- As rotas conhecidas valem só para a plataforma (URL base) em que foram
+    registradas, como o simulador local (simulador/servidor.py). Uma rota que
+    não existe na plataforma custaria a espera inteira do Pages.Navegacao.abrir_rota
+    a cada navegação.
+================================================================================
+"""
+import json
+import os
+import threading
+from urllib.parse import urljoin
+from auxiliar import logger
+
+# Arquivo da memória de rotas
+ARQUIVO_ROTAS = os.path.join(".cache_rotas", "rotas.json")
+
+# Trava das gravações feitas por threads do mesmo processo (usuários virtuais do Carga.py)
+_trava = threading.Lock()
+
+# Rotas conhecidas de cada destino por URL base da plataforma, relativas a ela (registradas por conhecer)
+ROTAS_CONHECIDAS = {}
+
+# Função que carrega todas as rotas lembradas
+def _carregar_rotas():
+    try:
+        with open(ARQUIVO_ROTAS) as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+# Função que grava todas as rotas lembradas
+def _gravar_rotas(rotas):
+    # Grava em um arquivo temporário e substitui, para não deixar o arquivo pela metade entre workers
+    os.makedirs(os.path.dirname(ARQUIVO_ROTAS), exist_ok=True)
+    temporario = f"{ARQUIVO_ROTAS}.{os.getpid()}"
+    with open(temporario, "w") as arquivo:
+        json.dump(rotas, arquivo, indent=1, sort_keys=True)
+    os.replace(temporario, ARQUIVO_ROTAS)
+
+# Função que monta a chave de um destino na memória de rotas
+def _chave(url_base, destino, org):
+    return f"{url_base}|{destino}|{org}"
+
+# Função que retorna as URLs a tentar para o destino: primeiro a lembrada, depois as rotas conhecidas
+def candidatas(url_base, destino, org):
+    urls = []
+    lembrada = _carregar_rotas().get(_chave(url_base, destino, org))
+    if lembrada:
+        urls.append(lembrada)
+    for rota in ROTAS_CONHECIDAS.get(url_base, {}).get(destino, []):
+        url = urljoin(url_base, rota)
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+# Função que registra as rotas conhecidas de um destino na plataforma informada
+def conhecer(url_base, destino, *rotas):
+    conhecidas = ROTAS_CONHECIDAS.setdefault(url_base, {}).setdefault(destino, [])
+    conhecidas.extend(rota for rota in rotas if rota not in conhecidas)
+
+# Função que grava a URL que abriu o destino
+def lembrar(url_base, destino, org, url):
+    with _trava:
+        rotas = _carregar_rotas()
+        if rotas.get(_chave(url_base, destino, org)) == url:
+            return
+        rotas[_chave(url_base, destino, org)] = url
+        _gravar_rotas(rotas)
+    logger.debug(f"ℹ️ Rota lembrada para {destino} ({org}): {url}")
+
+# Função que apaga a URL lembrada do destino (quando deixou de funcionar)
+def esquecer(url_base, destino, org):
+    with _trava:
+        rotas = _carregar_rotas()
+        if rotas.pop(_chave(url_base, destino, org), None) is not None:
+            _gravar_rotas(rotas)
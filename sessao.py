@@ -0,0 +1,126 @@
+"""
+================================================================================
+--- Este arquivo implementa o cache de sessão autenticada, que permite que cada
+    worker faça o login completo apenas uma vez e reaproveite a sessão nos
+    testes seguintes.
+
+--- Estrutura principal:
+    1. CacheDeSessao: Classe que salva e restaura a sessão do navegador
+       - salvar: Grava cookies, localStorage e sessionStorage em disco
+       - restaurar: Recoloca a sessão salva no navegador e confere se foi aceita
+       - invalidar: Apaga a sessão salva (expirada ou rejeitada pela plataforma)
+
+--- A sessão é gravada em .cache_sessao/, um arquivo por worker do pytest-xdist,
+    com uma data de expiração. Quando a sessão está vencida ou é rejeitada, o
+    teste volta para o login normal pelo LoginPage e grava uma sessão nova.
+
+--- Cada restauração bem sucedida conta como um login evitado na métrica
+    'logins_evitados'; cada login completo conta em 'logins_realizados'.
+================================================================================
+"""
+import json
+import os
+from time import time
+from auxiliar import logger
+import metricas
+
+# Diretório onde as sessões são gravadas e validade padrão (em segundos)
+DIRETORIO_CACHE = ".cache_sessao"
+VALIDADE_PADRAO = 30 * 60
+
+# Campos aceitos pelo comando Network.setCookies do Chrome DevTools
+CAMPOS_COOKIE = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+# Script que lê o localStorage e o sessionStorage da página atual
+SCRIPT_LER_STORAGE = """
+return [Object.assign({}, window.localStorage), Object.assign({}, window.sessionStorage)];
+"""
+
+# Script que substitui o localStorage e o sessionStorage da página atual
+SCRIPT_ESCREVER_STORAGE = """
+window.localStorage.clear();
+window.sessionStorage.clear();
+for (const [chave, valor] of Object.entries(arguments[0])) window.localStorage.setItem(chave, valor);
+for (const [chave, valor] of Object.entries(arguments[1])) window.sessionStorage.setItem(chave, valor);
+"""
+
+# Função que mantém apenas os campos do cookie aceitos na restauração
+def _cookie_para_restaurar(cookie):
+    restaurado = {campo: cookie[campo] for campo in CAMPOS_COOKIE if campo in cookie}
+    # Cookies de sessão não têm data de expiração
+    if cookie.get("session"):
+        restaurado.pop("expires", None)
+    return restaurado
+
+# Classe para salvar e restaurar a sessão autenticada do navegador
+class CacheDeSessao:
+    def __init__(self, driver, url_base, validade=VALIDADE_PADRAO, diretorio=DIRETORIO_CACHE):
+        self.driver = driver
+        self.url_base = url_base
+        self.validade = validade
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.arquivo = os.path.join(diretorio, f"sessao_{worker}.json")
+
+    # Método para gravar a sessão atual do navegador em disco
+    def salvar(self):
+        cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        local_storage, session_storage = self.driver.execute_script(SCRIPT_LER_STORAGE)
+        sessao = {
+            "url": self.driver.current_url,
+            "origem": self.driver.execute_script("return window.location.origin;"),
+            "expira_em": time() + self.validade,
+            "cookies": [_cookie_para_restaurar(cookie) for cookie in cookies],
+            "localStorage": local_storage,
+            "sessionStorage": session_storage,
+        }
+
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        with open(self.arquivo, "w") as arquivo:
+            json.dump(sessao, arquivo)
+        metricas.incrementar("logins_realizados")
+        logger.debug(f"ℹ️ Sessão autenticada salva em {self.arquivo}.")
+
+    # Método para carregar a sessão gravada, descartando a que já expirou
+    def _carregar(self):
+        try:
+            with open(self.arquivo) as arquivo:
+                sessao = json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+        if sessao["expira_em"] < time():
+            logger.debug("⚠️ Sessão salva expirada, será feito um novo login.")
+            self.invalidar()
+            return None
+        return sessao
+
+    # Método para restaurar a sessão gravada e conferir se a plataforma a aceitou
+    def restaurar(self, login_page, indicador_logado):
+        sessao = self._carregar()
+        if sessao is None:
+            return False
+
+        # Cookies de todos os domínios são restaurados pelo DevTools, o storage exige estar na origem certa
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": sessao["cookies"]})
+        if self.driver.execute_script("return window.location.origin;") != sessao["origem"]:
+            self.driver.get(sessao["url"])
+        self.driver.execute_script(SCRIPT_ESCREVER_STORAGE, sessao["localStorage"], sessao["sessionStorage"])
+        self.driver.get(sessao["url"])
+
+        if login_page.sessao_aceita(indicador_logado):
+            metricas.incrementar("logins_evitados")
+            logger.debug("ℹ️ Sessão restaurada, login evitado!")
+            return True
+
+        # Sessão rejeitada: limpa o navegador para o login normal
+        logger.debug("⚠️ Sessão salva rejeitada pela plataforma, será feito um novo login.")
+        self.invalidar()
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.driver.execute_script(SCRIPT_ESCREVER_STORAGE, {}, {})
+        self.driver.get(self.url_base)
+        return False
+
+    # Método para apagar a sessão gravada
+    def invalidar(self):
+        if os.path.exists(self.arquivo):
+            os.remove(self.arquivo)
@@ -0,0 +1,3 @@
+"""
+Simulador local da plataforma (páginas, API e servidor HTTP) usado pelos benchmarks da automação.
+"""
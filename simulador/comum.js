@@ -0,0 +1,91 @@
+// Funções compartilhadas pelas páginas do simulador da plataforma.
+// Emula a "testabilidade" do Angular: a página só é estável quando não há requisições nem timers pendentes.
+let pendentes = 0;
+window.getAllAngularTestabilities = () => [{ isStable: () => pendentes === 0 }];
+
+// Acompanha uma promessa como trabalho pendente da página
+function rastrear(promessa) {
+    pendentes++;
+    return promessa.finally(() => pendentes--);
+}
+
+// Espera um tempo, contando como trabalho pendente (como um setTimeout dentro da zona do Angular)
+function aguardar(ms) {
+    return rastrear(new Promise(resolver => setTimeout(resolver, ms)));
+}
+
+// Faz uma chamada à API do simulador e devolve {status, dados}
+function api(url, opcoes) {
+    return rastrear(fetch(url, opcoes).then(async resposta => ({ status: resposta.status, dados: await resposta.json() })));
+}
+
+// Transforma um <ng-select data-fonte="..."> em um campo de busca com lista de opções, como o ng-select do Angular
+function criarNgSelect(elemento, aoSelecionar) {
+    const input = elemento.querySelector("input");
+    const valor = elemento.querySelector(".ng-value");
+    const painel = elemento.querySelector("ng-dropdown-panel");
+    let opcoes = [];
+    let marcada = 0;
+    let busca = 0;
+
+    function fechar() {
+        painel.innerHTML = "";
+        painel.style.display = "none";
+    }
+
+    function desenhar() {
+        painel.innerHTML = "";
+        opcoes.forEach((opcao, indice) => {
+            const div = document.createElement("div");
+            div.className = "ng-option" + (indice === marcada ? " ng-option-marked" : "");
+            div.textContent = opcao.rotulo;
+            div.addEventListener("mousedown", () => selecionar(indice));
+            painel.appendChild(div);
+        });
+        painel.style.display = opcoes.length ? "block" : "none";
+    }
+
+    function selecionar(indice) {
+        const opcao = opcoes[indice];
+        if (!opcao) return;
+        elemento.dataset.valor = opcao.valor;
+        valor.textContent = opcao.rotulo;
+        input.value = "";
+        fechar();
+        if (aoSelecionar) aoSelecionar(opcao);
+    }
+
+    input.addEventListener("input", async () => {
+        const minhaBusca = ++busca;
+        delete elemento.dataset.valor;
+        await aguardar(200);
+        if (minhaBusca !== busca) return;
+
+        const spinner = document.createElement("span");
+        spinner.className = "ng-spinner-loader";
+        elemento.appendChild(spinner);
+        const { dados } = await api(`/api/${elemento.dataset.fonte}?search=${encodeURIComponent(input.value)}`);
+        spinner.remove();
+        if (minhaBusca !== busca) return;
+
+        opcoes = dados;
+        marcada = 0;
+        desenhar();
+    });
+
+    input.addEventListener("keydown", evento => {
+        if (evento.key === "Enter") {
+            evento.preventDefault();
+            selecionar(marcada);
+        } else if (evento.key === "ArrowDown" && opcoes.length) {
+            marcada = (marcada + 1) % opcoes.length;
+            desenhar();
+        } else if (evento.key === "Tab") {
+            fechar();
+        } else if (evento.key === "Backspace" && !input.value) {
+            // Como o ng-select (clearOnBackspace), o BACKSPACE com a busca vazia remove o valor selecionado
+            delete elemento.dataset.valor;
+            valor.textContent = "";
+        }
+    });
+}
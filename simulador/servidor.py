@@ -0,0 +1,180 @@
+"""
+================================================================================
+--- Este arquivo implementa o servidor HTTP local do simulador da plataforma,
+    usado para medir o desempenho da própria automação sem depender da rede
+    nem de https://platform.ecotx.dev/.
+
+--- Estrutura principal:
+    1. Configuracao: Latências e taxa de erro do simulador
+    2. Manipulador: Serve as páginas (plataforma e backoffice) e a API simulada:
+       - POST /api/login, GET /api/bootstrap, POST /api/org
+       - GET /api/users, /api/orgs, /api/plans (?search=texto)
+       - POST /api/subscription (latência e taxa de erro configuráveis)
+    3. iniciar: Sobe o servidor em uma thread e retorna o servidor e sua URL
+       (ROTAS: rotas da navegação direta que o simulador atende)
+    4. Execução direta: python simulador/servidor.py --porta 8000
+
+--- As páginas reproduzem a estrutura do DOM usada pelo Pages.py (#username,
+    #kt_sign_in_submit, #splash-screen, menus laterais, formulário com ng-select),
+    então os mesmos page objects rodam contra o simulador.
+================================================================================
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import uuid
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from time import sleep
+from urllib.parse import urlsplit, parse_qs
+
+# Diretório com as páginas do simulador
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Dados exibidos nas buscas dos ng-select
+USUARIOS = ["nicolas.rossoni@datlaz.com", "nicolas.o.rossoni@gmail.com", "maria.silva@datlaz.com", "joao.souza@datlaz.com"]
+ORGS = ["Vigilant", "TesteNicolas", "Datlaz", "Ecotx"]
+PLANOS = {"Venda+": 5, "Standard": 10, "Professional": 25, "Chile": 10, "Portugal": 10, "Telecom": 50}
+
+# Rotas que abrem cada destino do Pages.Navegacao direto no simulador (registradas com rotas.conhecer)
+ROTAS = {"backoffice.criar_assinatura": ["backoffice/assinaturas/nova"]}
+
+# Classe com as latências (em segundos) e a taxa de erro do simulador
+class Configuracao:
+    def __init__(self, latencia_api=0.05, latencia_splash=0.5, latencia_assinatura=0.3, taxa_erro=0.0):
+        self.latencia_api = latencia_api
+        self.latencia_splash = latencia_splash
+        self.latencia_assinatura = latencia_assinatura
+        self.taxa_erro = taxa_erro
+
+# Classe que atende as páginas e a API simulada
+class Manipulador(BaseHTTPRequestHandler):
+    configuracao = Configuracao()
+    sessoes = {}
+    assinaturas = []
+    trava = threading.Lock()
+
+    # Silencia o log de cada requisição no terminal
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        busca = parse_qs(url.query).get("search", [""])[0].lower()
+
+        if url.path == "/" or url.path.startswith("/backoffice"):
+            pagina = "plataforma.html" if url.path == "/" else "backoffice.html"
+            self._arquivo(pagina, "text/html; charset=utf-8")
+        elif url.path == "/static/comum.js":
+            self._arquivo("comum.js", "application/javascript; charset=utf-8")
+        elif url.path == "/api/bootstrap":
+            sleep(self.configuracao.latencia_splash)
+            sessao = self._sessao()
+            if sessao is None:
+                self._json(401, {"erro": "Sessão inválida"})
+            else:
+                self._json(200, {"usuario": sessao["usuario"], "org": sessao["org"]})
+        elif url.path == "/api/users":
+            self._opcoes([{"valor": email, "rotulo": email} for email in USUARIOS if busca in email])
+        elif url.path == "/api/orgs":
+            self._opcoes([{"valor": org, "rotulo": org} for org in ORGS if busca in org.lower()])
+        elif url.path == "/api/plans":
+            self._opcoes([{"valor": nome, "rotulo": nome, "acessos": acessos} for nome, acessos in PLANOS.items() if busca in nome.lower()])
+        else:
+            self._json(404, {"erro": "Não encontrado"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        tamanho = int(self.headers.get("Content-Length", 0))
+        corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+
+        if url.path == "/api/login":
+            sleep(self.configuracao.latencia_api)
+            token = uuid.uuid4().hex
+            with self.trava:
+                self.sessoes[token] = {"usuario": corpo.get("usuario"), "org": ORGS[1]}
+            self._json(200, {"token": token}, cookie=f"sessao={token}; Path=/")
+        elif url.path == "/api/org":
+            sleep(self.configuracao.latencia_api)
+            sessao = self._sessao()
+            if sessao is None:
+                self._json(401, {"erro": "Sessão inválida"})
+                return
+            sessao["org"] = corpo.get("org")
+            self._json(200, {"org": sessao["org"]})
+        elif url.path == "/api/subscription":
+            self._criar_assinatura(corpo)
+        else:
+            self._json(404, {"erro": "Não encontrado"})
+
+    # Cria a assinatura respeitando a latência e a taxa de erro configuradas
+    def _criar_assinatura(self, corpo):
+        sleep(self.configuracao.latencia_assinatura)
+        if self._sessao() is None:
+            self._json(401, {"erro": "Sessão inválida"})
+        elif random.random() < self.configuracao.taxa_erro:
+            self._json(500, {"erro": "Falha simulada ao criar a assinatura", "payload": corpo})
+        elif not all(corpo.get(campo) for campo in ("usuario", "organizacao", "plano")):
+            self._json(422, {"erro": "Usuário, organização e plano são obrigatórios", "payload": corpo})
+        else:
+            with self.trava:
+                self.assinaturas.append(corpo)
+                identificador = len(self.assinaturas)
+            self._json(200, {"id": identificador, **corpo})
+
+    # Retorna a sessão do cookie 'sessao' da requisição (ou None)
+    def _sessao(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie["sessao"].value if "sessao" in cookie else None
+        with self.trava:
+            return self.sessoes.get(token)
+
+    # Responde com a lista de opções de um ng-select, após a latência da API
+    def _opcoes(self, opcoes):
+        sleep(self.configuracao.latencia_api)
+        self._json(200, opcoes)
+
+    def _arquivo(self, nome, tipo):
+        with open(os.path.join(DIRETORIO, nome), "rb") as arquivo:
+            conteudo = arquivo.read()
+        self._responder(200, conteudo, tipo)
+
+    def _json(self, status, dados, cookie=None):
+        self._responder(status, json.dumps(dados).encode("utf-8"), "application/json", cookie)
+
+    def _responder(self, status, conteudo, tipo, cookie=None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+# Função que sobe o simulador em uma thread e retorna (servidor, url)
+def iniciar(porta=0, configuracao=None):
+    manipulador = type("ManipuladorConfigurado", (Manipulador,), {
+        "configuracao": configuracao or Configuracao(), "sessoes": {}, "assinaturas": [], "trava": threading.Lock(),
+    })
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), manipulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulador local da plataforma para benchmarks da automação.")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--latencia-api", type=float, default=0.05, help="Latência das buscas e do login (s)")
+    parser.add_argument("--latencia-splash", type=float, default=0.5, help="Tempo até o splash-screen sumir (s)")
+    parser.add_argument("--latencia-assinatura", type=float, default=0.3, help="Latência de /api/subscription (s)")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração das criações de assinatura que falham (0 a 1)")
+    args = parser.parse_args()
+
+    configuracao = Configuracao(args.latencia_api, args.latencia_splash, args.latencia_assinatura, args.taxa_erro)
+    servidor, url = iniciar(args.porta, configuracao)
+    print(f"Simulador da plataforma em {url} (Ctrl+C para encerrar)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,207 @@
+"""
+================================================================================
+--- Este arquivo implementa os tempos-limite adaptativos das esperas do
+    auxiliar.py: cada localizador guarda o histórico do tempo que levou para
+    aparecer (ou desaparecer), e o tempo-limite passa a ser um percentil alto
+    desse histórico multiplicado por uma margem de segurança, em vez de 120 s.
+
+--- Estrutura principal:
+    1. Histórico de esperas (.historico/tempos.json):
+       - registrar: Guarda a duração de uma espera bem sucedida
+       - limite: Tempo-limite da espera a partir do histórico do localizador
+       - gravar_processo / mesclar: Gravam as esperas de cada worker e as juntam
+         no histórico ao final da execução
+
+    2. Sinais de falha antecipada:
+       - instalar: Registra no navegador a coleta dos erros JavaScript não tratados,
+         em cada aba na primeira vez que o navegador troca para ela
+       - verificar_sinais: Levanta FalhaAntecipada se, desde o início da espera,
+         a plataforma respondeu com HTTP 5xx (anotado pelo MonitorDeRede assim que
+         a resposta chega, rede.py) ou um script da plataforma teve um erro
+         JavaScript (os erros de scripts de terceiros são ignorados)
+       - com_sinais_de_falha: Envolve a condição de um WebDriverWait com a verificação
+
+--- Sem histórico suficiente (MIN_AMOSTRAS) a espera usa o tempo padrão de
+    120 s. O tempo-limite adaptativo nunca fica abaixo de TEMPO_MINIMO nem
+    acima do padrão.
+
+--- FalhaAntecipada herda de TimeoutException, então as esperas com novas
+    tentativas (aguardar_carregar) recarregam a página logo no primeiro sinal,
+    sem esperar o tempo-limite inteiro.
+================================================================================
+"""
+import glob
+import json
+import os
+import re
+from datetime import datetime
+from time import monotonic
+from urllib.parse import urlsplit
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.command import Command
+import metricas
+
+# Arquivo do histórico, parâmetros do tempo-limite adaptativo e intervalo da verificação de erros JavaScript
+ARQUIVO_HISTORICO = os.path.join(".historico", "tempos.json")
+TEMPO_PADRAO = 120
+TEMPO_MINIMO = 10
+PERCENTIL = 99
+FATOR_SEGURANCA = 3
+MIN_AMOSTRAS = 5
+MAX_AMOSTRAS = 50
+INTERVALO_ERROS_JS = 2.0
+
+# Requisições com 5xx que não indicam falha da plataforma (serviços de terceiros)
+IGNORAR_5XX = re.compile(r"google-analytics|googletagmanager|hotjar|clarity\.ms|sentry|segment\.io|facebook")
+
+# Origens de scripts, além da própria página, cujos erros JavaScript contam como falha da plataforma
+# (por exemplo a CDN dos bundles), separadas por vírgula
+ORIGENS_JS_DA_PLATAFORMA = tuple(filter(None, os.environ.get("ORIGENS_JS_DA_PLATAFORMA", "").split(",")))
+
+# Script instalado em cada documento que guarda os erros JavaScript não tratados da página com o script de origem
+# (o arquivo do erro, ou a primeira URL da pilha de uma promise rejeitada; vazio quando o navegador a esconde)
+# Executado também na página já aberta de uma aba nova, por isso não instala a coleta duas vezes
+SCRIPT_COLETAR_ERROS_JS = """
+if (!window.__errosJs) {
+    window.__errosJs = [];
+    const origemDaPilha = motivo => ((String(motivo && motivo.stack || "").match(/https?:\\/\\/[^\\s)]+/) || [""])[0]);
+    window.addEventListener("error", e => window.__errosJs.push([Date.now(), String(e.message || e), e.filename || ""]));
+    window.addEventListener("unhandledrejection", e => window.__errosJs.push([Date.now(), String(e.reason), origemDaPilha(e.reason)]));
+}
+"""
+
+# Script que retorna a origem da página e os erros JavaScript registrados a partir do instante informado (em ms)
+SCRIPT_ERROS_JS_DESDE = """
+return [location.origin, (window.__errosJs || []).filter(e => e[0] >= arguments[0]).map(e => [e[1], e[2]])];
+"""
+
+# Histórico carregado do disco e esperas registradas por este processo
+_historico = None
+_novas = {}
+
+# Exceção levantada quando uma espera é interrompida por um sinal de falha da plataforma
+class FalhaAntecipada(TimeoutException):
+    pass
+
+# Função que retorna o histórico de esperas, carregando-o do disco na primeira chamada
+def _carregar():
+    global _historico
+    if _historico is None:
+        try:
+            with open(ARQUIVO_HISTORICO) as arquivo:
+                _historico = json.load(arquivo)
+        except (OSError, ValueError):
+            _historico = {}
+    return _historico
+
+# Função que guarda a duração (em segundos) de uma espera bem sucedida
+def registrar(chave, duracao):
+    _novas.setdefault(chave, []).append(round(duracao, 3))
+
+# Função que calcula o tempo-limite de uma espera a partir do histórico (ou o padrão, sem histórico suficiente)
+def limite(chave, padrao=TEMPO_PADRAO):
+    amostras = _carregar().get(chave, []) + _novas.get(chave, [])
+    if len(amostras) < MIN_AMOSTRAS:
+        return padrao
+    metricas.incrementar("tempos_limite_adaptativos")
+    return min(padrao, max(TEMPO_MINIMO, metricas.percentil(amostras, PERCENTIL) * FATOR_SEGURANCA))
+
+# Função que grava as esperas registradas por este processo (uma parte por worker)
+def gravar_processo():
+    if not _novas:
+        return
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    os.makedirs(os.path.dirname(ARQUIVO_HISTORICO), exist_ok=True)
+    with open(os.path.join(os.path.dirname(ARQUIVO_HISTORICO), f"tempos_{worker}.json"), "w") as arquivo:
+        json.dump(_novas, arquivo)
+    _novas.clear()
+
+# Função que junta as partes dos workers no histórico, mantendo as últimas MAX_AMOSTRAS de cada espera
+def mesclar():
+    historico = dict(_carregar())
+    partes = glob.glob(os.path.join(os.path.dirname(ARQUIVO_HISTORICO), "tempos_*.json"))
+    for caminho in partes:
+        try:
+            with open(caminho) as arquivo:
+                for chave, amostras in json.load(arquivo).items():
+                    historico[chave] = (historico.get(chave, []) + amostras)[-MAX_AMOSTRAS:]
+        except (OSError, ValueError):
+            pass
+        os.remove(caminho)
+    if not partes:
+        return
+
+    temporario = f"{ARQUIVO_HISTORICO}.{os.getpid()}"
+    with open(temporario, "w") as arquivo:
+        json.dump(historico, arquivo, indent=1, sort_keys=True)
+    os.replace(temporario, ARQUIVO_HISTORICO)
+
+# Função que registra no navegador a coleta dos erros JavaScript de cada página aberta
+# O script do CDP vale só para a aba atual, então o command executor é envolvido para instalar a coleta também
+# na primeira troca para cada aba (por exemplo a do Backoffice, aberta por window.open); as abas já instaladas
+# ficam em driver.abas_com_coleta
+def instalar(driver):
+    executor = driver.command_executor
+    execute = executor.execute
+    driver.abas_com_coleta = set()
+
+    def instalar_na_aba(aba):
+        driver.abas_com_coleta.add(aba)
+        try:
+            execute("executeCdpCommand", {"cmd": "Page.addScriptToEvaluateOnNewDocument", "params": {"source": SCRIPT_COLETAR_ERROS_JS}})
+            execute(Command.W3C_EXECUTE_SCRIPT, {"script": SCRIPT_COLETAR_ERROS_JS, "args": []})
+        except WebDriverException:
+            # Sem a coleta a espera só perde o sinal de erro JavaScript desta aba
+            pass
+
+    def execute_com_coleta(comando, params):
+        resposta = execute(comando, params)
+        if comando == Command.SWITCH_TO_WINDOW and params["handle"] not in driver.abas_com_coleta:
+            instalar_na_aba(params["handle"])
+        return resposta
+    executor.execute = execute_com_coleta
+    instalar_na_aba(driver.current_window_handle)
+
+# Função que levanta FalhaAntecipada se houve resposta 5xx da plataforma ou erro JavaScript desde o instante informado
+# As respostas 5xx vêm do MonitorDeRede do navegador, que as anota à medida que chegam (sem varrer driver.requests)
+def verificar_sinais(driver, desde, verificar_js=True):
+    monitor = getattr(driver, "monitor_de_rede", None)
+    for instante, status, url in reversed(monitor.respostas_5xx if monitor else []):
+        if instante < desde:
+            break
+        if not IGNORAR_5XX.search(url):
+            metricas.incrementar("falhas_antecipadas")
+            raise FalhaAntecipada(f"A plataforma respondeu HTTP {status} para {url}")
+
+    if verificar_js:
+        origem, erros = driver.execute_script(SCRIPT_ERROS_JS_DESDE, desde.timestamp() * 1000)
+        for mensagem, fonte in erros:
+            if _script_da_plataforma(fonte, origem):
+                metricas.incrementar("falhas_antecipadas")
+                raise FalhaAntecipada(f"Erro JavaScript na página: {mensagem} ({fonte})")
+
+# Função que informa se o script de origem de um erro JavaScript é da plataforma: a mesma origem da página ou uma
+# de ORIGENS_JS_DA_PLATAFORMA. Erros de scripts de terceiros (analytics, chat, extensões) e sem origem conhecida
+# (o "Script error." dos scripts de outra origem) não interrompem a espera
+def _script_da_plataforma(fonte, origem):
+    if not fonte:
+        return False
+    origem_da_fonte = "{0.scheme}://{0.netloc}".format(urlsplit(fonte))
+    return origem_da_fonte == origem or origem_da_fonte in ORIGENS_JS_DA_PLATAFORMA
+
+# Função que envolve a condição de um WebDriverWait com a verificação dos sinais de falha desde o início da espera
+# (os erros JavaScript são conferidos a cada INTERVALO_ERROS_JS, para não dobrar os comandos enviados ao navegador)
+def com_sinais_de_falha(condicao):
+    desde = datetime.now()
+    proxima_verificacao_js = [monotonic() + INTERVALO_ERROS_JS]
+
+    def condicao_com_sinais(driver):
+        resultado = condicao(driver)
+        if resultado:
+            return resultado
+        verificar_js = monotonic() >= proxima_verificacao_js[0]
+        if verificar_js:
+            proxima_verificacao_js[0] = monotonic() + INTERVALO_ERROS_JS
+        verificar_sinais(driver, desde, verificar_js)
+        return resultado
+    return condicao_com_sinais
@@ -0,0 +1,107 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do modo híbrido de criação de
+    assinaturas (api_assinaturas.py), sem navegador e sem acesso à plataforma.
+
+--- Estrutura principal:
+    1. TestTrocaDeChave: Substituição dos valores derivados da chave no corpo gravado
+    2. TestBibliotecaDeModelos: Gravação e leitura dos modelos, inclusive com
+       gravações simultâneas
+    3. TestClienteDeAssinaturas: Cookies por domínio e requisição reenviada à API
+================================================================================
+"""
+from types import SimpleNamespace
+from unittest import mock
+import json
+import os
+import tempfile
+import threading
+import unittest
+import api_assinaturas
+
+# Classe de teste da troca da chave no corpo gravado de uma assinatura
+class TestTrocaDeChave(unittest.TestCase):
+    def test_valores_derivados_da_chave_sao_trocados(self):
+        corpo = {
+            "nome": "SeleniumBot123 Teste",
+            "telefone": "41999900123",
+            "preco": "123000",
+            "itens": [{"valor": 123000}, {"valor": 5}],
+            "ativo": True,
+            "plano": "Standard",
+        }
+        self.assertEqual(api_assinaturas._trocar_chave(corpo, 123, 456), {
+            "nome": "SeleniumBot456 Teste",
+            "telefone": "41999900456",
+            "preco": "456000",
+            "itens": [{"valor": 456000}, {"valor": 5}],
+            "ativo": True,
+            "plano": "Standard",
+        })
+
+    def test_valores_que_so_contem_a_chave_nao_sao_trocados(self):
+        self.assertEqual(api_assinaturas._trocar_chave(["123", "1230001", 123], 123, 456), ["123", "1230001", 123])
+
+    def test_booleano_nao_e_tratado_como_numero(self):
+        self.assertIs(api_assinaturas._trocar_chave(True, 0.001, 2), True)
+
+# Função que monta uma requisição gravada pelo selenium-wire
+def requisicao(corpo):
+    return SimpleNamespace(method="POST", url="https://plataforma/api/subscription", body=json.dumps(corpo).encode("utf-8"),
+                           headers={"Content-Type": "application/json", "Cookie": "sessao=1", "Authorization": "Bearer antigo"})
+
+# Classe de teste da biblioteca de modelos
+class TestBibliotecaDeModelos(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        for nome, arquivo in (("ARQUIVO_MODELOS", "modelos.json"), ("ARQUIVO_TRAVA", "modelos.trava")):
+            substituto = mock.patch.object(api_assinaturas, nome, os.path.join(diretorio.name, ".cache_api", arquivo))
+            substituto.start()
+            self.addCleanup(substituto.stop)
+
+    def test_modelo_gravado_e_lido_por_plano_e_asaas(self):
+        api_assinaturas.salvar_modelo("Standard", False, 12, "Acesso", requisicao({"nome": "SeleniumBot12"}))
+        modelo = api_assinaturas.carregar_modelo("Standard", False)
+        self.assertEqual(modelo["chave"], 12)
+        self.assertEqual(modelo["corpo"], '{"nome": "SeleniumBot12"}')
+        # O Cookie vem do cliente a cada envio, não do modelo
+        self.assertEqual(modelo["cabecalhos"], {"Content-Type": "application/json", "Authorization": "Bearer antigo"})
+        self.assertIsNone(api_assinaturas.carregar_modelo("Standard", True))
+
+    def test_gravacoes_simultaneas_nao_perdem_modelos(self):
+        planos = [f"Plano{indice}" for indice in range(20)]
+        threads = [threading.Thread(target=api_assinaturas.salvar_modelo, args=(plano, False, 10, "Acesso", requisicao({})))
+                   for plano in planos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(api_assinaturas.carregar_modelo(plano, False) for plano in planos))
+
+# Classe de teste do cliente HTTP do modo híbrido
+class TestClienteDeAssinaturas(unittest.TestCase):
+    def setUp(self):
+        cookies = [{"domain": ".plataforma.dev", "name": "sessao", "value": "abc"},
+                   {"domain": "outra.dev", "name": "rastreio", "value": "x"}]
+        self.cliente = api_assinaturas.ClienteDeAssinaturas(cookies, "Bearer novo")
+
+    def test_cookies_do_dominio_e_subdominios(self):
+        self.assertEqual(self.cliente._cookies_para("api.plataforma.dev"), "sessao=abc")
+        self.assertEqual(self.cliente._cookies_para("plataforma.dev"), "sessao=abc")
+        self.assertEqual(self.cliente._cookies_para("naoplataforma.dev"), "")
+
+    def test_criar_reenvia_o_modelo_com_a_nova_chave_e_credenciais(self):
+        modelo = {"metodo": "POST", "url": "https://api.plataforma.dev/subscription", "chave": 12,
+                  "cabecalhos": {"Content-Type": "application/json", "authorization": "Bearer antigo"},
+                  "corpo": '{"nome": "SeleniumBot12", "preco": 12000}'}
+        with mock.patch.object(self.cliente.http, "request", return_value=SimpleNamespace(status=200, data=b"{}")) as enviar:
+            self.assertEqual(self.cliente.criar(modelo, 34), api_assinaturas.Resposta(200, b"{}"))
+        metodo, url = enviar.call_args.args
+        self.assertEqual((metodo, url), ("POST", "https://api.plataforma.dev/subscription"))
+        self.assertEqual(json.loads(enviar.call_args.kwargs["body"]), {"nome": "SeleniumBot34", "preco": 34000})
+        self.assertEqual(enviar.call_args.kwargs["headers"],
+                         {"Content-Type": "application/json", "Cookie": "sessao=abc", "Authorization": "Bearer novo"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade da política de captura de rede
+    (captura.py), sem navegador.
+
+--- Estrutura principal:
+    1. ArmazenamentoFalso: Substitui o armazenamento em memória do selenium-wire,
+       com o mesmo buffer circular (as requisições mais antigas saem primeiro)
+    2. TestPoliticaDeCaptura: Quais URLs e corpos são guardados
+    3. TestArmazenamentoComPolitica: Truncamento e gravação dos corpos em disco,
+       limpeza das requisições que saem do buffer e dos corpos ao fechar o navegador
+================================================================================
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+import os
+import tempfile
+import unittest
+import uuid
+import captura
+
+# Classe que simula o armazenamento em memória do selenium-wire
+class ArmazenamentoFalso:
+    def __init__(self, max_requisicoes):
+        self.max_requisicoes = max_requisicoes
+        self.requisicoes = OrderedDict()
+        self.respostas = {}
+
+    def save_request(self, request):
+        request.id = str(uuid.uuid4())
+        while len(self.requisicoes) >= self.max_requisicoes:
+            self.requisicoes.popitem(last=False)
+        self.requisicoes[request.id] = request
+
+    def save_response(self, request_id, response):
+        self.respostas[request_id] = response
+
+    def clear_requests(self):
+        self.requisicoes.clear()
+
+# Classe de teste das regras de URL da política
+class TestPoliticaDeCaptura(unittest.TestCase):
+    def test_guardar_respeita_incluir_e_excluir(self):
+        politica = captura.PoliticaDeCaptura(incluir=[r"/api/"], excluir=[r"/api/health"])
+        self.assertTrue(politica.guardar("https://plataforma/api/subscription"))
+        self.assertFalse(politica.guardar("https://plataforma/api/health"))
+        self.assertFalse(politica.guardar("https://plataforma/login"))
+        self.assertTrue(captura.PoliticaDeCaptura().guardar("https://plataforma/login"))
+
+    def test_estaticos_sao_excluidos_pela_extensao(self):
+        politica = captura.PoliticaDeCaptura(excluir=captura.EXCLUIR_ESTATICOS)
+        self.assertFalse(politica.guardar("https://plataforma/main.js?v=3"))
+        self.assertFalse(politica.guardar("https://plataforma/fonte.woff2"))
+        self.assertTrue(politica.guardar("https://plataforma/api/jsonp"))
+
+# Classe de teste do armazenamento que aplica a política
+class TestArmazenamentoComPolitica(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.spool = os.path.join(diretorio.name, "spool")
+        self.montar()
+
+    def montar(self, max_requisicoes=10, diretorio_spool=None):
+        politica = captura.PoliticaDeCaptura(excluir=captura.EXCLUIR_ESTATICOS, corpos=[r"subscription"], max_corpo_bytes=4,
+                                             max_requisicoes=max_requisicoes, diretorio_spool=diretorio_spool)
+        self.original = ArmazenamentoFalso(max_requisicoes)
+        self.armazenamento = captura.ArmazenamentoComPolitica(self.original, politica)
+
+    # Simula o selenium-wire salvando uma requisição e, se houver, sua resposta
+    def trafegar(self, url, corpo_requisicao=b"", corpo_resposta=None):
+        request = SimpleNamespace(url=url, body=corpo_requisicao)
+        self.armazenamento.save_request(request)
+        response = None
+        if corpo_resposta is not None:
+            response = SimpleNamespace(body=corpo_resposta)
+            self.armazenamento.save_response(request.id, response)
+        return request, response
+
+    def test_recursos_estaticos_nao_sao_guardados(self):
+        request, _ = self.trafegar("https://plataforma/main.js?v=3", corpo_resposta=b"codigo")
+        self.assertEqual(self.original.requisicoes, {})
+        self.assertEqual(self.original.respostas, {})
+        # O id permite que a resposta ainda passe pelos interceptadores do rede.py
+        self.assertTrue(request.id)
+        self.assertEqual(self.armazenamento.coletar_resumo(),
+                         {"capturadas": 0, "descartadas": 1, "bytes_capturados": 0, "bytes_descartados": 6})
+
+    def test_corpo_fora_da_politica_e_descartado(self):
+        request, response = self.trafegar("https://plataforma/api/users", b"filtro", b"usuarios")
+        self.assertIn(request.id, self.original.requisicoes)
+        self.assertEqual(request.body, b"")
+        self.assertEqual(response.body, b"")
+
+    def test_corpo_guardado_e_truncado(self):
+        request, response = self.trafegar("https://plataforma/api/subscription", b"plano", b"criada")
+        self.assertEqual(request.body, b"plan")
+        self.assertEqual(response.body, b"cria")
+        self.assertIs(self.original.respostas[request.id], response)
+        self.assertEqual(self.armazenamento.coletar_resumo(),
+                         {"capturadas": 1, "descartadas": 0, "bytes_capturados": 8, "bytes_descartados": 3})
+
+    def test_corpo_inteiro_fica_em_disco(self):
+        self.montar(diretorio_spool=self.spool)
+        request, response = self.trafegar("https://plataforma/api/subscription", b"plano", b"criada")
+        with open(response.arquivo_corpo, "rb") as arquivo:
+            self.assertEqual(arquivo.read(), b"criada")
+        with open(request.arquivo_corpo, "rb") as arquivo:
+            self.assertEqual(arquivo.read(), b"plano")
+
+    def test_requisicao_sem_resposta_sai_junto_com_o_buffer(self):
+        self.montar(max_requisicoes=2, diretorio_spool=self.spool)
+        abortada, _ = self.trafegar("https://plataforma/api/subscription", b"plano")
+        for _ in range(2):
+            self.trafegar("https://plataforma/api/users")
+        self.assertEqual(len(self.armazenamento._guardadas), 2)
+        self.assertFalse(os.path.exists(abortada.arquivo_corpo))
+
+        # Uma resposta atrasada da requisição que saiu do buffer é descartada
+        self.armazenamento.save_response(abortada.id, SimpleNamespace(body=b"tarde"))
+        self.assertNotIn(abortada.id, self.original.respostas)
+
+    def test_limpar_requisicoes_e_fechar_o_navegador_apagam_o_disco(self):
+        self.montar(diretorio_spool=self.spool)
+        _, response = self.trafegar("https://plataforma/api/subscription", b"plano", b"criada")
+        self.armazenamento.clear_requests()
+        self.assertEqual(os.listdir(self.spool), [])
+        self.assertEqual(self.original.requisicoes, {})
+
+        driver = SimpleNamespace(backend=SimpleNamespace(storage=ArmazenamentoFalso(10)), quit=lambda: None)
+        captura.aplicar(driver, captura.PoliticaDeCaptura(corpos=[r"subscription"], diretorio_spool=self.spool))
+        self.armazenamento = driver.backend.storage
+        self.trafegar("https://plataforma/api/subscription", b"plano", b"criada")
+        self.assertEqual(len(os.listdir(self.spool)), 2)
+        driver.quit()
+        self.assertEqual(os.listdir(self.spool), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do modo de carga (Carga.py),
+    sem navegador.
+
+--- Estrutura principal:
+    1. TestAgendaDeCarga: Instantes de entrada dos usuários virtuais
+    2. TestCriacao: Latência de cada criação a partir do envio real da requisição
+       e limpeza da expectativa quando o fluxo falha
+================================================================================
+"""
+from datetime import datetime
+import unittest
+from selenium.common.exceptions import TimeoutException
+import Carga
+from test_rede import NavegadorFalso, trafegar
+
+# Classe que simula o BackofficeCriarAssinatura: envia a requisição de assinatura e recebe a resposta
+class CriacaoFalsa:
+    def __init__(self, driver, atraso=0.4, status=200, falha=None):
+        self.driver = driver
+        self.atraso = atraso
+        self.status = status
+        self.falha = falha
+
+    def criar_assinatura_usuario_existente(self, plano, com_asaas):
+        if self.falha:
+            raise self.falha
+        trafegar(self.driver, "https://plataforma/api/subscription", envio=datetime(2026, 1, 1, 12, 0, 0), status=self.status)(self.atraso)
+
+# Classe de teste da agenda de entrada dos usuários virtuais
+class TestAgendaDeCarga(unittest.TestCase):
+    def test_agenda_linear(self):
+        self.assertEqual(Carga.agenda_linear(4, 60), [0, 15, 30, 45])
+
+    def test_agenda_por_degraus(self):
+        self.assertEqual(Carga.agenda_por_degraus("0:2,30:5,60:6"), [0.0, 0.0, 30.0, 30.0, 30.0, 60.0])
+
+    def test_degrau_sem_usuarios_novos_nao_acrescenta_entradas(self):
+        self.assertEqual(Carga.agenda_por_degraus("0:2,30:2,60:3"), [0.0, 0.0, 60.0])
+
+# Classe de teste da criação de uma assinatura pelo usuário virtual
+class TestCriacao(unittest.TestCase):
+    def setUp(self):
+        self.driver = NavegadorFalso()
+        self.carga = Carga.TesteDeCarga("https://plataforma/", [0], 60, ["Standard"])
+
+    def test_latencia_vai_do_envio_ate_a_resposta(self):
+        status, latencia, erro = self.carga.criar(self.driver, CriacaoFalsa(self.driver, atraso=0.4), "Standard")
+        self.assertEqual((status, latencia, erro), (200, 0.4, None))
+
+    def test_resposta_com_erro_mantem_a_latencia(self):
+        self.assertEqual(self.carga.criar(self.driver, CriacaoFalsa(self.driver, status=500), "Standard"), (500, 0.4, "HTTP 500"))
+
+    def test_falha_no_fluxo_remove_a_expectativa(self):
+        with self.assertRaises(TimeoutException):
+            self.carga.criar(self.driver, CriacaoFalsa(self.driver, falha=TimeoutException("formulário")), "Standard")
+        self.assertEqual(self.driver.monitor_de_rede.ouvintes, [])
+
+if __name__ == "__main__":
+    unittest.main()
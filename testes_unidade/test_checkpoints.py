@@ -0,0 +1,151 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade dos checkpoints de fluxo
+    (checkpoints.py), com etapas falsas no lugar das ações do Pages.py.
+
+--- Estrutura principal:
+    1. EtapaFalsa: Ação que falha nas primeiras chamadas e conta as execuções,
+       com o checkpoint que ela alcança
+    2. TestRetomada: Retomada do checkpoint válido mais próximo e limite de retomadas
+    3. TestEtapaIrreversivel: O envio não é refeito depois que a requisição saiu
+       do navegador (ExpectativaDeRequisicao.enviada, rede.py)
+================================================================================
+"""
+from datetime import datetime
+from unittest import mock
+import unittest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import checkpoints
+import metricas
+import rede
+from test_rede import NavegadorFalso, trafegar
+
+# Classe que simula a ação de uma etapa: falha nas primeiras 'falhas' chamadas e marca o checkpoint ao terminar
+class EtapaFalsa:
+    def __init__(self, nome, falhas=0):
+        self.nome = nome
+        self.falhas = falhas
+        self.chamadas = 0
+        self.alcancado = False
+
+    def __call__(self):
+        self.chamadas += 1
+        if self.chamadas <= self.falhas:
+            raise TimeoutException(f"{self.nome} falhou")
+        self.alcancado = True
+        return self.nome
+
+    def valido(self):
+        return self.alcancado
+
+# Função que monta um fluxo com as etapas falsas, depois do checkpoint "logado" alcançado no setUp
+def montar_fluxo(*etapas, max_retomadas=checkpoints.MAX_RETOMADAS_PADRAO):
+    fluxo = checkpoints.FluxoComCheckpoints("Fluxo de teste", max_retomadas).checkpoint_alcancado("logado", lambda: True, 5.0)
+    for etapa in etapas:
+        fluxo.etapa(etapa.nome, etapa, etapa.valido)
+    return fluxo
+
+# Classe de teste da retomada a partir dos checkpoints
+class TestRetomada(unittest.TestCase):
+    def setUp(self):
+        substituto = mock.patch.object(metricas, "_metricas_teste", {})
+        substituto.start()
+        self.addCleanup(substituto.stop)
+
+    def test_fluxo_sem_falhas_executa_cada_etapa_uma_vez(self):
+        etapas = [EtapaFalsa("backoffice"), EtapaFalsa("formulario")]
+        self.assertEqual(montar_fluxo(*etapas).executar(), "formulario")
+        self.assertEqual([etapa.chamadas for etapa in etapas], [1, 1])
+
+    def test_retoma_do_checkpoint_valido_mais_proximo(self):
+        backoffice, parcial, preenchido = EtapaFalsa("backoffice"), EtapaFalsa("parcial"), EtapaFalsa("preenchido", falhas=1)
+        fluxo = montar_fluxo(backoffice, parcial, preenchido)
+        fluxo.executar()
+        self.assertEqual([backoffice.chamadas, parcial.chamadas, preenchido.chamadas], [1, 1, 2])
+        self.assertEqual([(falha, checkpoint) for falha, checkpoint, _ in fluxo.retomadas], [("preenchido", "parcial")])
+        self.assertEqual(metricas.coletar()["retomadas"], 1)
+
+    def test_checkpoint_invalido_volta_mais_uma_etapa(self):
+        backoffice, parcial = EtapaFalsa("backoffice"), EtapaFalsa("parcial")
+        preenchido = EtapaFalsa("preenchido", falhas=1)
+        # A falha também desfez o formulário parcial (por exemplo, a página recarregou)
+        preenchido_original = preenchido.__call__
+        def preencher():
+            if preenchido.chamadas == 0:
+                parcial.alcancado = False
+            return preenchido_original()
+        fluxo = montar_fluxo(backoffice, parcial).etapa("preenchido", preencher, preenchido.valido)
+        fluxo.executar()
+        self.assertEqual([backoffice.chamadas, parcial.chamadas, preenchido.chamadas], [1, 2, 2])
+        checkpoint, economia = fluxo.retomadas[0][1:]
+        self.assertEqual(checkpoint, "backoffice")
+        # O tempo economizado inclui o login do setUp
+        self.assertGreaterEqual(economia, 5.0)
+
+    def test_falha_com_o_proprio_checkpoint_valido_conta_como_concluida(self):
+        envio = EtapaFalsa("envio")
+        def enviar():
+            envio.alcancado = True
+            raise WebDriverException("a resposta demorou, mas o checkpoint foi alcançado")
+        fluxo = montar_fluxo().etapa("envio", enviar, envio.valido)
+        fluxo.executar()
+        self.assertEqual(fluxo.retomadas, [])
+
+    def test_limite_de_retomadas(self):
+        backoffice, sempre_falha = EtapaFalsa("backoffice"), EtapaFalsa("formulario", falhas=99)
+        fluxo = montar_fluxo(backoffice, sempre_falha, max_retomadas=2)
+        with self.assertRaisesRegex(TimeoutException, "formulario falhou"):
+            fluxo.executar()
+        self.assertEqual(sempre_falha.chamadas, 3)
+        self.assertEqual(len(fluxo.retomadas), 2)
+
+    def test_sem_checkpoint_valido_relanca_o_erro(self):
+        fluxo = checkpoints.FluxoComCheckpoints("Fluxo de teste").checkpoint_alcancado("logado", lambda: False, 5.0)
+        formulario = EtapaFalsa("formulario", falhas=1)
+        fluxo.etapa("formulario", formulario, formulario.valido)
+        with self.assertRaises(TimeoutException):
+            fluxo.executar()
+        self.assertEqual(formulario.chamadas, 1)
+
+# Classe de teste da etapa de envio, que não pode ser refeita
+class TestEtapaIrreversivel(unittest.TestCase):
+    def setUp(self):
+        substituto = mock.patch.object(metricas, "_metricas_teste", {})
+        substituto.start()
+        self.addCleanup(substituto.stop)
+        self.driver = NavegadorFalso()
+        self.expectativa = rede.MonitorDeRede.para(self.driver).esperar("subscription", metodo="POST")
+
+    # Monta o fluxo com o envio, que falha depois (ou antes) de a requisição sair do navegador
+    def montar(self, requisicao_sai):
+        self.envios = 0
+
+        def concluir():
+            self.envios += 1
+            if requisicao_sai and self.envios == 1:
+                trafegar(self.driver, "https://plataforma/api/subscription")
+            if self.envios == 1:
+                raise TimeoutException("o botão de concluir não respondeu")
+        preenchido = EtapaFalsa("preenchido")
+        return (montar_fluxo(preenchido)
+                .etapa("enviado", concluir, self.expectativa.resolvida.is_set, self.expectativa.enviada))
+
+    def test_envio_nao_e_refeito_depois_que_a_requisicao_saiu(self):
+        fluxo = self.montar(requisicao_sai=True)
+        with self.assertRaises(TimeoutException):
+            fluxo.executar()
+        self.assertEqual(self.envios, 1)
+        self.assertEqual(fluxo.retomadas, [])
+
+    def test_envio_que_nao_saiu_do_navegador_e_retomado(self):
+        fluxo = self.montar(requisicao_sai=False)
+        fluxo.executar()
+        self.assertEqual(self.envios, 2)
+        self.assertEqual([(falha, checkpoint) for falha, checkpoint, _ in fluxo.retomadas], [("enviado", "preenchido")])
+
+    def test_requisicao_anterior_a_expectativa_nao_conta_como_envio(self):
+        trafegar(self.driver, "https://plataforma/api/subscription", envio=datetime(2020, 1, 1))
+        self.assertFalse(self.expectativa.enviada())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do perfil de comandos WebDriver
+    (comandos.py), sem navegador.
+
+--- Estrutura principal:
+    1. TestOrcamentoDeclarado: O decorador orcamento falha o teste que passa do
+       orçamento declarado
+    2. TestOrcamentoMedido: O orçamento medido só avisa e só aprende com execuções
+       aprovadas e dentro do orçamento
+
+--- Os comandos WebDriver são simulados registrando-os direto no perfil, como
+    faria o command executor envolvido por comandos.instalar.
+================================================================================
+"""
+from unittest import mock
+import unittest
+import comandos
+
+# Função que simula o envio de comandos WebDriver pelo navegador do teste
+def enviar_comandos(quantidade, segundos=0.01):
+    for _ in range(quantidade):
+        comandos._registrar("test_comandos", "findElement", segundos)
+
+# Função que isola o histórico, os perfis medidos e o perfil do teste de outras execuções
+def isolar_perfil(teste):
+    for nome, valor in (("_historico", {}), ("_novos", {}), ("_caminho", None)):
+        substituto = mock.patch.object(comandos, nome, valor)
+        substituto.start()
+        teste.addCleanup(substituto.stop)
+    teste.addCleanup(comandos.coletar)
+
+# Classe de teste do orçamento declarado com o decorador orcamento
+class TestOrcamentoDeclarado(unittest.TestCase):
+    def setUp(self):
+        isolar_perfil(self)
+
+    def test_orcamento_excedido_falha_o_teste(self):
+        @comandos.orcamento(comandos=2)
+        def corpo(teste):
+            enviar_comandos(3)
+
+        with self.assertRaisesRegex(AssertionError, r"Orçamento excedido: 3 comandos WebDriver \(orçamento de 2\)"):
+            corpo(self)
+
+    def test_orcamento_de_segundos_excedido_falha_o_teste(self):
+        @comandos.orcamento(segundos=0.5)
+        def corpo(teste):
+            enviar_comandos(1, segundos=0.75)
+
+        with self.assertRaisesRegex(AssertionError, r"0.75 segundos em comandos WebDriver"):
+            corpo(self)
+
+    def test_orcamento_respeitado_nao_falha(self):
+        @comandos.orcamento(comandos=3, segundos=1)
+        def corpo(teste):
+            enviar_comandos(3)
+            return "ok"
+
+        self.assertEqual(corpo(self), "ok")
+
+    def test_orcamento_sem_valores_e_recusado(self):
+        with self.assertRaises(ValueError):
+            comandos.orcamento()
+
+# Classe de teste do orçamento medido, apenas informativo
+class TestOrcamentoMedido(unittest.TestCase):
+    def setUp(self):
+        isolar_perfil(self)
+
+    # Simula um teste que envia a quantidade de comandos informada e devolve o aviso do orçamento medido
+    def executar(self, quantidade, aprovado=True):
+        enviar_comandos(quantidade, segundos=0)
+        return comandos.comparar_com_medido("TestSuit.py::TestLogin::test_a", comandos.coletar(), aprovado)
+
+    def test_sem_historico_suficiente_nao_avisa(self):
+        for _ in range(comandos.MIN_AMOSTRAS):
+            self.assertIsNone(self.executar(1000))
+        self.assertEqual(len(comandos._novos["TestSuit.py::TestLogin::test_a"]), comandos.MIN_AMOSTRAS)
+
+    def test_acima_do_orcamento_medido_avisa_sem_entrar_no_historico(self):
+        for _ in range(comandos.MIN_AMOSTRAS):
+            self.executar(10)
+        # Orçamento medido: p95 de 10 comandos × FATOR_ORCAMENTO
+        self.assertEqual(self.executar(16), "Acima do orçamento medido: 16 comandos WebDriver (orçamento de 15)")
+        self.assertEqual(len(comandos._novos["TestSuit.py::TestLogin::test_a"]), comandos.MIN_AMOSTRAS)
+        self.assertIsNone(self.executar(15))
+        self.assertEqual(len(comandos._novos["TestSuit.py::TestLogin::test_a"]), comandos.MIN_AMOSTRAS + 1)
+
+    def test_teste_com_falha_nao_entra_no_historico(self):
+        self.executar(10, aprovado=False)
+        self.assertEqual(comandos._novos, {})
+
+    def test_caminho_marcado_tem_historico_proprio_so_no_teste_atual(self):
+        comandos.marcar_caminho("api")
+        self.executar(2)
+        self.executar(20)
+        self.assertEqual(comandos._novos, {"TestSuit.py::TestLogin::test_a|api": [[2, 0]],
+                                           "TestSuit.py::TestLogin::test_a": [[20, 0]]})
+
+if __name__ == "__main__":
+    unittest.main()
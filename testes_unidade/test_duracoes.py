@@ -0,0 +1,64 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do histórico de durações
+    (duracoes.py), sem navegador.
+
+--- Estrutura principal:
+    1. TestEstimativas: Duração estimada de cada teste a partir do histórico
+    2. TestMakespanPrevisto: Distribuição "mais longo primeiro" entre os workers
+    3. TestHistorico: Gravação das durações de uma execução no histórico
+================================================================================
+"""
+import os
+import tempfile
+import unittest
+import duracoes
+
+# Classe de teste das estimativas de duração
+class TestEstimativas(unittest.TestCase):
+    def test_estimativa_e_a_mediana_do_historico(self):
+        estimativas = duracoes.estimativas({"a": [10, 30, 20], "b": [4]}, ["a", "b"])
+        self.assertEqual(estimativas, {"a": 20, "b": 4})
+
+    def test_teste_sem_historico_recebe_a_mediana_dos_conhecidos(self):
+        estimativas = duracoes.estimativas({"a": [10], "b": [20], "c": [60]}, ["a", "b", "c", "novo"])
+        self.assertEqual(estimativas["novo"], 20)
+
+    def test_primeira_execucao_usa_a_duracao_padrao(self):
+        self.assertEqual(duracoes.estimativas({}, ["a", "b"]), {"a": duracoes.DURACAO_PADRAO, "b": duracoes.DURACAO_PADRAO})
+
+# Classe de teste do makespan previsto
+class TestMakespanPrevisto(unittest.TestCase):
+    def test_distribui_o_mais_longo_primeiro(self):
+        # Cargas dos dois workers: 5 | 4 -> 5 | 7 -> 8 | 7 -> 8 | 10
+        estimativas = {"a": 3, "b": 5, "c": 3, "d": 4, "e": 3}
+        self.assertEqual(duracoes.makespan_previsto(estimativas, 2), 10)
+
+    def test_um_worker_soma_tudo_e_sobrando_workers_vale_o_mais_longo(self):
+        estimativas = {"a": 3, "b": 5, "c": 3, "d": 4, "e": 3}
+        self.assertEqual(duracoes.makespan_previsto(estimativas, 1), 18)
+        self.assertEqual(duracoes.makespan_previsto(estimativas, 8), 5)
+
+# Classe de teste da gravação do histórico
+class TestHistorico(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.arquivo = os.path.join(diretorio.name, ".historico", "duracoes.json")
+
+    def test_guarda_as_ultimas_amostras_de_cada_teste(self):
+        for duracao in range(duracoes.MAX_AMOSTRAS + 2):
+            duracoes.gravar_execucao({"a": duracao, "b": 1.23456}, self.arquivo)
+        historico = duracoes.carregar(self.arquivo)
+        self.assertEqual(historico["a"], list(range(2, duracoes.MAX_AMOSTRAS + 2)))
+        self.assertEqual(historico["b"][-1], 1.235)
+
+    def test_historico_ausente_ou_corrompido_fica_vazio(self):
+        self.assertEqual(duracoes.carregar(self.arquivo), {})
+        os.makedirs(os.path.dirname(self.arquivo))
+        with open(self.arquivo, "w") as arquivo:
+            arquivo.write("{corrompido")
+        self.assertEqual(duracoes.carregar(self.arquivo), {})
+
+if __name__ == "__main__":
+    unittest.main()
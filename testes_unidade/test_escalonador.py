@@ -0,0 +1,85 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do escalonador "mais longo
+    primeiro" do pytest-xdist (escalonador.py), sem navegador e sem workers.
+
+--- Estrutura principal:
+    1. WorkerFalso / ConfigFalsa: Substituem os workers e a configuração do
+       pytest-xdist, guardando os testes que cada worker recebe
+    2. TestEscalonador: Ordem da distribuição inicial e entrega ao worker livre
+================================================================================
+"""
+from types import SimpleNamespace
+from unittest import mock
+import unittest
+import duracoes
+import escalonador
+
+# Classe que simula um worker do pytest-xdist, guardando os testes recebidos
+class WorkerFalso:
+    def __init__(self, nome):
+        self.gateway = SimpleNamespace(id=nome)
+        self.recebidos = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.recebidos.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+# Classe que simula a configuração do pytest com a quantidade de workers informada
+class ConfigFalsa:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, nome):
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, nome):
+        return None
+
+# Classe de teste do escalonador "mais longo primeiro"
+class TestEscalonador(unittest.TestCase):
+    # Monta o escalonador com dois workers que já coletaram os testes
+    def setUp(self):
+        self.montar(["a", "b", "c", "d", "e"])
+
+    def montar(self, colecao):
+        historico = {"a": [1], "b": [10], "c": [5], "d": [3], "e": [7]}
+        with mock.patch.object(duracoes, "carregar", return_value=historico):
+            self.escalonador = escalonador.EscalonadorMaisLongoPrimeiro(ConfigFalsa(2), log=mock.MagicMock())
+        self.colecao = colecao
+        self.workers = [WorkerFalso("gw0"), WorkerFalso("gw1")]
+        for worker in self.workers:
+            self.escalonador.add_node(worker)
+            self.escalonador.add_node_collection(worker, colecao)
+
+    def nomes(self, worker):
+        return [self.colecao[indice] for indice in worker.recebidos]
+
+    def test_distribuicao_inicial_entrega_os_mais_longos_a_workers_diferentes(self):
+        self.escalonador.schedule()
+        self.assertEqual(self.nomes(self.workers[0]), ["b", "c"])
+        self.assertEqual(self.nomes(self.workers[1]), ["e", "d"])
+        self.assertEqual([self.colecao[indice] for indice in self.escalonador.pending], ["a"])
+
+    def test_proximo_teste_vai_para_o_worker_que_fica_livre(self):
+        self.escalonador.schedule()
+        self.escalonador.mark_test_complete(self.workers[1], self.colecao.index("e"))
+        self.assertEqual(self.nomes(self.workers[1]), ["e", "d", "a"])
+        self.assertEqual(self.nomes(self.workers[0]), ["b", "c"])
+
+        # Sem testes pendentes, o próximo worker que termina um teste é encerrado
+        self.escalonador.mark_test_complete(self.workers[0], self.colecao.index("b"))
+        self.assertTrue(self.workers[0].shutting_down)
+        self.assertFalse(self.workers[1].shutting_down)
+
+    def test_teste_sem_historico_entra_pela_mediana(self):
+        self.montar(["a", "b", "c", "d", "e", "novo"])
+        self.escalonador.schedule()
+        # Mediana de [1, 10, 5, 3, 7] = 5, empatado com "c" e entregue depois dele (ordenação estável)
+        self.assertEqual(self.nomes(self.workers[0]) + self.nomes(self.workers[1]), ["b", "c", "e", "novo"])
+
+if __name__ == "__main__":
+    unittest.main()
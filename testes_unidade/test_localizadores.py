@@ -0,0 +1,111 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do registro de localizadores
+    (localizadores.py), com um navegador falso que só conhece alguns seletores.
+
+--- Estrutura principal:
+    1. NavegadorFalso / ElementoFalso: Respondem find_elements por estratégia
+       e contam as buscas
+    2. TestLocalizador: Ordem das estratégias, estratégia preferida, visibilidade
+       e telemetria de latência
+    3. TestRegistro: Consistência dos localizadores cadastrados
+================================================================================
+"""
+import unittest
+from unittest import mock
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+import localizadores
+import metricas
+
+ANCORADA = (By.ID, "username")
+ABSOLUTA = (By.XPATH, "/html/body/div/form/input")
+
+# Classe que simula um elemento da página
+class ElementoFalso:
+    def __init__(self, visivel=True, obsoleto=False):
+        self.visivel = visivel
+        self.obsoleto = obsoleto
+
+    def is_displayed(self):
+        if self.obsoleto:
+            raise StaleElementReferenceException("elemento removido da página")
+        return self.visivel
+
+# Classe que simula o navegador: cada estratégia encontra os elementos informados e as buscas ficam registradas
+class NavegadorFalso:
+    def __init__(self, elementos):
+        self.elementos = elementos
+        self.buscas = []
+
+    def find_elements(self, by, valor):
+        self.buscas.append((by, valor))
+        return self.elementos.get((by, valor), [])
+
+# Classe de teste da busca por estratégias
+class TestLocalizador(unittest.TestCase):
+    def setUp(self):
+        self.localizador = localizadores.Localizador("login.usuario", [ANCORADA, ABSOLUTA])
+
+    def test_estrategia_ancorada_e_tentada_primeiro(self):
+        elemento = ElementoFalso()
+        driver = NavegadorFalso({ANCORADA: [elemento], ABSOLUTA: [ElementoFalso()]})
+        self.assertIs(self.localizador.encontrar(driver), elemento)
+        self.assertEqual(driver.buscas, [ANCORADA])
+
+    def test_estrategia_que_funcionou_passa_a_ser_a_primeira(self):
+        elemento = ElementoFalso()
+        driver = NavegadorFalso({ABSOLUTA: [elemento]})
+        self.assertIs(self.localizador.encontrar(driver), elemento)
+        self.assertEqual(driver.buscas, [ANCORADA, ABSOLUTA])
+
+        driver.buscas.clear()
+        self.localizador.encontrar(driver)
+        self.assertEqual(driver.buscas, [ABSOLUTA])
+
+    def test_sem_elemento_retorna_false_e_lista_vazia(self):
+        driver = NavegadorFalso({})
+        self.assertIs(self.localizador.encontrar(driver), False)
+        self.assertEqual(self.localizador.encontrar_todos(driver), [])
+
+    def test_visivel_ignora_os_elementos_escondidos(self):
+        visivel = ElementoFalso()
+        driver = NavegadorFalso({ANCORADA: [ElementoFalso(visivel=False), visivel]})
+        self.assertIs(self.localizador.visivel(driver), visivel)
+        self.assertFalse(self.localizador.invisivel(driver))
+
+    def test_elemento_escondido_ou_ausente_conta_como_invisivel(self):
+        self.assertTrue(self.localizador.invisivel(NavegadorFalso({ANCORADA: [ElementoFalso(visivel=False)]})))
+        self.assertTrue(self.localizador.invisivel(NavegadorFalso({})))
+        self.assertIs(self.localizador.visivel(NavegadorFalso({})), False)
+
+    def test_elemento_obsoleto_nao_interrompe_a_espera(self):
+        driver = NavegadorFalso({ANCORADA: [ElementoFalso(obsoleto=True)]})
+        self.assertIs(self.localizador.visivel(driver), False)
+        self.assertTrue(self.localizador.invisivel(driver))
+
+    def test_latencia_vai_para_as_metricas_com_o_nome_do_elemento(self):
+        with mock.patch.object(metricas, "amostrar") as amostrar:
+            self.localizador.registrar_latencia(0.25)
+        amostrar.assert_called_once_with("localizador:login.usuario", 0.25)
+
+# Classe de teste dos localizadores cadastrados
+class TestRegistro(unittest.TestCase):
+    def test_obter_retorna_o_localizador_cadastrado(self):
+        self.assertEqual(localizadores.obter("login.usuario").estrategias, [ANCORADA])
+
+    def test_xpath_absoluto_so_aparece_como_ultima_estrategia(self):
+        for nome, localizador in localizadores.REGISTRO.items():
+            with self.subTest(nome):
+                absolutas = [indice for indice, (_, valor) in enumerate(localizador.estrategias) if valor.startswith("/html")]
+                self.assertIn(absolutas, ([], [len(localizador.estrategias) - 1]))
+                if absolutas:
+                    self.assertGreater(len(localizador.estrategias), 1, "o XPath absoluto precisa de uma estratégia ancorada antes")
+
+    def test_estrategias_nao_se_repetem(self):
+        for nome, localizador in localizadores.REGISTRO.items():
+            with self.subTest(nome):
+                self.assertEqual(len(set(localizador.estrategias)), len(localizador.estrategias))
+
+if __name__ == "__main__":
+    unittest.main()
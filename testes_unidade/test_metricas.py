@@ -0,0 +1,88 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade das métricas (metricas.py) e da
+    instrumentação por etapas (instrumentacao.py), sem navegador.
+
+--- Estrutura principal:
+    1. TestPercentil: Percentil interpolado das amostras
+    2. TestMetricas: Métricas do teste e soma na execução
+    3. TestSpans: Aninhamento dos spans, origem dos comandos e resumo por etapa
+================================================================================
+"""
+from unittest import mock
+import os
+import tempfile
+import unittest
+import instrumentacao
+import metricas
+
+# Classe de teste do percentil interpolado das métricas
+class TestPercentil(unittest.TestCase):
+    def test_percentil_interpolado(self):
+        self.assertEqual(metricas.percentil([4, 1, 3, 2], 50), 2.5)
+        self.assertAlmostEqual(metricas.percentil(range(1, 101), 95), 95.05)
+
+    def test_extremos(self):
+        self.assertEqual(metricas.percentil([4, 1, 3, 2], 0), 1)
+        self.assertEqual(metricas.percentil([4, 1, 3, 2], 100), 4)
+        self.assertEqual(metricas.percentil([7], 95), 7)
+
+    def test_sem_valores(self):
+        self.assertEqual(metricas.percentil([], 95), 0.0)
+
+# Classe de teste das métricas do teste e da execução
+class TestMetricas(unittest.TestCase):
+    def setUp(self):
+        for nome in ("_metricas_teste", "_metricas_execucao", "_amostras_execucao"):
+            substituto = mock.patch.object(metricas, nome, {})
+            substituto.start()
+            self.addCleanup(substituto.stop)
+
+    def test_coletar_devolve_e_zera_as_metricas_do_teste(self):
+        metricas.incrementar("logins_evitados")
+        metricas.incrementar("logins_evitados", 2)
+        metricas.registrar("no_da_grade", "local")
+        metricas.amostrar("latencia", 0.5)
+        self.assertEqual(metricas.coletar(), {"logins_evitados": 3, "no_da_grade": "local", "latencia": [0.5]})
+        self.assertEqual(metricas.coletar(), {})
+
+    def test_acumular_soma_numeros_e_junta_amostras(self):
+        metricas.acumular({"logins_evitados": 1, "latencia": [0.5], "no_da_grade": "local"})
+        metricas.acumular({"logins_evitados": 2, "latencia": [0.7]})
+        self.assertEqual(metricas.totais(), {"logins_evitados": 3})
+        self.assertEqual(metricas.amostras(), {"latencia": [0.5, 0.7]})
+
+# Classe de teste dos spans de um teste
+class TestSpans(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        substituto = mock.patch.object(instrumentacao, "DIRETORIO", diretorio.name)
+        substituto.start()
+        self.addCleanup(substituto.stop)
+        self.diretorio = diretorio.name
+
+    def test_spans_aninhados_no_teste(self):
+        instrumentacao.iniciar_teste("TestSuit.py::test_a")
+        with instrumentacao.span("Pages.LoginPage.preencher_usuario"):
+            with instrumentacao.span("auxiliar.find_element"):
+                self.assertEqual(instrumentacao.origem_atual(), "Pages.LoginPage.preencher_usuario > auxiliar.find_element")
+        spans = {registro["nome"]: registro for registro in instrumentacao.finalizar_teste()}
+        self.assertEqual(spans["auxiliar.find_element"]["pai"], spans["Pages.LoginPage.preencher_usuario"]["id"])
+        self.assertEqual(spans["Pages.LoginPage.preencher_usuario"]["pai"], spans["teste"]["id"])
+        self.assertEqual(spans["auxiliar.find_element"]["profundidade"], 2)
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio, f"spans_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}.jsonl")))
+
+    def test_fora_de_um_teste_nada_e_registrado(self):
+        with instrumentacao.span("auxiliar.find_element"):
+            self.assertEqual(instrumentacao.origem_atual(), "teste")
+        self.assertEqual(instrumentacao.finalizar_teste(), [])
+
+    def test_resumo_por_etapa_ignora_a_raiz_e_ordena_pelo_p95(self):
+        spans = [{"pai": None, "nome": "teste", "duracao": 9},
+                 {"pai": 1, "nome": "rapida", "duracao": 0.1}, {"pai": 1, "nome": "lenta", "duracao": 2},
+                 {"pai": 1, "nome": "lenta", "duracao": 4}]
+        self.assertEqual(instrumentacao.resumo_por_etapa(spans), [("lenta", 2, 3.0, 3.9), ("rapida", 1, 0.1, 0.1)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do rastro de rede (rastro.py),
+    sem navegador: o tráfego é simulado pelo monitor de rede do test_rede.py.
+
+--- Estrutura principal:
+    1. TestGravadorDeRastro: Entradas HAR com o envio real, credenciais
+       mascaradas, corpos de texto e conversão para o HAR completo
+================================================================================
+"""
+from datetime import datetime
+from unittest import mock
+import os
+import tempfile
+import unittest
+from seleniumwire.request import Request, Response
+import rastro
+import rede
+from test_rede import NavegadorFalso, trafegar
+
+# Classe de teste da gravação do rastro de rede de um teste
+class TestGravadorDeRastro(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        substituto = mock.patch.object(rastro, "DIRETORIO_RASTROS", diretorio.name)
+        substituto.start()
+        self.addCleanup(substituto.stop)
+        self.addCleanup(rastro.coletar)
+        self.driver = NavegadorFalso()
+        self.gravador = rastro.GravadorDeRastro.iniciar(self.driver, "TestSuit.py::TestLogin::test_a")
+
+    # Finaliza a gravação e devolve as entradas do HAR completo
+    def entradas(self):
+        self.gravador.finalizar()
+        caminho = rastro.coletar()
+        self.assertEqual(caminho, self.gravador.caminho)
+        return rastro.para_har(caminho)["log"]["entries"]
+
+    def test_entrada_comeca_no_envio_e_dura_ate_a_resposta(self):
+        envio = datetime(2026, 1, 1, 12, 0, 0)
+        trafegar(self.driver, "https://plataforma/api/subscription?org=1", envio=envio, corpo=b'{"ok": true}')(atraso=0.35)
+        entrada, = self.entradas()
+        self.assertEqual(entrada["startedDateTime"], envio.astimezone().isoformat())
+        self.assertEqual(entrada["time"], 350.0)
+        self.assertEqual(entrada["timings"]["wait"], 350.0)
+        self.assertEqual(entrada["request"]["queryString"], [{"name": "org", "value": "1"}])
+        self.assertNotIn("_envioDesconhecido", entrada)
+
+    def test_envio_nao_visto_comeca_na_resposta(self):
+        request = Request(method="GET", url="https://plataforma/api/users", headers=[])
+        response = Response(status_code=200, reason="OK", headers=[])
+        self.driver.response_interceptor(request, response)
+        entrada, = self.entradas()
+        self.assertEqual(entrada["time"], 0.0)
+        self.assertEqual(entrada["startedDateTime"], response.date.astimezone().isoformat())
+        self.assertTrue(entrada["_envioDesconhecido"])
+
+    def test_credenciais_mascaradas_e_corpos_so_de_texto(self):
+        monitor = rede.MonitorDeRede.para(self.driver)
+        request = Request(method="POST", url="https://plataforma/api/login",
+                          headers=[("Authorization", "Bearer segredo"), ("Content-Type", "application/json")], body=b'{"a": 1}')
+        monitor._interceptar(request, Response(status_code=200, reason="OK", headers=[("Content-Type", "image/png")], body=b"\x89PNG"))
+        entrada, = self.entradas()
+        self.assertIn({"name": "Authorization", "value": "***"}, entrada["request"]["headers"])
+        self.assertEqual(entrada["request"]["postData"]["text"], '{"a": 1}')
+        self.assertNotIn("text", entrada["response"]["content"])
+        self.assertEqual(entrada["response"]["content"]["size"], 4)
+
+    def test_gravacao_para_ao_finalizar(self):
+        self.gravador.finalizar()
+        trafegar(self.driver, "https://plataforma/api/users")()
+        self.assertEqual(self.gravador.entradas, 0)
+        rastro.descartar(rastro.coletar())
+        self.assertFalse(os.path.exists(self.gravador.caminho))
+
+if __name__ == "__main__":
+    unittest.main()
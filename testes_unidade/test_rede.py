@@ -0,0 +1,150 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do monitor de rede (rede.py),
+    sem navegador: o tráfego é simulado chamando o armazenamento e o
+    interceptador de resposta na ordem em que o proxy do selenium-wire os chama.
+
+--- Estrutura principal:
+    1. NavegadorFalso / trafegar: Navegador com o armazenamento em memória do
+       selenium-wire e a simulação de um par requisição/resposta
+    2. TestInstanteDeEnvio: request.envio com o instante real do envio
+    3. TestExpectativa: Expectativas resolvidas pela URL, pelo método e pelo
+       fluxo, tempo-limite e requisição enviada sem resposta
+================================================================================
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import unittest
+from selenium.common.exceptions import TimeoutException
+from seleniumwire.request import Request, Response
+from seleniumwire.storage import InMemoryRequestStorage
+import rede
+
+# Classe que simula o navegador do selenium-wire, com o armazenamento em memória e sem proxy
+class NavegadorFalso:
+    def __init__(self):
+        self.backend = SimpleNamespace(storage=InMemoryRequestStorage(maxsize=100))
+        self.response_interceptor = None
+
+    # Requisições guardadas, como o driver.requests do selenium-wire
+    @property
+    def requests(self):
+        return self.backend.storage.load_requests()
+
+    @requests.deleter
+    def requests(self):
+        self.backend.storage.clear_requests()
+
+# Função que simula o proxy enviando uma requisição (guardada no armazenamento) e devolve a função que entrega a resposta
+# Como no selenium-wire, a requisição entregue ao interceptador é recriada no instante da resposta
+def trafegar(driver, url, metodo="POST", envio=None, status=200, corpo=b"", fluxo=None):
+    agente = f"Chrome {rede.MARCA_FLUXO}{fluxo}" if fluxo else "Chrome"
+    original = Request(method=metodo, url=url, headers=[("User-Agent", agente)])
+    original.date = envio or datetime.now()
+    driver.backend.storage.save_request(original)
+
+    def responder(atraso=0.25):
+        response = Response(status_code=status, reason="OK", headers=[], body=corpo)
+        recriada = Request(method=metodo, url=url, headers=[("User-Agent", agente)])
+        recriada.date = response.date = original.date + timedelta(seconds=atraso)
+        driver.response_interceptor(recriada, response)
+        driver.backend.storage.save_response(original.id, response)
+        return recriada, response
+    return responder
+
+# Classe de teste do instante de envio entregue aos ouvintes
+class TestInstanteDeEnvio(unittest.TestCase):
+    def setUp(self):
+        self.driver = NavegadorFalso()
+        self.monitor = rede.MonitorDeRede.para(self.driver)
+
+    def test_envio_e_o_instante_em_que_a_requisicao_foi_guardada(self):
+        envio = datetime(2026, 1, 1, 12, 0, 0)
+        request, response = trafegar(self.driver, "https://plataforma/api/subscription", envio=envio)(atraso=0.8)
+        self.assertEqual(request.envio, envio)
+        self.assertEqual((response.date - request.envio).total_seconds(), 0.8)
+        self.assertEqual(self.monitor.envios, {})
+
+    def test_requisicoes_iguais_em_paralelo_casam_na_ordem_de_envio(self):
+        primeira = datetime(2026, 1, 1, 12, 0, 0)
+        responder_primeira = trafegar(self.driver, "https://plataforma/api/users", metodo="GET", envio=primeira)
+        responder_segunda = trafegar(self.driver, "https://plataforma/api/users", metodo="GET", envio=primeira + timedelta(seconds=1))
+        trafegar(self.driver, "https://plataforma/api/users", metodo="POST", envio=primeira + timedelta(seconds=2))
+        self.assertEqual(responder_primeira()[0].envio, primeira)
+        self.assertEqual(responder_segunda()[0].envio, primeira + timedelta(seconds=1))
+        self.assertEqual(len(self.monitor.envios), 1)
+
+    def test_resposta_criada_sem_o_interceptador_esquece_o_envio(self):
+        request = Request(method="GET", url="https://analytics/coleta", headers=[])
+        self.driver.backend.storage.save_request(request)
+        # Como o bloqueio.py: a resposta é criada no interceptador de requisição e guardada direto
+        self.driver.backend.storage.save_response(request.id, Response(status_code=204, reason="", headers=[]))
+        self.assertEqual(self.monitor.envios, {})
+
+    def test_envios_sem_resposta_nao_se_acumulam(self):
+        for indice in range(rede.MAX_ENVIOS_PENDENTES + 5):
+            trafegar(self.driver, f"https://plataforma/api/abortada/{indice}")
+        self.assertEqual(len(self.monitor.envios), rede.MAX_ENVIOS_PENDENTES)
+        # A mais antiga saiu da lista, então a resposta casa com o envio novo da mesma URL
+        envio = datetime(2026, 1, 1, 12, 0, 0)
+        request, _ = trafegar(self.driver, "https://plataforma/api/abortada/0", envio=envio)()
+        self.assertEqual(request.envio, envio)
+
+# Classe de teste das expectativas de requisição
+class TestExpectativa(unittest.TestCase):
+    def setUp(self):
+        self.driver = NavegadorFalso()
+        self.monitor = rede.MonitorDeRede.para(self.driver)
+
+    def test_resolvida_pela_primeira_resposta_que_atende_url_e_metodo(self):
+        expectativa = self.monitor.esperar("subscription", metodo="POST")
+        trafegar(self.driver, "https://plataforma/api/subscription", metodo="GET")()
+        self.assertFalse(expectativa.resolvida.is_set())
+
+        trafegar(self.driver, "https://plataforma/api/subscription", corpo=b'{"id": 7}')()
+        trafegar(self.driver, "https://plataforma/api/subscription", corpo=b'{"id": 8}')()
+        self.assertEqual(expectativa.aguardar(tempo=0).status_code, 200)
+        self.assertEqual(expectativa.corpo_json(), {"id": 7})
+        self.assertEqual(self.monitor.ouvintes, [])
+
+    def test_so_atende_o_fluxo_informado(self):
+        expectativa = self.monitor.esperar("subscription", fluxo="carga-2")
+        trafegar(self.driver, "https://plataforma/api/subscription", fluxo="carga-1")()
+        self.assertFalse(expectativa.resolvida.is_set())
+        request, _ = trafegar(self.driver, "https://plataforma/api/subscription", fluxo="carga-2")()
+        self.assertIs(expectativa.request, request)
+        self.assertEqual(rede.fluxo_da_requisicao(request), "carga-2")
+
+    def test_tempo_esgotado_levanta_timeout_e_remove_o_ouvinte(self):
+        expectativa = self.monitor.esperar("subscription")
+        with self.assertRaises(TimeoutException):
+            expectativa.aguardar(tempo=0.01)
+        self.assertEqual(self.monitor.ouvintes, [])
+
+    def test_enviada_ve_a_requisicao_ainda_sem_resposta(self):
+        expectativa = self.monitor.esperar("subscription", metodo="POST")
+        trafegar(self.driver, "https://plataforma/api/users", metodo="GET")
+        self.assertFalse(expectativa.enviada())
+        trafegar(self.driver, "https://plataforma/api/subscription")
+        self.assertTrue(expectativa.enviada())
+
+    def test_enviada_ignora_requisicoes_anteriores_a_expectativa(self):
+        trafegar(self.driver, "https://plataforma/api/subscription", envio=datetime.now() - timedelta(minutes=1))
+        self.assertFalse(self.monitor.esperar("subscription").enviada())
+
+    def test_ouvinte_com_erro_nao_impede_os_demais(self):
+        recebidas = []
+        self.monitor.adicionar_ouvinte(lambda request, response: 1 / 0)
+        self.monitor.adicionar_ouvinte(lambda request, response: recebidas.append(request.url))
+        trafegar(self.driver, "https://plataforma/api/orgs", metodo="GET")()
+        self.assertEqual(recebidas, ["https://plataforma/api/orgs"])
+
+    def test_limpar_remove_ouvintes_e_respostas_5xx(self):
+        self.monitor.esperar("subscription")
+        trafegar(self.driver, "https://plataforma/api/subscription", status=502)()
+        self.assertEqual(len(self.monitor.respostas_5xx), 1)
+        self.monitor.limpar()
+        self.assertEqual((self.monitor.ouvintes, self.monitor.respostas_5xx), ([], []))
+
+if __name__ == "__main__":
+    unittest.main()
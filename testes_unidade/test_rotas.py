@@ -0,0 +1,57 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade da memória de rotas da
+    navegação direta (rotas.py), sem navegador.
+
+--- Estrutura principal:
+    1. TestRotas: URLs candidatas de cada destino, rotas conhecidas por
+       plataforma e rotas lembradas por plataforma e organização
+================================================================================
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+import rotas
+
+SIMULADOR = "http://127.0.0.1:8000/"
+PLATAFORMA = "https://platform.ecotx.dev/"
+DESTINO = "backoffice.criar_assinatura"
+
+# Classe de teste da memória de rotas
+class TestRotas(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        for substituto in (mock.patch.object(rotas, "ARQUIVO_ROTAS", os.path.join(diretorio.name, "rotas.json")),
+                           mock.patch.object(rotas, "ROTAS_CONHECIDAS", {})):
+            substituto.start()
+            self.addCleanup(substituto.stop)
+
+    def test_rota_conhecida_vale_so_para_a_plataforma_registrada(self):
+        rotas.conhecer(SIMULADOR, DESTINO, "backoffice/assinaturas/nova")
+        self.assertEqual(rotas.candidatas(SIMULADOR, DESTINO, "Vigilant"), ["http://127.0.0.1:8000/backoffice/assinaturas/nova"])
+        self.assertEqual(rotas.candidatas(PLATAFORMA, DESTINO, "Vigilant"), [])
+
+    def test_conhecer_nao_repete_rotas(self):
+        rotas.conhecer(SIMULADOR, DESTINO, "a", "b")
+        rotas.conhecer(SIMULADOR, DESTINO, "b", "c")
+        self.assertEqual(rotas.ROTAS_CONHECIDAS[SIMULADOR][DESTINO], ["a", "b", "c"])
+
+    def test_rota_lembrada_vem_antes_das_conhecidas_e_por_plataforma_e_organizacao(self):
+        rotas.conhecer(SIMULADOR, DESTINO, "backoffice/assinaturas/nova")
+        rotas.lembrar(SIMULADOR, DESTINO, "Vigilant", "http://127.0.0.1:8000/backoffice#nova")
+        self.assertEqual(rotas.candidatas(SIMULADOR, DESTINO, "Vigilant"),
+                         ["http://127.0.0.1:8000/backoffice#nova", "http://127.0.0.1:8000/backoffice/assinaturas/nova"])
+        self.assertEqual(rotas.candidatas(SIMULADOR, DESTINO, "Datlaz"), ["http://127.0.0.1:8000/backoffice/assinaturas/nova"])
+        self.assertEqual(rotas.candidatas(PLATAFORMA, DESTINO, "Vigilant"), [])
+
+    def test_esquecer_apaga_so_a_rota_lembrada(self):
+        rotas.lembrar(PLATAFORMA, DESTINO, "Vigilant", "https://platform.ecotx.dev/backoffice/x")
+        rotas.lembrar(PLATAFORMA, DESTINO, "Datlaz", "https://platform.ecotx.dev/backoffice/y")
+        rotas.esquecer(PLATAFORMA, DESTINO, "Vigilant")
+        self.assertEqual(rotas.candidatas(PLATAFORMA, DESTINO, "Vigilant"), [])
+        self.assertEqual(rotas.candidatas(PLATAFORMA, DESTINO, "Datlaz"), ["https://platform.ecotx.dev/backoffice/y"])
+
+if __name__ == "__main__":
+    unittest.main()
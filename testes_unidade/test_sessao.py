@@ -0,0 +1,144 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade do cache de sessão autenticada
+    (sessao.py), com um navegador falso no lugar do Chrome.
+
+--- Estrutura principal:
+    1. NavegadorFalso / LoginFalso: Guardam cookies, storage e as páginas
+       abertas, e dizem se a plataforma aceitou a sessão
+    2. TestSalvar: Gravação da sessão em disco, por worker
+    3. TestRestaurar: Sessão aceita, rejeitada, expirada e ausente
+================================================================================
+"""
+import json
+import os
+import tempfile
+import unittest
+from time import time
+from unittest import mock
+import metricas
+import sessao
+
+# Classe que simula o navegador: cookies do DevTools, storage e origem da página atual
+class NavegadorFalso:
+    def __init__(self, url="https://plataforma.exemplo/dashboard"):
+        self.current_url = url
+        self.cookies = []
+        self.storage = ({}, {})
+        self.abertas = []
+        self.comandos_cdp = []
+
+    def get(self, url):
+        self.abertas.append(url)
+        self.current_url = url
+
+    def execute_cdp_cmd(self, comando, parametros):
+        self.comandos_cdp.append(comando)
+        if comando == "Network.getAllCookies":
+            return {"cookies": self.cookies}
+        if comando == "Network.setCookies":
+            self.cookies = parametros["cookies"]
+        if comando == "Network.clearBrowserCookies":
+            self.cookies = []
+        return {}
+
+    def execute_script(self, script, *argumentos):
+        if script == sessao.SCRIPT_LER_STORAGE:
+            return [dict(self.storage[0]), dict(self.storage[1])]
+        if script == sessao.SCRIPT_ESCREVER_STORAGE:
+            self.storage = (dict(argumentos[0]), dict(argumentos[1]))
+            return None
+        return "/".join(self.current_url.split("/")[:3])
+
+# Classe que simula o LoginPage, aceitando a sessão quando o cookie de autenticação foi restaurado
+class LoginFalso:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def sessao_aceita(self, indicador_logado):
+        return any(cookie["name"] == "auth" for cookie in self.driver.cookies)
+
+# Classe base que grava as sessões em um diretório temporário e isola as métricas
+class TestComCache(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.diretorio = diretorio.name
+        substituto = mock.patch.object(metricas, "_metricas_teste", {})
+        substituto.start()
+        self.addCleanup(substituto.stop)
+        self.driver = NavegadorFalso()
+        self.cache = sessao.CacheDeSessao(self.driver, "https://plataforma.exemplo/", diretorio=self.diretorio)
+
+    # Grava uma sessão autenticada a partir do navegador falso
+    def salvar_sessao_autenticada(self):
+        self.driver.cookies = [
+            {"name": "auth", "value": "token", "domain": "plataforma.exemplo", "path": "/", "expires": 1, "session": True, "size": 10},
+            {"name": "tema", "value": "escuro", "domain": "plataforma.exemplo", "path": "/", "expires": time() + 3600},
+        ]
+        self.driver.storage = ({"usuario": "bot"}, {"aba": "1"})
+        self.cache.salvar()
+
+# Classe de teste da gravação da sessão
+class TestSalvar(TestComCache):
+    def test_grava_cookies_storage_e_origem(self):
+        self.salvar_sessao_autenticada()
+        with open(self.cache.arquivo) as arquivo:
+            gravada = json.load(arquivo)
+        self.assertEqual(gravada["url"], "https://plataforma.exemplo/dashboard")
+        self.assertEqual(gravada["origem"], "https://plataforma.exemplo")
+        self.assertEqual((gravada["localStorage"], gravada["sessionStorage"]), ({"usuario": "bot"}, {"aba": "1"}))
+        self.assertGreater(gravada["expira_em"], time())
+        self.assertEqual(metricas.coletar()["logins_realizados"], 1)
+
+    def test_cookies_ficam_so_com_os_campos_aceitos_na_restauracao(self):
+        self.salvar_sessao_autenticada()
+        with open(self.cache.arquivo) as arquivo:
+            autenticacao, tema = json.load(arquivo)["cookies"]
+        # Cookie de sessão não leva data de expiração, e campos só de leitura (size, session) são descartados
+        self.assertEqual(autenticacao, {"name": "auth", "value": "token", "domain": "plataforma.exemplo", "path": "/"})
+        self.assertIn("expires", tema)
+
+    def test_um_arquivo_por_worker(self):
+        with mock.patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw3"}):
+            cache = sessao.CacheDeSessao(self.driver, "https://plataforma.exemplo/", diretorio=self.diretorio)
+        self.assertEqual(os.path.basename(cache.arquivo), "sessao_gw3.json")
+
+# Classe de teste da restauração da sessão
+class TestRestaurar(TestComCache):
+    def test_sem_sessao_salva_faz_o_login_normal(self):
+        self.assertFalse(self.cache.restaurar(LoginFalso(self.driver), None))
+        self.assertEqual(self.driver.abertas, [])
+
+    def test_sessao_aceita_evita_o_login(self):
+        self.salvar_sessao_autenticada()
+        navegador_novo = NavegadorFalso(url="data:,")
+        cache = sessao.CacheDeSessao(navegador_novo, "https://plataforma.exemplo/", diretorio=self.diretorio)
+
+        self.assertTrue(cache.restaurar(LoginFalso(navegador_novo), None))
+        # Abre a origem antes de escrever o storage e depois a URL salva, já com a sessão
+        self.assertEqual(navegador_novo.abertas, ["https://plataforma.exemplo/dashboard"] * 2)
+        self.assertEqual(navegador_novo.storage, ({"usuario": "bot"}, {"aba": "1"}))
+        self.assertEqual(metricas.coletar()["logins_evitados"], 1)
+
+    def test_sessao_rejeitada_limpa_o_navegador_e_apaga_a_sessao(self):
+        self.salvar_sessao_autenticada()
+        login = LoginFalso(self.driver)
+        login.sessao_aceita = lambda indicador_logado: False
+
+        self.assertFalse(self.cache.restaurar(login, None))
+        self.assertFalse(os.path.exists(self.cache.arquivo))
+        self.assertEqual(self.driver.cookies, [])
+        self.assertEqual(self.driver.storage, ({}, {}))
+        self.assertEqual(self.driver.current_url, "https://plataforma.exemplo/")
+        self.assertNotIn("logins_evitados", metricas.coletar())
+
+    def test_sessao_expirada_e_descartada_sem_abrir_a_plataforma(self):
+        self.salvar_sessao_autenticada()
+        with mock.patch.object(sessao, "time", return_value=time() + sessao.VALIDADE_PADRAO + 1):
+            self.assertFalse(self.cache.restaurar(LoginFalso(self.driver), None))
+        self.assertFalse(os.path.exists(self.cache.arquivo))
+        self.assertNotIn("Network.setCookies", self.driver.comandos_cdp)
+
+if __name__ == "__main__":
+    unittest.main()
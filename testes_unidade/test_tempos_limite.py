@@ -0,0 +1,132 @@
+"""
+================================================================================
+--- Este arquivo implementa os testes de unidade dos tempos-limite adaptativos
+    e dos sinais de falha antecipada (tempos_limite.py), sem navegador.
+
+--- Estrutura principal:
+    1. TestTempoLimite: Tempo-limite a partir do histórico e mescla das partes
+       dos workers
+    2. TestSinaisDeFalha: Respostas 5xx anotadas pelo monitor de rede e erros
+       JavaScript filtrados pela origem do script
+================================================================================
+"""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+import metricas
+import tempos_limite
+
+# Classe de teste do tempo-limite adaptativo e do histórico de esperas
+class TestTempoLimite(unittest.TestCase):
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.arquivo = os.path.join(diretorio.name, "tempos.json")
+        for substituto in (mock.patch.object(tempos_limite, "ARQUIVO_HISTORICO", self.arquivo),
+                           mock.patch.object(tempos_limite, "_historico", None),
+                           mock.patch.object(tempos_limite, "_novas", {}),
+                           mock.patch.object(metricas, "_metricas_teste", {})):
+            substituto.start()
+            self.addCleanup(substituto.stop)
+
+    def test_sem_amostras_suficientes_usa_o_padrao(self):
+        for _ in range(tempos_limite.MIN_AMOSTRAS - 1):
+            tempos_limite.registrar("botao", 1.0)
+        self.assertEqual(tempos_limite.limite("botao"), tempos_limite.TEMPO_PADRAO)
+
+    def test_limite_e_o_percentil_vezes_a_margem_entre_o_minimo_e_o_padrao(self):
+        for duracao in (4, 5, 6, 7, 8):
+            tempos_limite.registrar("tabela", duracao)
+            tempos_limite.registrar("rapido", 0.1)
+            tempos_limite.registrar("lento", 100)
+        self.assertAlmostEqual(tempos_limite.limite("tabela"), metricas.percentil([4, 5, 6, 7, 8], 99) * 3)
+        self.assertEqual(tempos_limite.limite("rapido"), tempos_limite.TEMPO_MINIMO)
+        self.assertEqual(tempos_limite.limite("lento"), tempos_limite.TEMPO_PADRAO)
+        self.assertEqual(metricas.coletar()["tempos_limite_adaptativos"], 3)
+
+    def test_mesclar_junta_as_partes_dos_workers_e_limita_as_amostras(self):
+        with open(self.arquivo, "w") as arquivo:
+            json.dump({"botao": [1.0] * tempos_limite.MAX_AMOSTRAS}, arquivo)
+        for worker, duracao in (("gw0", 2.0), ("gw1", 3.0)):
+            tempos_limite.registrar("botao", duracao)
+            with mock.patch.dict(os.environ, {"PYTEST_XDIST_WORKER": worker}):
+                tempos_limite.gravar_processo()
+        tempos_limite.mesclar()
+
+        with open(self.arquivo) as arquivo:
+            amostras = json.load(arquivo)["botao"]
+        self.assertEqual(len(amostras), tempos_limite.MAX_AMOSTRAS)
+        self.assertEqual(sorted(amostras[-2:]), [2.0, 3.0])
+        self.assertEqual(os.listdir(os.path.dirname(self.arquivo)), ["tempos.json"])
+
+# Classe que simula o navegador com o monitor de rede e os erros JavaScript coletados na página
+class NavegadorFalso:
+    def __init__(self, respostas_5xx=(), erros_js=(), origem="https://plataforma.exemplo"):
+        self.monitor_de_rede = SimpleNamespace(respostas_5xx=list(respostas_5xx))
+        self.erros_js = list(erros_js)
+        self.origem = origem
+        self.scripts = 0
+
+    def execute_script(self, script, desde):
+        self.scripts += 1
+        return [self.origem, [list(erro) for erro in self.erros_js]]
+
+# Classe de teste da verificação dos sinais de falha
+class TestSinaisDeFalha(unittest.TestCase):
+    def setUp(self):
+        substituto = mock.patch.object(metricas, "_metricas_teste", {})
+        substituto.start()
+        self.addCleanup(substituto.stop)
+        self.desde = datetime.now()
+
+    def test_5xx_da_plataforma_interrompe_a_espera(self):
+        driver = NavegadorFalso([(self.desde + timedelta(seconds=1), 502, "https://plataforma.exemplo/api/subscription")])
+        with self.assertRaisesRegex(tempos_limite.FalhaAntecipada, "HTTP 502"):
+            tempos_limite.verificar_sinais(driver, self.desde, verificar_js=False)
+        self.assertEqual(metricas.coletar()["falhas_antecipadas"], 1)
+
+    def test_5xx_de_terceiros_ou_anterior_a_espera_e_ignorado(self):
+        driver = NavegadorFalso([(self.desde - timedelta(seconds=1), 500, "https://plataforma.exemplo/api/subscription"),
+                                 (self.desde + timedelta(seconds=1), 503, "https://www.google-analytics.com/collect")])
+        tempos_limite.verificar_sinais(driver, self.desde, verificar_js=False)
+
+    def test_erro_js_de_script_da_plataforma_interrompe_a_espera(self):
+        driver = NavegadorFalso(erros_js=[("TypeError: x is undefined", "https://plataforma.exemplo/main.js")])
+        with self.assertRaisesRegex(tempos_limite.FalhaAntecipada, "TypeError"):
+            tempos_limite.verificar_sinais(driver, self.desde)
+
+    def test_erro_js_de_terceiros_ou_sem_origem_e_ignorado(self):
+        driver = NavegadorFalso(erros_js=[("ReferenceError: hj is not defined", "https://static.hotjar.com/c/hotjar.js"),
+                                          ("Script error.", "")])
+        tempos_limite.verificar_sinais(driver, self.desde)
+        self.assertNotIn("falhas_antecipadas", metricas.coletar())
+
+    def test_erro_js_de_origem_configurada_da_plataforma_interrompe_a_espera(self):
+        driver = NavegadorFalso(erros_js=[("Error: falhou", "https://cdn.plataforma.exemplo/bundle.js:1:2")])
+        tempos_limite.verificar_sinais(driver, self.desde)
+        with mock.patch.object(tempos_limite, "ORIGENS_JS_DA_PLATAFORMA", ("https://cdn.plataforma.exemplo",)):
+            with self.assertRaises(tempos_limite.FalhaAntecipada):
+                tempos_limite.verificar_sinais(driver, self.desde)
+
+    def test_condicao_confere_os_erros_js_so_a_cada_intervalo(self):
+        driver = NavegadorFalso()
+        with mock.patch.object(tempos_limite, "monotonic", return_value=0):
+            condicao = tempos_limite.com_sinais_de_falha(lambda driver: False)
+        with mock.patch.object(tempos_limite, "monotonic", return_value=1):
+            condicao(driver)
+        self.assertEqual(driver.scripts, 0)
+        with mock.patch.object(tempos_limite, "monotonic", return_value=tempos_limite.INTERVALO_ERROS_JS):
+            condicao(driver)
+            condicao(driver)
+        self.assertEqual(driver.scripts, 1)
+
+    def test_condicao_satisfeita_nao_verifica_os_sinais(self):
+        driver = NavegadorFalso([(datetime.now() + timedelta(seconds=1), 500, "https://plataforma.exemplo/api")])
+        self.assertEqual(tempos_limite.com_sinais_de_falha(lambda driver: "elemento")(driver), "elemento")
+
+if __name__ == "__main__":
+    unittest.main()